@@ -7,15 +7,48 @@ modbus_monitoring/
 ├── widgets/
 │   ├── __init__.py          # 위젯 서브패키지 초기화
 │   ├── register_display.py  # 레지스터 디스플레이 위젯
+│   ├── stats_widget.py      # 계측 통계 패널
+│   ├── heatmap_widget.py    # 주소별 변경 통계 히트맵
+│   ├── trend_widget.py      # 레지스터 실시간 트렌드 그래프
+│   ├── cycle_widget.py      # 사이클 시간 통계 패널
+│   ├── timeline_widget.py   # 소켓/모드버스 통합 타임라인
+│   ├── log_filter.py        # 로그 검색/필터 막대
 │   └── log_widget.py        # 로그 위젯
 ├── socket/
 │   ├── __init__.py          # 소켓 서브패키지 초기화
 │   ├── socket_server.py     # 소켓 모니터링 스레드
+│   ├── capture.py           # 원본 수신 캡처 / 재생
+│   ├── parse_pool.py        # 포즈 파싱 워커 풀 (연결별 순서 보장, 포화 정책)
 │   └── socket_widget.py     # 소켓 모니터링 위젯
 │   └── utils.py             # 소켓으로 전달받은 변수 파싱
-└── core/
-    ├── __init__.py          # 코어 서브패키지 초기화
-    ├── monitor_thread.py    # 모니터링 스레드
-    └── read_registers.py # 모드버스 모니터링 모듈
+├── core/
+│   ├── __init__.py          # 코어 서브패키지 초기화
+│   ├── monitor_thread.py    # 모니터링 스레드
+│   ├── poller.py            # Qt 비의존 레지스터 폴러
+│   ├── monitor_engine.py    # 하트비트 / 쓰기 / 감시 / 초기화 (스레드·수집 프로세스 공용)
+│   ├── event_loop.py        # 공유 asyncio 루프 (shared / qt 모드)
+│   ├── shared_snapshot.py   # 공유 메모리 스냅샷 / 이벤트 링
+│   ├── acquisition.py       # 별도 프로세스 수집 엔진
+│   ├── process_monitor.py   # 수집 프로세스 GUI 어댑터
+│   ├── change_publisher.py  # 변경 스트림 로컬 재게시 (pub/sub)
+│   ├── process_image_server.py # 스냅샷 제공 로컬 모드버스 TCP 서버
+│   ├── metrics.py           # 계측 저장소 / Prometheus 엔드포인트
+│   ├── profiling.py         # 프로파일링 모드 (느린 콜백, 샘플링, 보고서)
+│   ├── register_map.py      # TOML 레지스터 맵 / 스냅샷 디코더
+│   ├── history.py           # 변경 이력 링 버퍼 / 트렌드 시계열
+│   ├── address_stats.py     # 주소별 변경 통계
+│   ├── filters.py           # 데드밴드 / 최소 간격 / 안정 후 보고 필터
+│   ├── triggers.py          # 트리거/알람 엔진 (전/후 구간 캡처)
+│   ├── cycles.py            # 사이클 분할 / 스트리밍 사이클 시간 통계
+│   ├── discovery.py         # 주소 공간 탐색 (동시 요청 + 이분 탐색)
+│   ├── timeline.py          # 스트림 간 단조 시계 타임라인 (k-way 병합, ±구간 조회)
+│   ├── simulation.py        # 가상 시간 루프 + 스크립트 가짜 모드버스 클라이언트 시뮬레이션
+│   ├── log_index.py         # 증분 로그 색인 (주소/출처/심각도/시각) + 디스크 보관
+│   └── read_registers.py # 모드버스 모니터링 모듈
+└── benchmarks/
+    ├── ui_latency.py        # 루프 모드별 UI 지연 벤치마크
+    ├── process_image_load.py # 로컬 모드버스 서버 동시 접속 부하 테스트
+    ├── socket_load.py       # 소켓 서버 처리량 / 지연 / 메모리 부하 테스트
+    └── micro.py             # 핫 경로 함수 마이크로 벤치마크 (JSON 결과 비교)
 """
 __version__ = '1.0.0'
\ No newline at end of file
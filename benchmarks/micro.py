@@ -0,0 +1,414 @@
+"""
+핫 경로 마이크로 벤치마크 - 메시지/주기마다 호출되는 함수의 호출당 시간
+
+pyperf 방식으로 호출 횟수를 보정(한 샘플이 --min-time 이상 걸리도록)한 뒤 워밍업을 버리고
+여러 샘플의 중앙값/표준편차를 기록합니다. 결과를 JSON 으로 저장해 두고 --compare 로
+이전 결과와 비교하면 엔진 변경(폴링, 프레이밍, 파싱, 표 모델) 뒤의 회귀가 바로 보입니다.
+
+대상:
+- MonitorThread.check_changes / RobotMonitor.check_changes: 125 워드 블록, 변경 비율 0/1/10/100%
+- MonitorThread.process_monitor_message: "주소 N: V" 로그 (모니터링 중/아닌 주소, 일반 로그)
+- SocketServer.process_buffer: 일반 텍스트 / 포즈 스트림을 작은 조각으로 나눠 입력
+- PoseParser.parsing_poses / _format_poses: 14개 포즈 메시지
+- RegisterDisplayWidget.update_register_value: 128개 주소 표, 주기마다 flush
+
+PyQt5 / pymodbus 가 없으면 해당 벤치마크는 건너뜁니다 (Qt 는 offscreen 플랫폼 사용).
+
+사용법:
+    python benchmarks/micro.py                                  # 전체 실행, 표 출력
+    python benchmarks/micro.py --output baseline.json           # 결과 저장
+    python benchmarks/micro.py --compare baseline.json          # 이전 결과와 비교 (회귀 시 종료 코드 1)
+    python benchmarks/micro.py --filter check_changes --samples 20
+    python benchmarks/micro.py --list
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from itertools import cycle
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BLOCK_START = 128
+BLOCK_COUNT = 125  # 한 번에 읽는 최대 워드 수 (FC3)
+DENSITIES = (0, 1, 10, 100)  # 주기당 변경 비율 (%)
+SEED = 1
+
+BENCHMARKS = []  # [(이름, 준비 함수)]
+
+
+def benchmark(name):
+    """벤치마크 등록 - 준비 함수는 (호출 함수, 호출당 처리 단위 수) 를 반환"""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+class Skip(Exception):
+    """선택 의존성이 없어 실행할 수 없는 벤치마크"""
+
+
+_app = None  # QApplication 은 살아 있어야 위젯을 만들 수 있으므로 모듈에 보관
+
+
+def qt_app():
+    global _app
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError as e:
+        raise Skip(f"PyQt5 없음 ({e})")
+    if _app is None:
+        _app = QApplication.instance() or QApplication([])
+    return _app
+
+
+# 입력 데이터 ---------------------------------------------------------------
+
+def block_pair(density, rng):
+    """번갈아 넣으면 주기마다 density% 주소가 바뀌는 125 워드 블록 두 개"""
+    first = [rng.randrange(4) for _ in range(BLOCK_COUNT)]
+    second = list(first)
+    for i in rng.sample(range(BLOCK_COUNT), BLOCK_COUNT * density // 100):
+        second[i] = first[i] + 1 + rng.randrange(100)
+    return first, second
+
+
+def pose_message(name="A_prepos_l", used=12, newlines=False, rng=None):
+    """로봇이 보내는 형식의 포즈 메시지 (14개 포즈, used 개만 0 이 아님)"""
+    rng = rng or random.Random(SEED)
+    used_indexes = set(range(1, used + 1))
+    poses = [
+        "p[" + ", ".join(f"{rng.uniform(-1, 1):.6f}" for _ in range(6)) + "]"
+        if i in used_indexes else "p[0, 0, 0, 0, 0, 0]"
+        for i in range(14)
+    ]
+    separator = ",\n " if newlines else ", "
+    return f"{name}: [{separator.join(poses)}]"
+
+
+def text_stream(rng, count=200):
+    """일반 로그 텍스트 줄 스트림"""
+    return "".join(f"robot log {i} state={rng.randrange(16)} {'x' * rng.randrange(80)}\n"
+                   for i in range(count))
+
+
+def chunked(data, rng, min_size, max_size):
+    """TCP 읽기처럼 무작위 크기 조각으로 나눔"""
+    chunks = []
+    i = 0
+    while i < len(data):
+        size = rng.randint(min_size, max_size)
+        chunks.append(data[i:i + size])
+        i += size
+    return chunks
+
+
+# 레지스터 변경 감지 ---------------------------------------------------------
+
+def _register_check_changes(label, make_owner):
+    for density in DENSITIES:
+        def setup(density=density):
+            owner = make_owner()
+            blocks = cycle(block_pair(density, random.Random(SEED + density)))
+            check = owner.check_changes
+            owner.poller.previous_values.clear()
+            check(BLOCK_START, next(blocks))  # 첫 스냅샷 (전체 변경)
+            return (lambda: check(BLOCK_START, next(blocks))), 1
+        BENCHMARKS.append((f"{label}.check_changes[{density}%]", setup))
+
+
+def _poller():
+    from modbus_monitoring.core.poller import RegisterPoller
+    return RegisterPoller(excluded={128, 161}, callback=lambda msg: None)
+
+
+class _PollerOwner:
+    def __init__(self):
+        self.poller = _poller()
+        self.check_changes = self.poller.check_changes
+
+
+def _monitor_thread():
+    qt_app()
+    from modbus_monitoring.core.monitor_thread import MonitorThread
+    return MonitorThread("127.0.0.1")
+
+
+class _StubClient:
+    """연결하지 않는 클라이언트 - AsyncModbusTcpClient 는 실행 중인 이벤트 루프 밖에서 만들 수 없음"""
+    connected = False
+
+
+def _robot_monitor():
+    try:
+        from modbus_monitoring.core.read_registers import RobotMonitor
+    except ImportError as e:
+        raise Skip(f"pymodbus 없음 ({e})")
+    return RobotMonitor("127.0.0.1", callback=lambda msg: None, client=_StubClient())
+
+
+_register_check_changes("RegisterPoller", _PollerOwner)
+_register_check_changes("MonitorThread", _monitor_thread)
+_register_check_changes("RobotMonitor", _robot_monitor)
+
+
+@benchmark("RegisterPoller.check_bit_changes[10%]")
+def bench_bit_changes():
+    from modbus_monitoring.core.poller import PollBlock
+    poller = _poller()
+    block = PollBlock(0, 2000, source="coil")
+    rng = random.Random(SEED)
+    first = [rng.randrange(2) for _ in range(block.count)]
+    second = list(first)
+    for i in rng.sample(range(block.count), block.count // 10):
+        second[i] ^= 1
+    blocks = cycle((first, second))
+    poller.check_bit_changes(block, next(blocks))
+    return (lambda: poller.check_bit_changes(block, next(blocks))), 1
+
+
+# 모니터 로그 처리 ----------------------------------------------------------
+
+@benchmark("MonitorThread.process_monitor_message")
+def bench_process_monitor_message():
+    thread = _monitor_thread()
+    rng = random.Random(SEED)
+    for register in range(128, 160):
+        thread._monitored_registers.add(register)
+    # 모니터링 중 주소 / 아닌 주소 / 일반 로그가 섞인 실제 비율에 가깝게
+    messages = []
+    for i in range(1000):
+        kind = rng.random()
+        if kind < 0.5:
+            messages.append(f"주소 {rng.randrange(128, 160)}: {rng.randrange(1000)}")
+        elif kind < 0.9:
+            messages.append(f"주소 {rng.randrange(160, 256)}: {rng.randrange(1000)}")
+        else:
+            messages.append(f"하트비트 전송: {i & 0x0F}")
+    process = thread.process_monitor_message
+
+    def run():
+        for message in messages:
+            process(message)
+    return run, len(messages)
+
+
+# 소켓 프레이밍 / 포즈 파싱 --------------------------------------------------
+
+def _socket_server():
+    try:
+        from modbus_monitoring.socket.socket_server import SocketServer
+    except ImportError as e:
+        raise Skip(f"PyQt5 없음 ({e})")
+    return SocketServer()
+
+
+def _process_buffer_bench(data, min_size, max_size):
+    def setup():
+        server = _socket_server()
+        chunks = chunked(data, random.Random(SEED), min_size, max_size)
+        process = server.process_buffer
+
+        def run():
+            server.buffer = ""
+            for chunk in chunks:
+                server.buffer += chunk
+                process()
+        return run, len(chunks)
+    return setup
+
+
+_rng = random.Random(SEED)
+_TEXT = text_stream(_rng)
+_POSES = "".join(pose_message(name, used=_rng.randint(1, 12), newlines=_rng.random() < 0.3, rng=_rng) + "\n"
+                 for name in ("A_prepos_l", "A_touch_p") * 20)
+benchmark("SocketServer.process_buffer[text, 1-64B]")(_process_buffer_bench(_TEXT, 1, 64))
+benchmark("SocketServer.process_buffer[text, 256-4096B]")(_process_buffer_bench(_TEXT, 256, 4096))
+benchmark("SocketServer.process_buffer[pose, 1-64B]")(_process_buffer_bench(_POSES, 1, 64))
+
+
+def _pose_parser():
+    from modbus_monitoring.socket.utils import PoseParser
+    return PoseParser(callback=lambda msg: None)
+
+
+@benchmark("PoseParser.parsing_poses")
+def bench_parsing_poses():
+    parser = _pose_parser()
+    message = pose_message("A_prepos_l") + "\n" + pose_message("A_touch_p", used=6)
+    return (lambda: parser.parsing_poses(message)), 1
+
+
+@benchmark("PoseParser.parsing_poses[multiline]")
+def bench_parsing_poses_multiline():
+    parser = _pose_parser()
+    message = pose_message("A_prepos_l", newlines=True)
+    return (lambda: parser.parsing_poses(message)), 1
+
+
+@benchmark("PoseParser._format_poses")
+def bench_format_poses():
+    parser = _pose_parser()
+    _, poses = parser.parse_pose_line(pose_message("A_prepos_l"))
+    return (lambda: parser._format_poses("A_prepos_l", poses)), 1
+
+
+# 레지스터 표 -------------------------------------------------------------
+
+@benchmark("RegisterDisplayWidget.update_register_value")
+def bench_update_register_value():
+    qt_app()
+    from modbus_monitoring.widgets.register_display import RegisterDisplayWidget
+    widget = RegisterDisplayWidget()
+    widget.flush_timer.stop()  # flush 는 아래에서 직접 호출
+    registers = list(range(128, 256))
+    widget.add_registers(registers)
+    rng = random.Random(SEED)
+    # 주기당 10% 주소가 바뀌는 폴링 결과를 그대로 넘기는 경우
+    updates = [[(register, rng.randrange(1000)) for register in rng.sample(registers, 13)]
+               for _ in range(64)]
+    update = widget.update_register_value
+    flush = widget.model.flush
+
+    def run():
+        for batch in updates:
+            for register, value in batch:
+                update(register, value)
+            flush()
+    return run, sum(len(batch) for batch in updates)
+
+
+# 실행기 -----------------------------------------------------------------
+
+def calibrate(func, min_time):
+    """한 샘플이 min_time 이상 걸리는 호출 횟수"""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - started >= min_time or loops >= 1 << 24:
+            return loops
+        loops *= 2
+
+
+def measure(func, inner, samples, warmups, min_time):
+    """처리 단위당 시간 (초) 샘플 목록"""
+    loops = calibrate(func, min_time)
+    values = []
+    for i in range(warmups + samples):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if i >= warmups:
+            values.append(elapsed / (loops * inner))
+    return loops, values
+
+
+def run_benchmarks(args, callback=print):
+    results = {}
+    for name, setup in BENCHMARKS:
+        if args.filter and not any(f in name for f in args.filter):
+            continue
+        try:
+            func, inner = setup()
+        except Skip as e:
+            callback(f"{name:<52} 건너뜀: {e}")
+            continue
+        except Exception as e:
+            callback(f"{name:<52} 준비 실패: {type(e).__name__} - {e}")
+            continue
+        loops, values = measure(func, inner, args.samples, args.warmups, args.min_time)
+        result = {
+            "median_us": statistics.median(values) * 1e6,
+            "mean_us": statistics.fmean(values) * 1e6,
+            "stdev_us": (statistics.stdev(values) if len(values) > 1 else 0.0) * 1e6,
+            "min_us": min(values) * 1e6,
+            "loops": loops,
+            "inner": inner,
+            "samples": [v * 1e6 for v in values],
+        }
+        results[name] = result
+        callback(f"{name:<52} {result['median_us']:>10.3f} us  ±{result['stdev_us']:.3f}")
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "unit": "us per call (inner 가 1 보다 크면 처리 단위당)",
+    }
+
+
+def compare(results, baseline, threshold, callback=print):
+    """기준 결과 대비 중앙값 비율 - 회귀한 벤치마크 이름 목록 반환"""
+    regressions = []
+    callback(f"\n{'benchmark':<52} {'base us':>10} {'now us':>10} {'ratio':>8}")
+    for name, result in results.items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            callback(f"{name:<52} {'-':>10} {result['median_us']:>10.3f} {'new':>8}")
+            continue
+        ratio = result["median_us"] / base["median_us"] if base["median_us"] else float("inf")
+        # 두 실행의 흔들림(표준편차)보다 작은 차이는 회귀로 보지 않음
+        noise = (result["stdev_us"] + base.get("stdev_us", 0.0)) / base["median_us"] if base["median_us"] else 0.0
+        mark = ""
+        if ratio > 1 + max(threshold, noise):
+            mark = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - max(threshold, noise):
+            mark = "  faster"
+        callback(f"{name:<52} {base['median_us']:>10.3f} {result['median_us']:>10.3f} {ratio:>7.2f}x{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핫 경로 마이크로 벤치마크")
+    parser.add_argument("--filter", action="append", help="이름에 이 문자열이 들어간 벤치마크만 (여러 번 지정 가능)")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--warmups", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=0.05, help="샘플 하나의 최소 시간 (초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="회귀로 볼 중앙값 증가 비율 (기본 10%%)")
+    parser.add_argument("--list", action="store_true", help="벤치마크 이름만 출력")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, _ in BENCHMARKS:
+            print(name)
+        return
+
+    results = run_benchmarks(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadata(), "benchmarks": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
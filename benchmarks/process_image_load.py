@@ -0,0 +1,111 @@
+"""
+프로세스 이미지 모드버스 서버 부하 테스트
+
+많은 동시 접속 클라이언트가 FC3 로 128-252 블록을 반복해서 읽을 때
+초당 처리량과 응답 지연 분포를 측정합니다. (로봇 없이 가짜 스냅샷 사용)
+
+사용법:
+    python benchmarks/process_image_load.py --clients 64 --seconds 10
+    python benchmarks/process_image_load.py --target 192.168.1.50:5020   # 실행 중인 모니터 측정
+"""
+import argparse
+import asyncio
+import os
+import random
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from modbus_monitoring.core.process_image_server import (
+    ProcessImage, ProcessImageServer, MBAP_HEADER
+)
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+async def reader_client(host, port, deadline, latencies, errors, start=128, count=125):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        errors.append("connect")
+        return
+    tid = random.randrange(0x10000)
+    request_pdu = struct.pack('!BHH', 3, start, count)
+    try:
+        while time.perf_counter() < deadline:
+            tid = (tid + 1) & 0xFFFF
+            sent = time.perf_counter_ns()
+            writer.write(MBAP_HEADER.pack(tid, 0, len(request_pdu) + 1, 1) + request_pdu)
+            header = await reader.readexactly(MBAP_HEADER.size)
+            rtid, _, length, _ = MBAP_HEADER.unpack(header)
+            pdu = await reader.readexactly(length - 1)
+            latencies.append((time.perf_counter_ns() - sent) / 1e6)
+            if rtid != tid or pdu[0] & 0x80:
+                errors.append(f"fc={pdu[0]:#x}")
+    except (asyncio.IncompleteReadError, ConnectionError) as e:
+        errors.append(type(e).__name__)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    server = None
+    if args.target:
+        host, _, port = args.target.rpartition(':')
+        port = int(port)
+    else:
+        host, port = '127.0.0.1', args.port
+        image = ProcessImage(start=128, count=128)
+        image.update([(128, [random.randrange(0x10000) for _ in range(128)])])
+
+        async def write_handler(addr, value):
+            return True
+
+        server = ProcessImageServer(image, write_handler, host=host, port=port, callback=lambda msg: None)
+        await server.start()
+
+        # 폴링 흉내 - 서버가 읽기에 응답하는 동안 스냅샷이 계속 바뀜
+        async def churn():
+            while True:
+                image.update([(128, [random.randrange(0x10000) for _ in range(128)])])
+                await asyncio.sleep(0.1)
+        churn_task = asyncio.create_task(churn())
+
+    latencies = []
+    errors = []
+    started = time.perf_counter()
+    deadline = started + args.seconds
+    await asyncio.gather(*(
+        reader_client(host, port, deadline, latencies, errors) for _ in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    if server:
+        churn_task.cancel()
+        await server.stop()
+
+    print(f"clients={args.clients} seconds={elapsed:.1f}")
+    print(f"requests={len(latencies)} ({len(latencies) / elapsed:.0f} req/s) errors={len(errors)}")
+    print(f"latency ms: p50={percentile(latencies, 50):.3f} p95={percentile(latencies, 95):.3f} "
+          f"p99={percentile(latencies, 99):.3f} max={max(latencies, default=0):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프로세스 이미지 모드버스 서버 부하 테스트")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=25020)
+    parser.add_argument("--target", help="이미 실행 중인 서버 주소 (호스트:포트)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+소켓 서버 부하 / 처리량 벤치마크
+
+별도 프로세스의 많은 동시 클라이언트가 A_prepos_l / A_touch_p 포즈 메시지와 일반 텍스트를
+크기와 분할(한 메시지를 여러 번에 나눠 쓰기)을 바꿔 가며 보낼 때
+지속 처리량(메시지/초), 수신~파싱 완료 지연 분포, 메모리(RSS) 증가를 측정합니다.
+
+- headless: SocketServer 만 (전용 스레드 루프, 콜백에서 측정)
+- gui:      SocketLogWidget + SocketMonitorThread (로그 위젯에 추가된 뒤 GUI 스레드에서 측정)
+
+지연은 메시지에 실어 보낸 송신 시각(monotonic_ns, 같은 호스트의 프로세스끼리 같은 시계)과
+측정 지점 시각의 차이입니다. 받지 못한 메시지는 lost 로 보고합니다 (프레이밍에서 합쳐지거나 깨진 메시지 포함).
+
+사용법:
+    python benchmarks/socket_load.py                            # headless, gui 비교
+    python benchmarks/socket_load.py --mode headless --clients 64 --rate 0   # 최대 속도
+    python benchmarks/socket_load.py --fragment 8 --pose-ratio 0.5
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# 측정 표시: 일반 텍스트는 "bench [송신 ns, 클라이언트, 순번]", 포즈는 13번(A_VR2_END) 포즈에 같은 값
+MARK_RE = re.compile(r"(?:bench|A_VR2_END:) \[(\d+), (\d+), (\d+)")
+SAMPLE_INTERVAL = 0.5  # RSS 샘플 주기 (초)
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def rss_bytes():
+    """현재 RSS (리눅스 /proc, 그 외는 최대 RSS)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def make_message(rng, client, seq, pose_ratio, max_text):
+    """합성 메시지 한 개 (크기 무작위)"""
+    stamp = f"[{time.monotonic_ns()}, {client}, {seq}]"
+    if rng.random() < pose_ratio:
+        name = rng.choice(("A_prepos_l", "A_touch_p"))
+        digits = rng.randint(2, 8)
+        used = set(rng.sample(range(1, 13), rng.randint(1, 12)))
+        poses = [
+            "p[" + ", ".join(f"{rng.uniform(-1, 1):.{digits}f}" for _ in range(6)) + "]"
+            if i in used else "p[0, 0, 0, 0, 0, 0]"
+            for i in range(13)
+        ]
+        poses.append(f"p{stamp[:-1]}, 0, 0, 0]")
+        # 실제 로봇처럼 포즈 사이에 줄바꿈이 섞일 수 있음
+        separator = ",\n " if rng.random() < 0.3 else ", "
+        return f"{name}: [{separator.join(poses)}]\n"
+    return f"bench {stamp} {'x' * rng.randint(0, max_text)}\n"
+
+
+def fragments(rng, data, max_pieces):
+    """메시지를 1~max_pieces 조각으로 나눔"""
+    pieces = rng.randint(1, max_pieces) if max_pieces > 1 else 1
+    if pieces == 1 or len(data) < 2:
+        return [data]
+    cuts = sorted(rng.sample(range(1, len(data)), min(pieces - 1, len(data) - 1)))
+    return [data[a:b] for a, b in zip([0] + cuts, cuts + [len(data)])]
+
+
+def load_process(port, clients, rate, seconds, fragment, pose_ratio, max_text, seed, result_queue):
+    """부하 생성 프로세스 - 서버 프로세스의 메모리/GIL 에 영향을 주지 않도록 분리"""
+    async def client(idx, sent):
+        rng = random.Random(seed + idx)
+        for _ in range(50):
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                break
+            except OSError:
+                await asyncio.sleep(0.1)
+        else:
+            return
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + seconds
+        next_send = loop.time()
+        seq = 0
+        try:
+            while loop.time() < deadline:
+                data = make_message(rng, idx, seq, pose_ratio, max_text).encode()
+                for piece in fragments(rng, data, fragment):
+                    writer.write(piece)
+                    await writer.drain()
+                    if fragment > 1:
+                        await asyncio.sleep(0)  # 조각이 따로 전송되도록 양보
+                seq += 1
+                sent[idx] = seq
+                if rate:
+                    next_send += 1.0 / rate
+                    delay = next_send - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    elif seq % 64 == 0:
+                        await asyncio.sleep(0)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        sent = [0] * clients
+        await asyncio.gather(*(client(i, sent) for i in range(clients)))
+        return sent
+
+    result_queue.put(asyncio.run(main()))
+
+
+class Recorder:
+    """측정 지점에서 표시를 찾아 지연 기록 (한 스레드에서만 호출)"""
+    def __init__(self):
+        self.latencies = []
+        self.received = set()
+        self.other = 0  # 표시 없는 콜백 (연결 로그, 파싱 오류 등)
+
+    def __call__(self, text):
+        now = time.monotonic_ns()
+        found = False
+        for sent_ns, client, seq in MARK_RE.findall(text):
+            key = (int(client), int(seq))
+            if key not in self.received:
+                self.received.add(key)
+                self.latencies.append((now - int(sent_ns)) / 1e6)
+            found = True
+        if not found:
+            self.other += 1
+
+
+class RssSampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.samples = [rss_bytes()]
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(SAMPLE_INTERVAL):
+            self.samples.append(rss_bytes())
+
+
+def run_headless(args, port, start_load):
+    from modbus_monitoring.socket import SocketServer
+
+    recorder = Recorder()
+    server = SocketServer('127.0.0.1', port)
+    server.set_callback(recorder)
+    loop = asyncio.new_event_loop()
+
+    def serve():
+        try:
+            loop.run_until_complete(server.start())
+        except asyncio.CancelledError:
+            pass
+        # 취소된 클라이언트 태스크 정리
+        pending = asyncio.all_tasks(loop)
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+
+    sampler = RssSampler()
+    sampler.start()
+    started = time.perf_counter()
+    sent = start_load()
+    elapsed = time.perf_counter() - started
+    time.sleep(args.drain)  # 서버가 남은 조각을 처리할 시간
+    sampler.stop_event.set()
+
+    loop.call_soon_threadsafe(server.stop)
+    thread.join(2)
+    return recorder, sampler, sent, elapsed
+
+
+def run_gui(args, port, start_load):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    from modbus_monitoring.socket import SocketLogWidget
+
+    app = QApplication(sys.argv[:1])
+    widget = SocketLogWidget()
+    widget.host_input.setText("127.0.0.1")
+    widget.port_input.setValue(port)
+    recorder = Recorder()
+    sampler = RssSampler()
+    result = {}
+
+    def begin():
+        widget.start_socket_server()
+        # append_log 뒤에 연결해야 위젯에 추가된 시점이 측정됨
+        widget.socket_thread.log_signal.connect(recorder)
+        sampler.start()
+        result["started"] = time.perf_counter()
+        threading.Thread(target=lambda: result.update(sent=start_load(), done=time.perf_counter()),
+                         daemon=True).start()
+        poll.start(50)
+
+    def check():
+        if "done" in result:
+            poll.stop()
+            # 쌓인 시그널이 GUI 스레드에서 처리되도록 유예 후 종료
+            QTimer.singleShot(int(args.drain * 1000), finish)
+
+    def finish():
+        sampler.stop_event.set()
+        widget.stop_socket_server()
+        app.quit()
+
+    poll = QTimer()
+    poll.timeout.connect(check)
+    QTimer.singleShot(0, begin)
+    app.exec_()
+    return recorder, sampler, result["sent"], result["done"] - result["started"]
+
+
+def run_mode(args):
+    port = args.port
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+
+    def start_load():
+        process = ctx.Process(target=load_process, args=(
+            port, args.clients, args.rate, args.seconds, args.fragment,
+            args.pose_ratio, args.max_text, args.seed, queue))
+        process.start()
+        sent = queue.get()
+        process.join()
+        return sent
+
+    runner = run_headless if args.mode == "headless" else run_gui
+    recorder, sampler, sent, elapsed = runner(args, port, start_load)
+
+    total_sent = sum(sent)
+    received = len(recorder.received)
+    lat = recorder.latencies
+    rss = sampler.samples
+    return {
+        "mode": args.mode,
+        "clients": args.clients,
+        "seconds": round(elapsed, 2),
+        "sent": total_sent,
+        "received": received,
+        "lost": total_sent - received,
+        "sent_per_s": round(total_sent / elapsed, 1) if elapsed else 0.0,
+        "received_per_s": round(received / elapsed, 1) if elapsed else 0.0,
+        "lat_p50_ms": round(percentile(lat, 50), 3),
+        "lat_p95_ms": round(percentile(lat, 95), 3),
+        "lat_p99_ms": round(percentile(lat, 99), 3),
+        "lat_max_ms": round(max(lat, default=0.0), 3),
+        "rss_start_mb": round(rss[0] / 2**20, 1),
+        "rss_end_mb": round(rss[-1] / 2**20, 1),
+        "rss_peak_mb": round(max(rss) / 2**20, 1),
+        "other_callbacks": recorder.other,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="소켓 서버 부하 / 처리량 벤치마크")
+    parser.add_argument("--mode", choices=["headless", "gui"])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=100.0, help="클라이언트당 초당 메시지 수 (0 이면 최대 속도)")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fragment", type=int, default=4, help="메시지당 최대 분할 수 (1 이면 나누지 않음)")
+    parser.add_argument("--pose-ratio", type=float, default=0.3, help="포즈 메시지 비율")
+    parser.add_argument("--max-text", type=int, default=200, help="일반 텍스트 최대 추가 길이")
+    parser.add_argument("--drain", type=float, default=2.0, help="송신 종료 후 처리 유예 (초)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=24567)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args), ensure_ascii=False))
+        return
+
+    # 모드별로 별도 프로세스에서 실행하여 메모리 측정이 섞이지 않도록 함
+    columns = ["sent_per_s", "received_per_s", "lost", "lat_p50_ms", "lat_p95_ms", "lat_p99_ms",
+               "lat_max_ms", "rss_start_mb", "rss_end_mb", "rss_peak_mb"]
+    print(f"{'mode':<10}" + "".join(f"{c:>15}" for c in columns))
+    for i, mode in enumerate(["headless", "gui"]):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--clients", str(args.clients), "--rate", str(args.rate), "--seconds", str(args.seconds),
+             "--fragment", str(args.fragment), "--pose-ratio", str(args.pose_ratio),
+             "--max-text", str(args.max_text), "--drain", str(args.drain), "--seed", str(args.seed),
+             "--port", str(args.port + i)],
+            capture_output=True, text=True
+        )
+        try:
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            print(f"{mode:<10} 실행 실패: {out.stderr.strip()[-200:]}")
+            continue
+        print(f"{mode:<10}" + "".join(f"{result[c]:>15}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
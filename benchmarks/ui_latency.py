@@ -0,0 +1,227 @@
+"""
+UI 지연 벤치마크 - 루프 실행 모드(thread / shared / qt)별 비교
+
+가짜 모드버스 클라이언트로 폴링하고, 로컬 소켓 클라이언트가 메시지를 계속 보내는
+부하 상태에서 Qt 타이머 지연(UI 응답성)을 측정합니다.
+
+사용법:
+    python benchmarks/ui_latency.py                 # 모든 모드 비교
+    python benchmarks/ui_latency.py --mode shared   # 한 모드만 측정
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+TIMER_INTERVAL_MS = 10
+
+
+class FakeClient:
+    """RobotMonitor.client 대용"""
+    connected = True
+
+    async def write_register(self, address, value):
+        await asyncio.sleep(0.002)
+
+    async def write_registers(self, address, values):
+        await asyncio.sleep(0.002)
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeRobotMonitor:
+    """로봇 없이 폴링 부하를 만드는 RobotMonitor 대용"""
+    def __init__(self, host=None, port=502, callback=None):
+        self.client = FakeClient()
+        self.callback = callback or print
+
+    async def connect(self):
+        self.callback("가짜 로봇 서버에 연결되었습니다.")
+
+    async def read_registers(self, address, count):
+        await asyncio.sleep(0.003)  # 네트워크 왕복 시간 흉내
+        return [random.randrange(4) for _ in range(count)]
+
+    def stop(self):
+        pass
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def thread_count():
+    try:
+        return len(os.listdir('/proc/self/task'))
+    except OSError:
+        return threading.active_count()
+
+
+def start_socket_load(port, clients, rate, stop_event):
+    """별도 스레드에서 소켓 클라이언트 부하 생성"""
+    async def client(idx):
+        for _ in range(50):
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                break
+            except OSError:
+                await asyncio.sleep(0.1)
+        else:
+            return
+        interval = 1.0 / rate
+        n = 0
+        while not stop_event.is_set():
+            if n % 10 == 0:
+                poses = ", ".join(f"p[{random.random():.4f}, 0.1, 0.2, 0.0, 3.14, 0.0]" for _ in range(14))
+                writer.write(f"A_prepos_l: [{poses}]\n".encode())
+            else:
+                writer.write(f"client {idx} message {n}\n".encode())
+            await writer.drain()
+            n += 1
+            await asyncio.sleep(interval)
+        writer.close()
+
+    def runner():
+        async def main():
+            await asyncio.gather(*(client(i) for i in range(clients)))
+        asyncio.run(main())
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    return thread
+
+
+def run_mode(mode, seconds, clients, rate, port):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    from modbus_monitoring.core import monitor_thread as monitor_module
+    from modbus_monitoring.core.event_loop import SharedLoopThread, create_qt_event_loop
+    from modbus_monitoring.widgets import LogWidget
+    from modbus_monitoring.socket import SocketLogWidget
+
+    monitor_module.RobotMonitor = FakeRobotMonitor
+
+    app = QApplication(sys.argv[:1])
+
+    loop = None
+    loop_thread = None
+    if mode == "qt":
+        loop = create_qt_event_loop(app)
+        if loop is None:
+            return {"mode": mode, "error": "qasync 미설치"}
+    elif mode == "shared":
+        loop_thread = SharedLoopThread()
+        loop_thread.start()
+        loop = loop_thread.loop
+
+    monitor = monitor_module.MonitorThread(host="127.0.0.1", loop=loop)
+    log_widget = LogWidget(monitor)
+    monitor.log_signal.connect(log_widget.append_log)
+    socket_widget = SocketLogWidget(loop=loop)
+    socket_widget.host_input.setText("127.0.0.1")
+    socket_widget.port_input.setValue(port)
+
+    lags = []
+    last = [time.perf_counter()]
+
+    def on_tick():
+        now = time.perf_counter()
+        lags.append((now - last[0]) * 1000 - TIMER_INTERVAL_MS)
+        last[0] = now
+
+    timer = QTimer()
+    timer.timeout.connect(on_tick)
+
+    stop_event = threading.Event()
+    threads = [0]
+
+    def begin():
+        monitor.start()
+        socket_widget.start_socket_server()
+        start_socket_load(port, clients, rate, stop_event)
+        last[0] = time.perf_counter()
+        timer.start(TIMER_INTERVAL_MS)
+
+    def finish():
+        timer.stop()
+        threads[0] = thread_count()
+        stop_event.set()
+        monitor.stop()
+        socket_widget.stop_socket_server()
+        if loop is None or loop_thread:
+            monitor.wait()
+        if loop_thread:
+            loop_thread.stop()
+            loop_thread.wait()
+        app.quit()
+
+    QTimer.singleShot(0, begin)
+    QTimer.singleShot(int(seconds * 1000), finish)
+
+    if mode == "qt":
+        with loop:
+            loop.run_forever()
+    else:
+        app.exec_()
+
+    return {
+        "mode": mode,
+        "threads": threads[0],
+        "ticks": len(lags),
+        "lag_p50_ms": round(percentile(lags, 50), 3),
+        "lag_p95_ms": round(percentile(lags, 95), 3),
+        "lag_p99_ms": round(percentile(lags, 99), 3),
+        "lag_max_ms": round(max(lags) if lags else 0.0, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="루프 모드별 UI 지연 벤치마크")
+    parser.add_argument("--mode", choices=["thread", "shared", "qt"])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=200.0, help="클라이언트당 초당 메시지 수")
+    parser.add_argument("--port", type=int, default=23456)
+    args = parser.parse_args()
+
+    if args.mode:
+        result = run_mode(args.mode, args.seconds, args.clients, args.rate, args.port)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    # 모드별로 별도 프로세스에서 실행하여 서로 간섭하지 않도록 함
+    print(f"{'mode':<8}{'threads':>8}{'ticks':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for i, mode in enumerate(["thread", "shared", "qt"]):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--seconds", str(args.seconds), "--clients", str(args.clients),
+             "--rate", str(args.rate), "--port", str(args.port + i)],
+            capture_output=True, text=True
+        )
+        try:
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            print(f"{mode:<8} 실행 실패: {out.stderr.strip()[-200:]}")
+            continue
+        if "error" in result:
+            print(f"{mode:<8} {result['error']}")
+            continue
+        print(f"{mode:<8}{result['threads']:>8}{result['ticks']:>8}"
+              f"{result['lag_p50_ms']:>9}{result['lag_p95_ms']:>9}"
+              f"{result['lag_p99_ms']:>9}{result['lag_max_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
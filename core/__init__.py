@@ -4,5 +4,31 @@
 """
 from .monitor_thread import MonitorThread
 from .read_registers import RobotMonitor
+from .monitor_engine import MonitorEngine
+from .poller import RegisterPoller, PollBlock, AdaptiveRate, CycleStatus, RequestTimeout, address_key, split_key, format_address, format_addresses
+from .process_monitor import ProcessMonitor
+from .shared_snapshot import SharedSnapshot, EventRing
+from .change_publisher import ChangePublisher, subscribe
+from .process_image_server import ProcessImage, ProcessImageServer
+from .register_map import RegisterMap, RegisterField, RegisterDecoder, load_register_map
+from .history import ChangeHistory, TrendHistory
+from .address_stats import AddressStats
+from .filters import ChangeFilter, FilterRule, load_filters
+from .triggers import TriggerEngine, TriggerRule, Condition, load_triggers
+from .cycles import CycleAnalytics, CycleTracker, RunningStats, QuantileSketch, load_cycles
+from .discovery import AddressScanner, DiscoveryResult, load_discovered
+from .timeline import EventTimeline, TimelineEvent
+from .simulation import Simulation, VirtualClockLoop, ScriptedModbusClient
+from .log_index import LogIndex, LogLine, parse_addresses
 
-__all__ = ['MonitorThread','RobotMonitor']
\ No newline at end of file
+__all__ = ['MonitorThread','RobotMonitor','MonitorEngine','RegisterPoller','PollBlock','AdaptiveRate','CycleStatus','RequestTimeout','address_key','split_key','format_address','format_addresses',
+           'ProcessMonitor','SharedSnapshot','EventRing',
+           'ChangePublisher','subscribe',
+           'ProcessImage','ProcessImageServer',
+           'RegisterMap','RegisterField','RegisterDecoder','load_register_map',
+           'ChangeHistory','TrendHistory','AddressStats','ChangeFilter','FilterRule','load_filters','TriggerEngine','TriggerRule','Condition','load_triggers',
+           'CycleAnalytics','CycleTracker','RunningStats','QuantileSketch','load_cycles',
+           'AddressScanner','DiscoveryResult','load_discovered',
+           'EventTimeline','TimelineEvent',
+           'Simulation','VirtualClockLoop','ScriptedModbusClient',
+           'LogIndex','LogLine','parse_addresses']
\ No newline at end of file
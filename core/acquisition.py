@@ -0,0 +1,139 @@
+"""
+수집 프로세스 모듈
+별도 프로세스에서 모드버스 폴링/변경 감지를 실행하고 결과를 공유 메모리로 게시
+(GUI 쪽 어댑터는 process_monitor.ProcessMonitor)
+"""
+import asyncio
+import os
+import queue
+from .read_registers import RobotMonitor, HEARTBEAT_REGISTER, REQUEST_TIMEOUT, WRITE_TIMEOUT
+from .poller import RegisterPoller, AdaptiveRate, DEFAULT_RANGES
+from .monitor_engine import MonitorEngine
+from .shared_snapshot import SharedSnapshot, EventRing
+from .profiling import profiler, PROFILE_DIR_ENV
+
+
+class AcquisitionEngine:
+    """수집 프로세스 본체 - 명령 큐를 처리하며 폴링 결과를 스냅샷/링에 기록"""
+    def __init__(self, host, port, snapshot_name, ring_name, cmd_queue, event_queue, interval=0.5,
+                 adaptive=None, sources=None, request_timeout=REQUEST_TIMEOUT, write_timeout=WRITE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.snapshot_name = snapshot_name
+        self.ring_name = ring_name
+        self.cmd_queue = cmd_queue
+        self.event_queue = event_queue
+        self.interval = interval
+        self.adaptive = adaptive  # AdaptiveRate 인자 dict (None 이면 고정 주기)
+        self.sources = sources or []  # 추가 폴링 소스 [(소스, 시작, 개수)]
+        self.request_timeout = request_timeout  # 요청별 제한 시간 (초) - 폴링 읽기 / 하트비트·쓰기
+        self.write_timeout = write_timeout
+        self.running = True
+        self.cycle = 0
+        self.monitor = None
+        self.poller = None
+        self.engine = None  # 하트비트/쓰기/감시/초기화 (MonitorThread 와 같은 MonitorEngine)
+        self.ring = None
+
+    def log(self, msg):
+        self.event_queue.put(('log', msg))
+
+    async def run(self):
+        profiler.instrument_loop(asyncio.get_running_loop(), "acquisition")
+        snapshot = SharedSnapshot(self.snapshot_name, create=False)
+        self.ring = EventRing(self.ring_name, create=False)
+        self.monitor = RobotMonitor(host=self.host, port=self.port, callback=self.log,
+                                    request_timeout=self.request_timeout, write_timeout=self.write_timeout)
+        self.poller = RegisterPoller(
+            self.monitor,
+            ranges=DEFAULT_RANGES,
+            excluded={128, 161},
+            interval=self.interval,
+            callback=self.log
+        )
+        for source, start, count in self.sources:
+            self.poller.add_block(start, count, source=source)
+        if self.adaptive:
+            self.poller.set_adaptive(AdaptiveRate(**{"ignore": {HEARTBEAT_REGISTER}, **self.adaptive}))
+        self.engine = MonitorEngine(self.poller, self.log, self.monitor)
+        try:
+            await self.monitor.connect()
+            while self.running:
+                await self.handle_commands()
+
+                # 링에는 원본 변경을 넣음 - 변경 필터는 GUI 쪽 표시 경로에서만 적용 (MonitorThread 와 같음)
+                changes = await self.poller.poll_once()
+                if changes:
+                    self.cycle += 1
+                    # 블록별 응답 수신 시각을 함께 넘겨 GUI 타임라인에서 소켓 이벤트와 맞춤
+                    stamps = {key: t_ns for t_ns, block in self.poller.last_stamps for key in block}
+                    self.ring.push_many(changes, self.cycle, stamps)
+                if self.poller.last_blocks:
+                    snapshot.publish(self.poller.last_blocks, self.cycle)
+
+                await asyncio.sleep(min(self.poller.next_wakeup(), 0.05))
+
+        except Exception as e:
+            self.log(f"모니터링 오류: {str(e)}")
+
+        finally:
+            self.engine.close()
+            try:
+                await self.monitor.client.close()
+            except Exception:
+                pass
+            snapshot.close()
+            self.ring.close()
+
+    async def handle_commands(self):
+        """GUI 프로세스에서 온 명령 처리 (블로킹하지 않음)"""
+        while True:
+            try:
+                cmd, *args = self.cmd_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            if cmd == 'stop':
+                self.running = False
+            elif cmd == 'watch':
+                # 레지스터 목록 - 폴링 범위 밖 레지스터는 단일 블록으로 추가
+                for register in args[0]:
+                    self.engine.watch(register)
+            elif cmd == 'unwatch':
+                for register in args[0]:
+                    self.engine.unwatch(register)
+            elif cmd == 'write':
+                await self.write_register_value(*args)
+            elif cmd == 'heartbeat':
+                self.engine.set_heartbeat(args[0])
+            elif cmd == 'reset':
+                await self.engine.reset_registers()
+
+    async def write_register_value(self, register, value):
+        ok, confirmed = await self.engine.write_value(register, value)
+        if confirmed is not None:
+            # 쓰기 후 확인한 값 - 변경 이벤트로 GUI 에 전달
+            self.ring.push_many({register: confirmed}, self.cycle)
+        self.event_queue.put(('write_result', register, ok))
+
+
+def acquisition_main(host, port, snapshot_name, ring_name, cmd_queue, event_queue, interval=0.5,
+                     adaptive=None, sources=None, request_timeout=REQUEST_TIMEOUT, write_timeout=WRITE_TIMEOUT):
+    """수집 프로세스 진입점 (multiprocessing.Process target)"""
+    engine = AcquisitionEngine(host, port, snapshot_name, ring_name, cmd_queue, event_queue, interval,
+                               adaptive, sources, request_timeout, write_timeout)
+    # 프로파일링 환경 변수는 spawn 된 자식 프로세스에도 전달되므로 보고서를 따로 작성
+    profiler.start()
+    try:
+        asyncio.run(engine.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if profiler.enabled:
+            profiler.stop()
+            path = profiler.write_report(os.path.join(
+                os.environ.get(PROFILE_DIR_ENV, os.getcwd()),
+                f"profile_report_acquisition_{os.getpid()}.txt"
+            ))
+            engine.log(f"수집 프로세스 프로파일링 보고서 저장: {path}")
+        event_queue.put(('exited',))
@@ -0,0 +1,91 @@
+"""
+주소별 변경 통계 모듈
+폴러가 이미 계산한 변경 묶음만으로 (추가 읽기 없이) 주소별 통계를 누적
+- 변경 횟수, 마지막 변경 시각, 최소/최대 값
+- 지수 감쇠로 추정한 변경 빈도 (Hz)
+
+워커 스레드에서 record(), GUI 스레드에서 읽기 - 표시용이라 잠금 없이 사용
+"""
+import math
+import time
+
+
+class AddressStats:
+    """연속 주소 범위의 변경 통계"""
+    def __init__(self, start=128, count=128, tau=10.0):
+        self.start = start
+        self.count = count
+        self.tau = tau  # 변경 빈도 추정 시간 상수 (초)
+        self.reset()
+
+    def reset(self):
+        n = self.count
+        self.changes = [0] * n
+        self.last_change = [None] * n  # 벽시계 (표시용)
+        self.minimum = [None] * n
+        self.maximum = [None] * n
+        self.values = [None] * n
+        self._rate = [0.0] * n
+        self._rate_time = [0.0] * n  # monotonic
+        self.started = time.time()
+
+    def record(self, changes, now=None):
+        """변경 묶음 {주소: 값} 반영 - 첫 관측과 같은 값 재보고는 변경으로 세지 않음"""
+        now = time.monotonic() if now is None else now
+        wall = time.time()
+        start, count, tau = self.start, self.count, self.tau
+        for addr, value in changes.items():
+            i = addr - start
+            if not 0 <= i < count:
+                continue
+            previous = self.values[i]
+            self.values[i] = value
+            if previous is None:
+                self.minimum[i] = self.maximum[i] = value
+                continue
+            if previous == value:
+                continue
+
+            self.changes[i] += 1
+            self.last_change[i] = wall
+            self._rate[i] = self._rate[i] * math.exp((self._rate_time[i] - now) / tau) + 1 / tau
+            self._rate_time[i] = now
+            if value < self.minimum[i]:
+                self.minimum[i] = value
+            elif value > self.maximum[i]:
+                self.maximum[i] = value
+
+    def rate(self, addr, now=None):
+        """추정 변경 빈도 (Hz)"""
+        i = addr - self.start
+        now = time.monotonic() if now is None else now
+        return self._rate[i] * math.exp((self._rate_time[i] - now) / self.tau)
+
+    def rates(self, now=None):
+        """전체 주소의 추정 변경 빈도 리스트"""
+        now = time.monotonic() if now is None else now
+        tau = self.tau
+        return [r * math.exp((t - now) / tau) for r, t in zip(self._rate, self._rate_time)]
+
+    def summary(self, addr):
+        i = addr - self.start
+        return {
+            "address": addr,
+            "value": self.values[i],
+            "changes": self.changes[i],
+            "last_change": self.last_change[i],
+            "min": self.minimum[i],
+            "max": self.maximum[i],
+            "rate": self.rate(addr),
+        }
+
+    def ranking(self, limit=10):
+        """변경 빈도가 높은 주소 순 [(주소, Hz), ...]"""
+        rates = self.rates()
+        order = sorted(range(self.count), key=lambda i: -rates[i])
+        return [(self.start + i, rates[i]) for i in order[:limit] if rates[i] > 0]
+
+    def quiet(self):
+        """관측 이후 한 번도 바뀌지 않은 주소 목록 (폴링 제외 후보)"""
+        return [self.start + i for i in range(self.count)
+                if self.values[i] is not None and self.changes[i] == 0]
@@ -0,0 +1,189 @@
+"""
+변경 스트림 재게시 모듈
+하나의 모드버스 폴러가 읽은 변경 사항을 로컬 TCP/Unix 소켓으로 여러 구독자에게 전달
+(MES 브리지, 용접 품질 로거 등이 로봇에 직접 접속하지 않도록 함)
+
+프로토콜
+- 구독자 -> 서버: 접속 직후 한 줄 "SUB <주소 목록>\\n"
+    예) "SUB *", "SUB 128-140,202,211", "SUB coil:0-15,input:100"
+- 서버 -> 구독자: 바이너리 프레임
+    헤더 '!BHI' (종류, 항목 수, 시퀀스) + 항목 수 x '!IH' (주소 키, 값)
+    주소 키 상위 16비트는 폴링 소스 (0 홀딩, 1 코일, 2 디스크리트 입력, 3 입력 레지스터 - poller.split_key)
+    종류 1 = 구독 시점 스냅샷, 2 = 변경 델타
+- 구독자가 느려서 전송 큐가 가득 차면 연결을 끊음
+"""
+import asyncio
+import struct
+from .poller import SOURCES, address_key
+
+FRAME_SNAPSHOT = 1
+FRAME_DELTA = 2
+
+FRAME_HEADER = struct.Struct('!BHI')
+FRAME_ITEM = struct.Struct('!IH')
+
+
+def parse_address_spec(spec):
+    """"128-140,202,coil:0-7" 형식의 주소 목록을 주소 키 집합으로 변환 ("*" 또는 빈 문자열은 None = 전체)"""
+    spec = spec.strip()
+    if not spec or spec == '*':
+        return None
+    addresses = set()
+    for part in spec.split(','):
+        source, _, part = part.strip().rpartition(':')
+        if not part:
+            continue
+        source = source or "holding"
+        if source not in SOURCES:
+            raise ValueError(f"알 수 없는 소스: {source}")
+        base = address_key(source, 0)
+        if '-' in part:
+            lo, hi = part.split('-', 1)
+            addresses.update(range(base + int(lo), base + int(hi) + 1))
+        else:
+            addresses.add(base + int(part))
+    return addresses
+
+
+def encode_frame(kind, seq, items):
+    """프레임 인코딩 - items 는 (주소, 값) 쌍의 시퀀스"""
+    parts = [FRAME_HEADER.pack(kind, len(items), seq & 0xFFFFFFFF)]
+    parts.extend(FRAME_ITEM.pack(addr, value) for addr, value in items)
+    return b''.join(parts)
+
+
+class Subscriber:
+    """구독자 연결 하나 - 전송 큐와 전송 태스크를 가짐"""
+    def __init__(self, reader, writer, addresses, queue_size):
+        self.reader = reader
+        self.writer = writer
+        self.addresses = addresses  # None 이면 전체
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.task = None
+        self.peer = writer.get_extra_info('peername') or 'unix'
+
+    def select(self, changes):
+        if self.addresses is None:
+            return sorted(changes.items())
+        return sorted((a, v) for a, v in changes.items() if a in self.addresses)
+
+
+class ChangePublisher:
+    """폴러 변경 스트림을 구독자에게 나눠주는 로컬 서버
+
+    host/port 로 TCP, path 를 주면 Unix 소켓으로 열림
+    values 는 구독 시점 스냅샷을 만들 때 사용하는 {주소: 값} 딕셔너리 (폴러의 previous_values)
+    """
+    def __init__(self, values, host='127.0.0.1', port=15020, path=None,
+                 queue_size=256, callback=None):
+        self.values = values
+        self.host = host
+        self.port = port
+        self.path = path
+        self.queue_size = queue_size
+        self.callback = callback or print
+        self.subscribers = set()
+        self.seq = 0
+        self.server = None
+
+    async def start(self):
+        if self.path:
+            self.server = await asyncio.start_unix_server(self.handle_subscriber, path=self.path)
+            self.callback(f"변경 스트림 게시 시작: {self.path}")
+        else:
+            self.server = await asyncio.start_server(self.handle_subscriber, self.host, self.port)
+            self.callback(f"변경 스트림 게시 시작: {self.host}:{self.port}")
+
+    async def handle_subscriber(self, reader, writer):
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            text = line.decode('ascii', errors='replace').strip()
+            if not text.startswith('SUB'):
+                raise ValueError(f"잘못된 구독 요청: {text!r}")
+            addresses = parse_address_spec(text[3:])
+        except (asyncio.TimeoutError, ValueError, ConnectionError) as e:
+            self.callback(f"구독 요청 오류: {e}")
+            writer.close()
+            return
+
+        subscriber = Subscriber(reader, writer, addresses, self.queue_size)
+        # 구독 시점 스냅샷을 먼저 보낸 뒤 델타 전달
+        subscriber.queue.put_nowait(
+            encode_frame(FRAME_SNAPSHOT, self.seq, subscriber.select(self.values))
+        )
+        self.subscribers.add(subscriber)
+        subscriber.task = asyncio.current_task()
+        self.callback(f"구독자 연결: {subscriber.peer} ({len(self.subscribers)}명)")
+
+        try:
+            while True:
+                frame = await subscriber.queue.get()
+                if frame is None:
+                    break
+                writer.write(frame)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            writer.close()
+            self.callback(f"구독자 연결 종료: {subscriber.peer} ({len(self.subscribers)}명)")
+
+    def publish(self, changes):
+        """변경 묶음 게시 - 루프 스레드에서 호출, 블로킹하지 않음"""
+        if not self.subscribers or not changes:
+            return
+        self.seq += 1
+        frames = {}  # 같은 주소 집합을 가진 구독자끼리 인코딩 공유
+        for subscriber in list(self.subscribers):
+            key = None if subscriber.addresses is None else id(subscriber.addresses)
+            frame = frames.get(key)
+            if frame is None:
+                items = subscriber.select(changes)
+                frame = encode_frame(FRAME_DELTA, self.seq, items) if items else b''
+                frames[key] = frame
+            if not frame:
+                continue
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.drop(subscriber, "전송 지연")
+
+    def drop(self, subscriber, reason):
+        self.callback(f"구독자 {subscriber.peer} 연결 해제: {reason}")
+        self.subscribers.discard(subscriber)
+        if subscriber.task:
+            subscriber.task.cancel()
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+        for subscriber in list(self.subscribers):
+            if subscriber.task:
+                subscriber.task.cancel()
+        self.subscribers.clear()
+
+
+async def subscribe(addresses='*', host='127.0.0.1', port=15020, path=None):
+    """구독 클라이언트 - (종류, 시퀀스, {주소: 값}) 를 차례로 전달하는 비동기 제너레이터
+
+    사용 예:
+        async for kind, seq, values in subscribe("202,211"):
+            ...
+    """
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"SUB {addresses}\n".encode('ascii'))
+    await writer.drain()
+    try:
+        while True:
+            header = await reader.readexactly(FRAME_HEADER.size)
+            kind, count, seq = FRAME_HEADER.unpack(header)
+            body = await reader.readexactly(count * FRAME_ITEM.size)
+            yield kind, seq, dict(FRAME_ITEM.iter_unpack(body))
+    except asyncio.IncompleteReadError:
+        return
+    finally:
+        writer.close()
@@ -0,0 +1,240 @@
+"""
+사이클 분석 모듈
+상태 레지스터(예: 202 용접 상태)의 전환을 따라 용접/프로그램 사이클을 나누고
+사이클 시간 통계를 스트리밍으로 누적 (사이클 수와 상관없이 메모리 일정)
+
+- RunningStats:   개수/평균/분산/최소/최대 (Welford)
+- QuantileSketch: 상대 오차 1% 로그 구간 히스토그램 (p50/p90/p99)
+- CycleTracker:   정의 하나 - 조건이 참이 되면 시작, 거짓이 되면 종료 + 상태별 체류 시간
+- CycleAnalytics: 주소 -> 추적기 색인으로 변경된 주소의 추적기만 갱신
+
+정의 파일 예시 (cycles.example.toml 참고 - 없으면 202 != 0 인 구간을 용접 사이클로 봄):
+
+    [[cycle]]
+    name = "weld"
+    state = 202             # 상태별 체류 시간을 집계할 레지스터 (생략 가능)
+    min_duration = 0.2      # 이보다 짧은 사이클은 무시 (초)
+    active = [              # 사이클 진행 조건 (AND, 트리거 조건과 같은 형식)
+        { address = 202, not_equals = 0 },
+    ]
+"""
+import math
+import threading
+import time
+from .triggers import Condition
+from .register_map import tomllib
+
+DEFAULT_CYCLES = [
+    {"name": "weld", "state": 202, "active": [{"address": 202, "not_equals": 0}]},
+]
+
+
+class RunningStats:
+    """Welford 방식 평균/분산 누적"""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if self.minimum is None or x < self.minimum:
+            self.minimum = x
+        if self.maximum is None or x > self.maximum:
+            self.maximum = x
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """양수 값의 분위수 스케치 - 값 x 는 gamma**(k-1) < x <= gamma**k 인 구간 k 에 셈
+
+    구간 대표값의 상대 오차는 relative_accuracy 이하. 구간 수가 max_bins 를 넘으면
+    가장 작은 구간끼리 합침 (긴 꼬리 쪽 분위수 정확도 유지)
+    """
+    def __init__(self, relative_accuracy=0.01, max_bins=2048):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.bins = {}  # k -> 개수
+        self.zero_count = 0  # 0 이하 값
+        self.count = 0
+
+    def add(self, x):
+        self.count += 1
+        if x <= 0:
+            self.zero_count += 1
+            return
+        k = math.ceil(math.log(x) / self._log_gamma)
+        self.bins[k] = self.bins.get(k, 0) + 1
+        if len(self.bins) > self.max_bins:
+            lowest, second = sorted(self.bins)[:2]
+            self.bins[second] += self.bins.pop(lowest)
+
+    def quantile(self, q):
+        """q (0~1) 분위수 추정값 - 데이터가 없으면 None"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for k in sorted(self.bins):
+            seen += self.bins[k]
+            if rank < seen:
+                return 2 * self.gamma ** k / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+
+class CycleTracker:
+    """사이클 정의 하나의 상태와 통계"""
+    def __init__(self, name, active, state=None, min_duration=0.0):
+        if not active:
+            raise ValueError(f"사이클 {name}: 진행 조건(active)이 없습니다")
+        self.name = name
+        self.conditions = [c if isinstance(c, Condition) else Condition(**c) for c in active]
+        self.state_address = state
+        self.min_duration = min_duration
+        self.lock = threading.Lock()  # GUI 스레드의 snapshot() 과 분리
+        self.started = None  # 진행 중인 사이클 시작 시각 (monotonic)
+        self.active = None  # 마지막 조건 평가 결과 (None: 아직 평가 전)
+        self.state_value = None
+        self.state_since = None
+        self.reset()
+
+    def reset(self, now=None):
+        """통계 초기화 - 진행 중인 사이클과 현재 상태는 유지"""
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch()
+        self.last = None  # 마지막 사이클 시간
+        self.ignored = 0  # min_duration 미만으로 버린 사이클 수
+        self.state_times = {}  # 상태 값 -> 누적 체류 시간 (초)
+        if self.state_value is not None:
+            self.state_since = time.monotonic() if now is None else now
+
+    @property
+    def addresses(self):
+        addresses = {c.address for c in self.conditions}
+        if self.state_address is not None:
+            addresses.add(self.state_address)
+        return addresses
+
+    def update(self, values, changes, now):
+        """조건/상태 재평가 - 사이클이 끝났으면 사이클 시간 반환"""
+        with self.lock:
+            if self.state_address in changes:
+                if self.state_value is not None:
+                    self.state_times[self.state_value] = (
+                        self.state_times.get(self.state_value, 0.0) + now - self.state_since)
+                self.state_value = changes[self.state_address]
+                self.state_since = now
+
+            # 히스테리시스 상태를 위해 모든 조건을 평가 (단락 평가 안 함)
+            results = [c.evaluate(values.get(c.address)) for c in self.conditions]
+            active = all(results)
+            first, self.active = self.active is None, active
+            if first:
+                # 모니터링 시작 시 이미 진행 중이던 사이클은 시작 시각을 모르므로 세지 않음
+                return None
+            if active and self.started is None:
+                self.started = now
+            elif not active and self.started is not None:
+                duration = now - self.started
+                self.started = None
+                if duration < self.min_duration:
+                    self.ignored += 1
+                    return None
+                self.stats.add(duration)
+                self.sketch.add(duration)
+                self.last = duration
+                return duration
+            return None
+
+    def snapshot(self, now=None):
+        """GUI 표시용 통계 dict"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            state_times = dict(self.state_times)
+            if self.state_value is not None:
+                state_times[self.state_value] = state_times.get(self.state_value, 0.0) + now - self.state_since
+            return {
+                "name": self.name,
+                "count": self.stats.count,
+                "mean": self.stats.mean if self.stats.count else None,
+                "stdev": self.stats.stdev if self.stats.count > 1 else None,
+                "min": self.stats.minimum,
+                "max": self.stats.maximum,
+                "p50": self.sketch.quantile(0.5),
+                "p90": self.sketch.quantile(0.9),
+                "p99": self.sketch.quantile(0.99),
+                "last": self.last,
+                "running": None if self.started is None else now - self.started,
+                "ignored": self.ignored,
+                "state": self.state_value,
+                "state_times": state_times,
+            }
+
+    def describe(self):
+        return " and ".join(c.describe() for c in self.conditions)
+
+
+class CycleAnalytics:
+    """주소 -> 추적기 색인으로 변경된 주소에 걸린 추적기만 갱신"""
+    def __init__(self, definitions):
+        self.trackers = [d if isinstance(d, CycleTracker) else CycleTracker(**d) for d in definitions]
+        self.values = {}  # 조건/상태 주소의 마지막 값 (변경 묶음으로만 갱신)
+        self.index = {}
+        for tracker in self.trackers:
+            for addr in tracker.addresses:
+                self.index.setdefault(addr, []).append(tracker)
+
+    def process(self, changes, now=None):
+        """한 주기의 변경 묶음 처리 - 이번에 끝난 [(추적기, 사이클 시간)] 반환"""
+        if not changes:
+            return []
+        now = time.monotonic() if now is None else now
+        touched = []
+        for addr, value in changes.items():
+            trackers = self.index.get(addr)
+            if trackers is None:
+                continue
+            self.values[addr] = value
+            for tracker in trackers:
+                if tracker not in touched:
+                    touched.append(tracker)
+
+        completed = []
+        for tracker in touched:
+            duration = tracker.update(self.values, changes, now)
+            if duration is not None:
+                completed.append((tracker, duration))
+        return completed
+
+    def snapshots(self, now=None):
+        now = time.monotonic() if now is None else now
+        return [tracker.snapshot(now) for tracker in self.trackers]
+
+    def reset(self):
+        for tracker in self.trackers:
+            with tracker.lock:
+                tracker.reset()
+
+
+def load_cycles(path):
+    """TOML 정의 파일 로드 -> CycleTracker 목록"""
+    if tomllib is None:
+        raise RuntimeError("TOML 파서가 없습니다 (Python 3.11+ 또는 pip install tomli)")
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    return [CycleTracker(**entry) for entry in data.get("cycle", [])]
@@ -0,0 +1,327 @@
+"""
+주소 공간 탐색 모듈
+장비가 어떤 홀딩/입력 레지스터, 코일/디스크리트 입력 주소를 제공하는지 찾아 맵 파일로 저장
+
+- 구간을 최대 읽기 크기 블록으로 나눠 동시에(연결 여러 개, 초당 요청 수 제한) 읽음
+- 읽기가 실패한 블록은 반으로 나눠 다시 읽어 읽을 수 있는 정확한 구간을 찾음 (이분 탐색)
+- 쓰기 확인(probe_write)은 선택 사항 - 방금 읽은 값을 같은 주소에 다시 써 보는 방식이므로
+  값이 계속 바뀌는 레지스터가 있는 장비에서는 사용하지 마세요
+
+이분 탐색은 min_block(기본 16) 크기에서 멈추고, 찾은 구간의 양 끝만 주소 단위로 다시 이분 탐색하므로
+구멍(읽을 수 없는 구간)이 넓어도 0-65535 전체를 수천 번의 요청으로 끝냄.
+단, 구멍 안에 따로 떨어진 min_block 두 배보다 짧은 구간은 놓칠 수 있음 - 빠짐없이 찾으려면 min_block=1
+(구멍 블록마다 2*125 번 가까이 요청하므로 훨씬 느림)
+
+사용법:
+    python -m modbus_monitoring.core.discovery --host 192.168.1.7 --table holding --table coil
+    python -m modbus_monitoring.core.discovery --host 192.168.1.7 --start 0 --end 4095 --probe-write
+
+결과 파일 (TOML):
+    [holding]
+    readable = [[0, 99], [128, 255]]   # 읽을 수 있는 구간 (처음, 끝 - 포함)
+    writable = [[128, 255]]            # probe_write 로 확인한 구간
+    poll = [[0, 100], [128, 125], [253, 3]]  # RegisterPoller ranges 형식 (시작, 개수)
+"""
+import asyncio
+import itertools
+import time
+from datetime import datetime
+from .register_map import tomllib
+
+# 테이블별 (읽기 함수, 한 번에 읽을 수 있는 최대 개수, 쓰기 함수, 한 번에 쓸 수 있는 최대 개수)
+TABLES = {
+    "holding": ("read_holding_registers", 125, "write_registers", 123),
+    "input": ("read_input_registers", 125, None, 0),
+    "coil": ("read_coils", 2000, "write_coils", 1968),
+    "discrete": ("read_discrete_inputs", 2000, None, 0),
+}
+
+
+class RateLimiter:
+    """초당 요청 수 제한 - 요청 시각을 1/rate 간격으로 배정"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def merge_ranges(ranges):
+    """(처음, 끝) 구간 목록을 정렬하고 이어지거나 겹치는 구간을 합침"""
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return [tuple(r) for r in merged]
+
+
+def poll_ranges(ranges, max_count=125):
+    """(처음, 끝) 구간 목록 -> RegisterPoller ranges 형식 [(시작, 개수), ...]"""
+    result = []
+    for first, last in ranges:
+        for start in range(first, last + 1, max_count):
+            result.append((start, min(max_count, last + 1 - start)))
+    return result
+
+
+class DiscoveryResult:
+    """테이블 하나의 탐색 결과"""
+    def __init__(self, table, start, end):
+        self.table = table
+        self.start = start
+        self.end = end
+        self.readable = []  # [(처음, 끝)]
+        self.writable = []
+        self.write_probed = False
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.elapsed = 0.0
+
+    @property
+    def readable_count(self):
+        return sum(last - first + 1 for first, last in self.readable)
+
+    def summary(self):
+        text = (f"{self.table} {self.start}-{self.end}: 읽기 가능 {self.readable_count}개 "
+                f"({len(self.readable)}개 구간), 요청 {self.requests}회 (실패 {self.errors}, "
+                f"시간 초과 {self.timeouts}), {self.elapsed:.2f}s")
+        if self.write_probed:
+            text += f", 쓰기 가능 {sum(b - a + 1 for a, b in self.writable)}개"
+        return text
+
+    def to_toml(self):
+        def ranges(items):
+            return "[" + ", ".join(f"[{a}, {b}]" for a, b in items) + "]"
+        max_read = TABLES[self.table][1]
+        lines = [f"[{self.table}]",
+                 f"scanned = [{self.start}, {self.end}]",
+                 f"readable = {ranges(self.readable)}"]
+        if self.write_probed:
+            lines.append(f"writable = {ranges(self.writable)}")
+        lines.append(f"poll = {ranges(poll_ranges(self.readable, max_read))}")
+        return "\n".join(lines)
+
+
+class AddressScanner:
+    """동시 요청 + 이분 탐색 주소 스캐너
+
+    clients: pymodbus 비동기 클라이언트(또는 같은 메서드를 가진 객체) 목록 - 번갈아 사용
+    """
+    def __init__(self, clients, concurrency=16, rate=1000.0, timeout=1.0, retries=1,
+                 min_block=16, callback=None):
+        self.clients = list(clients)
+        self._next_client = itertools.cycle(self.clients)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.limiter = RateLimiter(rate)
+        self.timeout = timeout
+        self.retries = retries
+        self.min_block = max(1, min_block)
+        self.callback = callback or print
+        self._result = None
+
+    async def _call(self, method, address, arg):
+        """요청 한 번 - 예외 응답이면 None (시간 초과/연결 오류는 retries 만큼 재시도)"""
+        result = self._result
+        for attempt in range(self.retries + 1):
+            async with self.semaphore:
+                await self.limiter.acquire()
+                client = next(self._next_client)
+                result.requests += 1
+                try:
+                    if method.startswith("read"):
+                        response = await asyncio.wait_for(
+                            getattr(client, method)(address=address, count=arg), self.timeout)
+                    else:
+                        response = await asyncio.wait_for(
+                            getattr(client, method)(address=address, values=arg), self.timeout)
+                except asyncio.TimeoutError:
+                    result.timeouts += 1
+                    continue
+                except Exception:
+                    result.errors += 1
+                    continue
+            if response.isError():
+                result.errors += 1
+                return None
+            return response
+        return None
+
+    async def _read(self, table, address, count):
+        method = TABLES[table][0]
+        response = await self._call(method, address, count)
+        if response is None:
+            return None
+        if table in ("coil", "discrete"):
+            return list(response.bits[:count])  # 비트 응답은 8의 배수로 채워져 옴
+        return list(response.registers)
+
+    async def _probe_read(self, table, start, count):
+        return await self._read(table, start, count) is not None
+
+    async def _probe_write(self, table, start, count):
+        """방금 읽은 값을 그대로 다시 써 보기"""
+        values = await self._read(table, start, count)
+        return values is not None and await self._call(TABLES[table][2], start, values) is not None
+
+    async def _bisect(self, probe, table, start, count, min_block, found):
+        """블록 확인 - 실패하면 반으로 나눠 동시에 다시 시도 (min_block 이하는 포기)"""
+        if await probe(table, start, count):
+            found.append((start, start + count - 1))
+            return
+        if count <= min_block:
+            return
+        half = count // 2
+        await asyncio.gather(
+            self._bisect(probe, table, start, half, min_block, found),
+            self._bisect(probe, table, start + half, count - half, min_block, found),
+        )
+
+    async def _extend(self, probe, table, first, last, low, high):
+        """구간 (first, last) 양 끝을 low/high 안에서 주소 단위로 넓힘
+
+        포기한 블록(min_block 이하) 안에서 구간에 붙은 부분만 찾으면 되므로
+        연속 구간 길이에 대한 이분 탐색으로 log2(min_block) 번이면 충분
+        """
+        async def longest(limit, block):
+            lo, hi = 0, limit  # lo: 확인된 길이
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if await probe(table, *block(mid)):
+                    lo = mid
+                else:
+                    hi = mid - 1
+            return lo
+
+        bound = self.min_block - 1
+        left, right = await asyncio.gather(
+            longest(min(bound, first - low), lambda k: (first - k, k)),
+            longest(min(bound, high - last), lambda k: (last + 1, k)),
+        )
+        return first - left, last + right
+
+    async def _discover(self, probe, table, ranges, max_count):
+        """(처음, 끝) 구간들 안에서 probe 가 성공하는 정확한 구간 목록"""
+        found = []
+        await asyncio.gather(*(
+            self._bisect(probe, table, addr, min(max_count, last + 1 - addr), self.min_block, found)
+            for first, last in ranges
+            for addr in range(first, last + 1, max_count)
+        ))
+        found = merge_ranges(found)
+        if self.min_block <= 1 or not found:
+            return found
+
+        # 경계 다듬기 - 이웃 구간이나 탐색 범위를 넘지 않는 곳까지만
+        limits = []
+        for i, (first, last) in enumerate(found):
+            outer = next(r for r in ranges if r[0] <= first and last <= r[1])
+            low = max(outer[0], found[i - 1][1] + 1 if i else outer[0])
+            high = min(outer[1], found[i + 1][0] - 1 if i + 1 < len(found) else outer[1])
+            limits.append((first, last, low, high))
+        return merge_ranges(await asyncio.gather(*(
+            self._extend(probe, table, *limit) for limit in limits
+        )))
+
+    async def scan(self, table="holding", start=0, end=65535, probe_write=False):
+        """[start, end] 구간 탐색 -> DiscoveryResult"""
+        if table not in TABLES:
+            raise ValueError(f"알 수 없는 테이블: {table} (가능: {', '.join(TABLES)})")
+        _, max_read, write_method, max_write = TABLES[table]
+        result = self._result = DiscoveryResult(table, start, end)
+        started = time.monotonic()
+
+        result.readable = await self._discover(self._probe_read, table, [(start, end)], max_read)
+        self.callback(f"{table}: 읽기 탐색 완료 - {len(result.readable)}개 구간, 요청 {result.requests}회")
+
+        if probe_write and write_method:
+            result.write_probed = True
+            result.writable = await self._discover(self._probe_write, table, result.readable, max_write)
+
+        result.elapsed = time.monotonic() - started
+        self.callback(result.summary())
+        return result
+
+
+def write_discovered(path, results, host=None):
+    """탐색 결과 목록을 TOML 맵 파일로 저장"""
+    header = [f"# 주소 탐색 결과 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+              + (f", {host}" if host else "") + ")"]
+    header.extend(f"# {result.summary()}" for result in results)
+    body = "\n\n".join(result.to_toml() for result in results)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(header) + "\n\n" + body + "\n")
+
+
+def load_discovered(path):
+    """맵 파일 로드 -> {테이블: {"readable": [(처음, 끝)], "writable": [...], "poll": [(시작, 개수)]}}"""
+    if tomllib is None:
+        raise RuntimeError("TOML 파서가 없습니다 (Python 3.11+ 또는 pip install tomli)")
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    return {
+        table: {key: [tuple(item) for item in data[table].get(key, [])]
+                for key in ("readable", "writable", "poll")}
+        for table in TABLES if table in data
+    }
+
+
+async def run_scan(host, port=502, tables=("holding",), start=0, end=65535, connections=4,
+                   concurrency=16, rate=1000.0, timeout=1.0, min_block=16, probe_write=False,
+                   output="discovered_map.toml", callback=print):
+    from pymodbus.client import AsyncModbusTcpClient
+
+    clients = [AsyncModbusTcpClient(host=host, port=port) for _ in range(connections)]
+    try:
+        for client in clients:
+            await client.connect()
+        scanner = AddressScanner(clients, concurrency=concurrency, rate=rate, timeout=timeout,
+                                 min_block=min_block, callback=callback)
+        results = []
+        for table in tables:
+            results.append(await scanner.scan(table, start, end, probe_write=probe_write))
+        write_discovered(output, results, host=f"{host}:{port}")
+        callback(f"탐색 결과 저장: {output}")
+        return results
+    finally:
+        for client in clients:
+            await client.close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="모드버스 주소 공간 탐색")
+    parser.add_argument("--host", required=True)
+    parser.add_argument("--port", type=int, default=502)
+    parser.add_argument("--table", action="append", choices=list(TABLES),
+                        help="탐색할 테이블 (여러 번 지정 가능, 기본 holding)")
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--end", type=int, default=65535)
+    parser.add_argument("--connections", type=int, default=4, help="동시 TCP 연결 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수")
+    parser.add_argument("--rate", type=float, default=1000.0, help="초당 최대 요청 수 (0 이면 제한 없음)")
+    parser.add_argument("--timeout", type=float, default=1.0, help="요청별 시간 제한 (초)")
+    parser.add_argument("--min-block", type=int, default=16,
+                        help="이분 탐색을 멈출 블록 크기 (1 이면 빠짐없이 주소 단위, 느림)")
+    parser.add_argument("--probe-write", action="store_true", help="읽은 값을 다시 써서 쓰기 가능 구간 확인")
+    parser.add_argument("--output", default="discovered_map.toml")
+    args = parser.parse_args()
+    asyncio.run(run_scan(
+        args.host, args.port, tuple(args.table or ["holding"]), args.start, args.end,
+        connections=args.connections, concurrency=args.concurrency, rate=args.rate,
+        timeout=args.timeout, min_block=args.min_block, probe_write=args.probe_write,
+        output=args.output,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+공유 이벤트 루프 모듈
+모드버스 폴러와 소켓 서버를 하나의 asyncio 루프에서 실행하기 위한 도구
+
+실행 모드
+- "thread": 기존 방식, MonitorThread / SocketMonitorThread 가 각자 루프를 생성
+- "shared": 하나의 워커 스레드(SharedLoopThread) 루프를 함께 사용
+- "qt":     qasync 로 Qt 이벤트 루프와 통합된 루프를 사용 (qasync 미설치 시 "shared")
+"""
+import asyncio
+import concurrent.futures
+from PyQt5.QtCore import QThread
+from .profiling import profiler
+
+LOOP_MODES = ("thread", "shared", "qt")
+
+
+class SharedLoopThread(QThread):
+    """여러 모니터가 함께 사용하는 asyncio 루프 스레드"""
+    def __init__(self):
+        super().__init__()
+        # 스레드 시작 전에도 작업을 예약할 수 있도록 루프를 미리 생성
+        self.loop = asyncio.new_event_loop()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        profiler.instrument_loop(self.loop, "shared-loop")
+        try:
+            self.loop.run_forever()
+            # 남은 태스크 정리 후 종료
+            pending = [t for t in asyncio.all_tasks(self.loop) if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        finally:
+            self.loop.close()
+
+    def submit(self, coro):
+        """코루틴을 루프에 예약 (concurrent.futures.Future 반환)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        """루프 중지 - 각 모니터를 먼저 stop/wait 한 뒤 호출"""
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def create_qt_event_loop(app):
+    """qasync 로 Qt 와 통합된 asyncio 루프 생성 - qasync 가 없으면 None"""
+    try:
+        import qasync
+    except ImportError:
+        return None
+
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    profiler.instrument_loop(loop, "qt-loop")
+    return loop
+
+
+def loop_in_current_thread(loop):
+    """현재 스레드에서 실행 중인 루프인지 확인"""
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def wait_future(future, loop, msecs=None):
+    """공유 루프에 예약된 작업의 완료 대기 (QThread.wait 와 같은 의미)
+
+    루프가 현재 스레드에서 돌고 있으면(qt 모드) 블로킹하지 않고 완료 여부만 반환
+    """
+    if future is None or future.done():
+        return True
+    if loop_in_current_thread(loop):
+        return False
+    timeout = None if msecs is None else msecs / 1000
+    done, _ = concurrent.futures.wait([future], timeout=timeout)
+    return bool(done)
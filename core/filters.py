@@ -0,0 +1,148 @@
+"""
+변경 필터 모듈
+값이 ±1씩 흔들리는 레지스터의 변경을 워커 스레드 안에서 걸러 로그/시그널/재게시 양을 줄임
+
+주소별 설정 (레지스터 맵 파일에 함께 두어도 됨 - [[filter]] 표만 읽음):
+
+    [[filter]]
+    addresses = [150, 151]   # 또는 address = 150, range = "150-160"
+    deadband = 2             # 마지막 보고 값과의 차이가 2 이상일 때만 보고
+    deadband_pct = 1.0       # 마지막 보고 값의 1% 이상 차이일 때만 보고
+    min_interval = 1.0       # 최소 보고 간격 (초) - 그 사이 값은 보류했다가 마지막 값만 보고
+    settle = 0.5             # 값이 0.5초 동안 그대로일 때 보고
+
+차이는 16비트 원형 거리로 계산 (int16 음수/카운터 넘침에서도 작은 흔들림은 작게 봄)
+"""
+import time
+from .register_map import tomllib
+
+
+def _distance(a, b):
+    d = (a - b) & 0xFFFF
+    return 0x10000 - d if d >= 0x8000 else d
+
+
+class FilterRule:
+    """주소 하나에 적용되는 필터 설정"""
+    def __init__(self, deadband=None, deadband_pct=None, min_interval=None, settle=None):
+        self.deadband = deadband
+        self.deadband_pct = deadband_pct
+        self.min_interval = min_interval
+        self.settle = settle
+
+    def significant(self, value, reported):
+        """마지막 보고 값 대비 데드밴드를 넘는 변경인지"""
+        if reported is None:
+            return True
+        distance = _distance(value, reported)
+        if self.deadband is not None and distance < self.deadband:
+            return False
+        if self.deadband_pct is not None and distance < abs(reported) * self.deadband_pct / 100:
+            return False
+        return distance > 0
+
+
+class ChangeFilter:
+    """주소별 필터를 변경 묶음에 적용 - 필터가 없는 주소는 그대로 통과"""
+    def __init__(self, rules):
+        self.rules = dict(rules)  # 주소 -> FilterRule
+        self.reported = {}  # 주소 -> 마지막으로 보고한 값
+        self.reported_at = {}  # 주소 -> 마지막 보고 시각 (monotonic)
+        self.pending = {}  # 주소 -> (보류 값, 마지막 변경 시각)
+        self.suppressed = 0  # 걸러낸 변경 수
+
+    @classmethod
+    def from_config(cls, entries):
+        """[[filter]] 표 목록 -> ChangeFilter"""
+        rules = {}
+        for entry in entries:
+            entry = dict(entry)
+            addresses = list(entry.pop("addresses", []))
+            if "address" in entry:
+                addresses.append(entry.pop("address"))
+            if "range" in entry:
+                lo, _, hi = str(entry.pop("range")).partition("-")
+                addresses.extend(range(int(lo), int(hi or lo) + 1))
+            if not addresses:
+                raise ValueError(f"필터에 주소가 없습니다: {entry}")
+            rule = FilterRule(**entry)
+            for addr in addresses:
+                rules[addr] = rule
+        return cls(rules)
+
+    def _report(self, out, addr, value, now):
+        out[addr] = value
+        self.reported[addr] = value
+        self.reported_at[addr] = now
+
+    def apply(self, changes, now=None):
+        """변경 묶음 필터링 - 보류 중이던 값이 조건을 만족하면 함께 반환
+
+        변경이 없는 주기에도 호출해야 보류 값이 제때 보고됨
+        """
+        now = time.monotonic() if now is None else now
+        rules = self.rules
+        out = {}
+
+        for addr, value in changes.items():
+            rule = rules.get(addr)
+            if rule is None:
+                out[addr] = value
+                continue
+            if rule.settle:
+                # 안정될 때까지 보류 (마지막 변경 시각 갱신)
+                if addr in self.pending:
+                    self.suppressed += 1
+                self.pending[addr] = (value, now)
+                continue
+            if not rule.significant(value, self.reported.get(addr)):
+                self.pending.pop(addr, None)
+                self.suppressed += 1
+                continue
+            if rule.min_interval and now - self.reported_at.get(addr, float("-inf")) < rule.min_interval:
+                if addr in self.pending:
+                    self.suppressed += 1
+                self.pending[addr] = (value, now)
+                continue
+            self._report(out, addr, value, now)
+
+        # 보류 값 처리 (안정 시간 / 최소 간격 경과)
+        for addr, (value, changed_at) in list(self.pending.items()):
+            if addr in out:
+                continue
+            rule = rules[addr]
+            if rule.settle and now - changed_at < rule.settle:
+                continue
+            if rule.min_interval and now - self.reported_at.get(addr, float("-inf")) < rule.min_interval:
+                continue
+            del self.pending[addr]
+            if rule.significant(value, self.reported.get(addr)):
+                self._report(out, addr, value, now)
+            else:
+                self.suppressed += 1
+
+        return out
+
+    def reset(self, addr=None):
+        """보고 기준 초기화 - 다음 변경은 데드밴드와 상관없이 보고"""
+        if addr is None:
+            self.reported.clear()
+            self.reported_at.clear()
+            self.pending.clear()
+        else:
+            self.reported.pop(addr, None)
+            self.reported_at.pop(addr, None)
+            self.pending.pop(addr, None)
+
+
+def load_filters(path):
+    """TOML 파일의 [[filter]] 표 목록 로드 (ChangeFilter.from_config 에 전달)
+
+    수집 프로세스에도 넘길 수 있도록 설정 목록 그대로 반환하되, 형식은 여기서 검증
+    """
+    if tomllib is None:
+        raise RuntimeError("TOML 파서가 없습니다 (Python 3.11+ 또는 pip install tomli)")
+    with open(path, "rb") as f:
+        entries = tomllib.load(f).get("filter", [])
+    ChangeFilter.from_config(entries)
+    return entries
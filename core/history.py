@@ -0,0 +1,235 @@
+"""
+변경 이력 모듈
+- ChangeHistory: 폴링 주기마다 감지된 변경을 (단조 시각, 주소, 값) 으로 고정 크기 링에 보관 (트리거 캡처용)
+- TrendHistory: 주소별 시계열과 최소/최대 피라미드 (트렌드 그래프용, 보존 기간/샘플 수 제한)
+"""
+import bisect
+import threading
+import time
+from array import array
+from collections import deque
+
+# 트렌드 보존 기간 (초, 트렌드 그래프의 가장 넓은 구간 8 h) / 주소별 최대 샘플 수
+TREND_WINDOW = 8 * 3600
+TREND_MAX_SAMPLES = 200000
+
+
+class ChangeHistory:
+    """최근 변경 이력 링 버퍼 - 가득 차면 가장 오래된 항목부터 버림"""
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self.entries = deque(maxlen=capacity)  # (monotonic 초, 주소, 값)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, changes, now=None):
+        """한 주기의 변경 묶음 {주소: 값} 기록"""
+        if not changes:
+            return
+        now = time.monotonic() if now is None else now
+        self.entries.extend((now, addr, value) for addr, value in sorted(changes.items()))
+
+    def window(self, start, end):
+        """start < 시각 <= end 구간의 변경 목록 (오래된 순)
+
+        최근 구간 조회가 대부분이므로 뒤에서부터 훑어 구간 크기만큼만 비용이 듦
+        """
+        result = []
+        for entry in reversed(self.entries):
+            if entry[0] <= start:
+                break
+            if entry[0] <= end:
+                result.append(entry)
+        result.reverse()
+        return result
+
+    def clear(self):
+        self.entries.clear()
+
+
+class TrendSeries:
+    """주소 하나의 시계열 (변경 시점만 저장하는 계단형 데이터)
+
+    FANOUT 개씩 묶은 최소/최대 피라미드를 추가할 때마다 갱신해 두어,
+    넓은 구간을 그릴 때도 픽셀 수에 비례하는 비용으로 열별 최소/최대를 구함
+
+    보존: window 초보다 오래되었거나 max_samples 를 넘는 앞쪽 샘플을 버림 (None 이면 제한 없음)
+    매번 자르지 않고 한도를 1/4 넘었을 때 한꺼번에 잘라 피라미드를 다시 만듦 (추가당 상수 비용)
+    """
+    FANOUT = 8
+
+    def __init__(self, window=TREND_WINDOW, max_samples=TREND_MAX_SAMPLES):
+        self.window = window
+        self.max_samples = max_samples
+        self.times = array('d')
+        self.values = array('d')
+        self.levels = []  # 레벨 k: (시작 시각, 최소, 최대) - 원본 FANOUT**(k+1) 개씩 묶음
+        self.lock = threading.Lock()
+        self._next_trim = None  # 다음 보존 기간 검사 시각
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, t, value):
+        with self.lock:
+            self.times.append(t)
+            self.values.append(value)
+            if self._over_limit(t):
+                self._trim(t)
+            elif len(self.times) % self.FANOUT == 0:
+                self._cascade()
+
+    def _over_limit(self, t):
+        if self.max_samples is not None and len(self.times) > self.max_samples + self.max_samples // 4:
+            return True
+        if self.window is None:
+            return False
+        if self._next_trim is None:
+            self._next_trim = self.times[0] + self.window * 1.25
+        return t >= self._next_trim
+
+    def _trim(self, t):
+        """보존 한도 밖의 앞쪽 샘플을 버리고 피라미드 재구성
+
+        계단형이므로 보존 구간 시작 직전 샘플 하나는 남겨 구간 첫 값을 유지 (마지막 샘플은 항상 남음)
+        """
+        drop = 0
+        if self.window is not None:
+            drop = max(bisect.bisect_right(self.times, t - self.window) - 1, 0)
+            self._next_trim = t + self.window * 0.25
+        if self.max_samples is not None:
+            drop = max(drop, len(self.times) - max(self.max_samples, 1))
+        if drop:
+            del self.times[:drop]
+            del self.values[:drop]
+            self._rebuild()
+        elif len(self.times) % self.FANOUT == 0:
+            self._cascade()
+
+    def _rebuild(self):
+        """원본에서 피라미드 전체를 다시 계산 (원본 FANOUT 개 단위로 묶어 올림)"""
+        fanout = self.FANOUT
+        self.levels = []
+        src_times, src_min, src_max = self.times, self.values, self.values
+        while len(src_times) >= fanout:
+            full = len(src_times) - len(src_times) % fanout
+            dst_times = array('d', src_times[0:full:fanout])
+            dst_min = array('d', (min(src_min[i:i + fanout]) for i in range(0, full, fanout)))
+            dst_max = array('d', (max(src_max[i:i + fanout]) for i in range(0, full, fanout)))
+            self.levels.append((dst_times, dst_min, dst_max))
+            src_times, src_min, src_max = dst_times, dst_min, dst_max
+
+    def _cascade(self):
+        fanout = self.FANOUT
+        src_times, src_min, src_max = self.times, self.values, self.values
+        level = 0
+        while True:
+            if len(self.levels) <= level:
+                self.levels.append((array('d'), array('d'), array('d')))
+            dst_times, dst_min, dst_max = self.levels[level]
+            dst_times.append(src_times[-fanout])
+            dst_min.append(min(src_min[-fanout:]))
+            dst_max.append(max(src_max[-fanout:]))
+            if len(dst_times) % fanout:
+                break
+            src_times, src_min, src_max = dst_times, dst_min, dst_max
+            level += 1
+
+    def columns(self, t0, t1, width, until=None):
+        """[t0, t1] 구간을 width 개 열로 나눈 (최소, 최대, 마지막 값) 목록 - 데이터 없는 열은 None
+
+        until 이후 열은 비워 둠 (실시간 보기에서 현재 시각 이후)
+        """
+        result = [None] * width
+        if width <= 0 or t1 <= t0:
+            return result
+        with self.lock:
+            n = len(self.times)
+            if not n:
+                return result
+            times, values = self.times, self.values
+            i0 = max(bisect.bisect_right(times, t0) - 1, 0)
+            i1 = bisect.bisect_right(times, t1)
+            if i1 <= i0:
+                return result
+
+            # 열당 점 수가 FANOUT 이하가 되는 가장 거친 레벨 선택 (확대하면 원본)
+            level = 0
+            count = i1 - i0
+            while level < len(self.levels) and count > width * self.FANOUT:
+                count //= self.FANOUT
+                level += 1
+
+            scale = width / (t1 - t0)
+            last_col = width - 1
+
+            def put(t, lo, hi, last):
+                c = min(max(int((t - t0) * scale), 0), last_col)
+                cell = result[c]
+                if cell is None:
+                    result[c] = [lo, hi, last]
+                else:
+                    if lo < cell[0]:
+                        cell[0] = lo
+                    if hi > cell[1]:
+                        cell[1] = hi
+                    cell[2] = last
+
+            raw_from = i0
+            if level:
+                block = self.FANOUT ** level
+                level_times, level_min, level_max = self.levels[level - 1]
+                j0 = i0 // block
+                j1 = min(len(level_times), i1 // block)
+                for j in range(j0, j1):
+                    put(level_times[j], level_min[j], level_max[j], values[(j + 1) * block - 1])
+                raw_from = max(i0, j1 * block)
+
+            # 피라미드에 묶이지 않은 앞뒤 원본 점
+            for i in range(raw_from, i1):
+                put(times[i], values[i], values[i], values[i])
+
+        # 계단형 - 빈 열은 직전 값으로 채움
+        end_col = last_col if until is None else min(last_col, int((until - t0) * scale))
+        previous = None
+        for c in range(width):
+            cell = result[c]
+            if cell is None:
+                if previous is not None and c <= end_col:
+                    result[c] = (previous, previous, previous)
+            else:
+                if previous is not None:
+                    cell[0] = min(cell[0], previous)
+                    cell[1] = max(cell[1], previous)
+                previous = cell[2]
+                result[c] = tuple(cell)
+        return result
+
+
+class TrendHistory:
+    """주소별 TrendSeries 모음 - 워커 스레드에서 기록, GUI 에서 조회 (window/max_samples 는 주소별 보존 한도)"""
+    def __init__(self, window=TREND_WINDOW, max_samples=TREND_MAX_SAMPLES):
+        self.window = window
+        self.max_samples = max_samples
+        self.series = {}
+
+    def record(self, changes, now=None):
+        """한 주기의 변경 묶음 {주소: 값} 기록 (now: 벽시계 초)"""
+        if not changes:
+            return
+        now = time.time() if now is None else now
+        for addr, value in changes.items():
+            self.append(addr, value, now)
+
+    def append(self, addr, value, t):
+        series = self.series.get(addr)
+        if series is None:
+            series = self.series[addr] = TrendSeries(self.window, self.max_samples)
+        series.append(t, value)
+
+    def get(self, addr):
+        return self.series.get(addr)
+
+    def clear(self):
+        self.series = {}
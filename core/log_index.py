@@ -0,0 +1,365 @@
+"""
+로그 색인 모듈
+모드버스/소켓 로그 줄이 들어오는 대로 색인을 쌓아, 화면의 QTextEdit 본문을 다시 훑지 않고
+레지스터 주소, 출처(modbus / socket + 상대 주소), 심각도, 시각으로 바로 거름
+
+- 줄 번호는 들어온 순서대로 0, 1, 2 ... (모든 색인 목록이 이미 정렬된 상태로 append 만 됨)
+- 주소/상대 주소/출처/심각도(경고, 오류): 값별 줄 번호 array('I') (posting list)
+- 출처/심각도는 줄마다 1바이트 코드 배열로도 두어 후보 줄 확인에 씀
+- 시각: 줄마다 array('d') - 시간 구간은 이분 탐색으로 줄 번호 범위
+- 본문: 모든 줄을 임시 파일에 이어 쓰고(줄별 바이트 오프셋 보관) 최근 memory_lines 줄만 메모리에 둠
+  오래된 줄은 디스크에서 읽되, 최신 줄부터 거꾸로 훑을 때는 큰 창 단위로 읽어 같은 창을 재사용
+- 검색은 시간 구간 안에서 줄 수가 가장 적은 목록(이분 탐색으로 셈)을 최신 줄부터 거꾸로 따라가며
+  limit 개를 채우면 멈춤. 텍스트 조건은 그 목록이 충분히 좁으면 후보 줄 본문만 확인하고,
+  아니면 줄마다 디코딩하지 않고 디스크 파일 바이트를 뒤에서부터 큰 덩어리로 정규식 검색한 뒤
+  맞은 위치를 오프셋 이분 탐색으로 줄 번호로 바꿈 (대소문자 무시는 ASCII 만)
+"""
+import bisect
+import heapq
+import os
+import re
+import tempfile
+import time
+from array import array
+from collections import namedtuple
+from .poller import SOURCES, address_key
+
+SOURCE_CODES = {"modbus": 1, "socket": 2}
+SOURCE_NAMES = {code: name for name, code in SOURCE_CODES.items()}
+SEVERITIES = ("info", "warning", "error")  # 코드 = 인덱스 (클수록 심각)
+
+# 심각도 판별 (앞에서부터 먼저 맞는 것)
+ERROR_RE = re.compile(r"오류|실패|error|exception|traceback", re.IGNORECASE)
+WARNING_RE = re.compile(r"경고|시간 초과|누락|끊김|warning|timeout", re.IGNORECASE)
+# "주소 202: 5", "레지스터 coil:12 모니터링 시작", "레지스터 130에 값 ..." 의 주소
+ADDRESS_RE = re.compile(r"(?:주소|레지스터)\s+(?:(coil|discrete|input|holding):)?(\d+)(?![\d-])")
+PEER_RE = re.compile(r"\b(\d{1,3}(?:\.\d{1,3}){3}:\d{1,5})\b")
+
+READ_WINDOW = 1 << 18  # 디스크 줄을 읽는 창 크기 (바이트)
+SCAN_CHUNK = 1 << 22  # 텍스트 검색 시 한 번에 읽는 크기 (바이트)
+# 텍스트 조건이 있을 때, 후보 줄 하나를 직접 확인하는 비용 ~ 파일 검색 SCAN_BYTES_PER_LINE 바이트
+# (후보 목록이 이보다 짧으면 목록을 따라가며 본문 확인, 길면 파일 검색)
+SCAN_BYTES_PER_LINE = 1000
+
+LogLine = namedtuple("LogLine", ["id", "time", "source", "severity", "text"])
+
+
+def classify(text):
+    """로그 한 줄의 심각도 코드"""
+    if ERROR_RE.search(text):
+        return 2
+    if WARNING_RE.search(text):
+        return 1
+    return 0
+
+
+def parse_addresses(spec):
+    """'202, 171-172, coil:5' -> 주소 키 집합 (잘못된 형식은 ValueError)"""
+    keys = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        source, _, span = part.rpartition(":")
+        source = source or "holding"
+        if source not in SOURCES:
+            raise ValueError(f"알 수 없는 소스: {source}")
+        lo, _, hi = span.partition("-")
+        try:
+            start, end = int(lo), int(hi or lo)
+        except ValueError:
+            raise ValueError(f"잘못된 주소: {part}") from None
+        if not 0 <= start <= end <= 0xFFFF or end - start > 4096:
+            raise ValueError(f"잘못된 주소 구간: {part}")
+        keys.update(address_key(source, address) for address in range(start, end + 1))
+    return keys
+
+
+class LogIndex:
+    """증분 로그 색인 + 디스크 보관 (GUI 스레드에서만 호출)"""
+    def __init__(self, spill_dir=None, memory_lines=50000):
+        self.spill_dir = spill_dir
+        self.memory_lines = memory_lines
+        self.times = array('d')
+        self.sources = array('B')
+        self.severities = array('B')
+        self.addresses = {}  # 주소 키 -> array('I') 줄 번호
+        self.peers = {}  # 상대 주소 -> array('I') 줄 번호
+        self.by_source = {code: array('I') for code in SOURCE_NAMES}  # 출처 코드 -> 줄 번호
+        self.by_severity = {1: array('I'), 2: array('I')}  # 경고/오류 줄 번호 (info 는 목록 없음)
+        self.offsets = array('Q')  # 줄 시작 바이트 오프셋 (디스크 파일)
+        self.recent = []  # 최근 줄 본문 (줄 번호 recent_base 부터)
+        self.recent_base = 0
+        self.size = 0  # 디스크 파일에 쓴 바이트 수
+        self._window = (0, b"")  # 마지막으로 읽은 디스크 창 (시작 오프셋, 바이트)
+        self.listeners = []  # 줄 추가 콜백 (줄 번호)
+        self.path = None
+        self.file = None  # 쓰기 전용 (항상 끝에 이어 씀)
+        self.reader = None  # 읽기 전용 핸들 - 읽는 쪽의 seek 가 쓰기 위치를 건드리지 않도록 분리
+        self._open()
+
+    def _open(self):
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix="modbus_log_", suffix=".log", dir=self.spill_dir or None)
+        self.file = os.fdopen(fd, "wb", buffering=1 << 16)
+        self.reader = open(self.path, "rb")
+
+    def __len__(self):
+        return len(self.times)
+
+    # 기록 ---------------------------------------------------------------
+    def add(self, text, source="modbus", t=None):
+        """로그 한 줄(여러 줄 문자열이어도 한 항목) 색인 - 줄 번호 반환"""
+        if self.file is None:
+            return None  # 닫은 뒤 늦게 도착한 로그
+        line_id = len(self.times)
+        t = time.time() if t is None else t
+        if self.times and t < self.times[-1]:
+            t = self.times[-1]  # 벽시계가 뒤로 가도 시각 배열은 정렬 유지
+        self.times.append(t)
+        source_code = SOURCE_CODES[source]
+        severity = classify(text)
+        self.sources.append(source_code)
+        self.severities.append(severity)
+        self.by_source[source_code].append(line_id)
+        if severity:
+            self.by_severity[severity].append(line_id)
+        if source == "modbus":
+            keys = {address_key(src or "holding", int(addr)) for src, addr in ADDRESS_RE.findall(text)
+                    if int(addr) <= 0xFFFF}
+            for key in keys:
+                self.addresses.setdefault(key, array('I')).append(line_id)
+        else:
+            for peer in set(PEER_RE.findall(text)):
+                self.peers.setdefault(peer, array('I')).append(line_id)
+
+        data = text.encode("utf-8")
+        self.offsets.append(self.size)
+        self.file.write(data)
+        self.size += len(data)
+
+        self.recent.append(text)
+        if len(self.recent) > self.memory_lines * 5 // 4:
+            # 한 번에 잘라내 매 줄마다 리스트를 옮기지 않음
+            excess = len(self.recent) - self.memory_lines
+            del self.recent[:excess]
+            self.recent_base += excess
+        for listener in self.listeners:
+            listener(line_id)
+        return line_id
+
+    # 조회 ---------------------------------------------------------------
+    def text(self, line_id):
+        if line_id >= self.recent_base:
+            return self.recent[line_id - self.recent_base]
+        start = self.offsets[line_id]
+        end = self._line_end(line_id)
+        window_start, window = self._window
+        if not (window_start <= start and end <= window_start + len(window)):
+            # 최신 줄부터 거꾸로 훑는 경우가 많으므로 이 줄이 창의 끝에 오도록 읽음
+            self.file.flush()
+            window_start = max(0, min(start, end - READ_WINDOW))
+            self.reader.seek(window_start)
+            window = self.reader.read(max(end - window_start, READ_WINDOW))
+            self._window = (window_start, window)
+        return window[start - window_start:end - window_start].decode("utf-8", errors="replace")
+
+    def line(self, line_id):
+        return LogLine(line_id, self.times[line_id], SOURCE_NAMES[self.sources[line_id]],
+                       SEVERITIES[self.severities[line_id]], self.text(line_id))
+
+    def known_peers(self):
+        return sorted(self.peers)
+
+    def _id_range(self, since=None, until=None):
+        lo = 0 if since is None else bisect.bisect_left(self.times, since)
+        hi = len(self.times) if until is None else bisect.bisect_right(self.times, until)
+        return lo, hi
+
+    @staticmethod
+    def _descending(postings, lo, hi):
+        """줄 번호 목록들의 합집합을 [lo, hi) 안에서 최신부터"""
+        slices = []
+        for posting in postings:
+            a = bisect.bisect_left(posting, lo)
+            b = bisect.bisect_left(posting, hi)
+            if a < b:
+                slices.append(posting[b - 1:a - 1 if a else None:-1])
+        last = None
+        for line_id in heapq.merge(*slices, reverse=True):
+            if line_id != last:
+                last = line_id
+                yield line_id
+
+    @staticmethod
+    def _count(postings, lo, hi):
+        """[lo, hi) 안의 항목 수 (합집합 중복은 무시한 상한)"""
+        return sum(bisect.bisect_left(p, hi) - bisect.bisect_left(p, lo) for p in postings)
+
+    @staticmethod
+    def _contains(postings, line_id):
+        for posting in postings:
+            i = bisect.bisect_left(posting, line_id)
+            if i < len(posting) and posting[i] == line_id:
+                return True
+        return False
+
+    def _line_end(self, line_id):
+        return self.offsets[line_id + 1] if line_id + 1 < len(self.offsets) else self.size
+
+    def _text_matches(self, needle, lo, hi):
+        """본문에 needle 이 들어 있는 줄 번호를 [lo, hi) 안에서 최신부터"""
+        if lo >= hi:
+            return
+        # bytes.lower() (ASCII 만) + 일반 정규식이 IGNORECASE 정규식보다 몇 배 빠름
+        data_needle = needle.encode("utf-8").lower()
+        pattern = re.compile(re.escape(data_needle))
+        overlap = len(data_needle) - 1  # 덩어리 경계에 걸친 일치를 놓치지 않도록 겹쳐 읽음
+        begin, end = self.offsets[lo], self._line_end(hi - 1)
+        self.file.flush()
+        last = None
+        chunk_end = end
+        while chunk_end > begin:
+            chunk_start = max(begin, chunk_end - SCAN_CHUNK)
+            self.reader.seek(chunk_start)
+            data = self.reader.read(min(chunk_end + overlap, end) - chunk_start).lower()
+            ids = []
+            for match in pattern.finditer(data):
+                position = chunk_start + match.start()
+                if position >= chunk_end:
+                    break  # 겹친 부분 - 다음(뒤쪽) 덩어리에서 이미 셈
+                line_id = bisect.bisect_right(self.offsets, position) - 1
+                # 두 줄에 걸친 일치는 제외
+                if chunk_start + match.end() <= self._line_end(line_id) and (not ids or ids[-1] != line_id):
+                    ids.append(line_id)
+            for line_id in reversed(ids):
+                if line_id != last:
+                    last = line_id
+                    yield line_id
+            chunk_end = chunk_start
+
+    def search(self, text=None, addresses=None, source=None, peer=None, severity=None,
+               since=None, until=None, limit=1000):
+        """조건에 맞는 줄을 최신부터 limit 개 찾아 오래된 순으로 반환 - (LogLine 목록, limit 에서 멈췄는지)
+
+        addresses: 주소 키 집합 (하나라도 언급한 줄), source: "modbus"/"socket", peer: 상대 주소,
+        severity: 이 심각도 이상 ("warning" 이면 경고 + 오류), since/until: time.time() 기준 초
+        """
+        lo, hi = self._id_range(since, until)
+        source_code = SOURCE_CODES[source] if source else None
+        min_severity = SEVERITIES.index(severity) if severity else 0
+
+        # 조건마다 (줄 번호 목록 묶음 - 묶음 안은 합집합, 줄별 배열로 확인하는지)
+        # 출처/심각도도 목록이 있어 가장 좁은 조건을 따라갈 수 있고, 다른 조건일 때는 배열로 바로 확인
+        groups = []
+        if addresses is not None:
+            groups.append(([self.addresses[key] for key in addresses if key in self.addresses], False))
+        if peer:
+            groups.append(([self.peers[peer]] if peer in self.peers else [], False))
+        if source_code is not None:
+            groups.append(([self.by_source[source_code]], True))
+        if min_severity:
+            groups.append(([self.by_severity[code] for code in range(min_severity, len(SEVERITIES))], True))
+
+        counted = sorted((self._count(postings, lo, hi), i) for i, (postings, _) in enumerate(groups))
+        if counted and counted[0][0] == 0:
+            return [], False
+        driver = groups[counted[0][1]][0] if counted else None
+        others = [groups[i][0] for _, i in counted[1:] if not groups[i][1]]
+        needle = None
+        if text:
+            scan_bytes = self._line_end(hi - 1) - self.offsets[lo] if lo < hi else 0
+            if driver is None or counted[0][0] * SCAN_BYTES_PER_LINE > scan_bytes:
+                # 후보가 많으면 파일을 한 번 훑는 쪽이 빠름 - 목록 조건은 모두 이분 탐색으로 확인
+                candidates = self._text_matches(text, lo, hi)
+                others = [postings for postings, by_array in groups if not by_array]
+            else:
+                candidates = self._descending(driver, lo, hi)
+                needle = text.lower()
+        elif driver is not None:
+            candidates = self._descending(driver, lo, hi)
+        else:
+            candidates = range(hi - 1, lo - 1, -1)
+
+        found = []
+        for line_id in candidates:
+            # 출처/심각도는 배열로 바로 확인 (목록 이분 탐색보다 빠름)
+            if source_code is not None and self.sources[line_id] != source_code:
+                continue
+            if self.severities[line_id] < min_severity:
+                continue
+            if others and not all(self._contains(postings, line_id) for postings in others):
+                continue
+            if needle is not None and needle not in self.text(line_id).lower():
+                continue
+            found.append(line_id)
+            if len(found) >= limit:
+                break
+        return [self.line(line_id) for line_id in reversed(found)], len(found) >= limit
+
+    def matcher(self, text=None, addresses=None, source=None, peer=None, severity=None,
+                since=None, until=None, limit=None):
+        """방금 추가한 줄이 같은 조건에 맞는지 확인하는 함수 (필터 중 실시간 추가용, limit 은 무시)"""
+        source_code = SOURCE_CODES[source] if source else None
+        min_severity = SEVERITIES.index(severity) if severity else 0
+        needle = text.lower() if text else None
+
+        def matches(line_id):
+            if source_code is not None and self.sources[line_id] != source_code:
+                return False
+            if self.severities[line_id] < min_severity:
+                return False
+            t = self.times[line_id]
+            if (since is not None and t < since) or (until is not None and t > until):
+                return False
+            if addresses is not None:
+                # 목록은 append 만 되므로 방금 추가한 줄이면 마지막 항목만 보면 됨
+                postings = (self.addresses.get(key) for key in addresses)
+                if not any(p and p[-1] == line_id for p in postings):
+                    return False
+            if peer:
+                posting = self.peers.get(peer)
+                if not posting or posting[-1] != line_id:
+                    return False
+            return needle is None or needle in self.text(line_id).lower()
+        return matches
+
+    def export(self, f, source=None):
+        """전체 로그(디스크 보관분 포함)를 텍스트 파일 객체에 씀 (source 를 주면 그 출처만)"""
+        source_code = SOURCE_CODES[source] if source else None
+        self.file.flush()
+        self.reader.seek(0)
+        buffer, base = b"", 0  # buffer 는 파일의 base 위치부터
+        count = len(self.offsets)
+        for line_id in range(count):
+            if source_code is not None and self.sources[line_id] != source_code:
+                continue
+            start = self.offsets[line_id]
+            end = self.offsets[line_id + 1] if line_id + 1 < count else self.size
+            if end > base + len(buffer):
+                loaded = base + len(buffer)
+                if start >= loaded:
+                    # 출처 필터로 건너뛴 구간은 읽지 않음
+                    self.reader.seek(start)
+                    buffer, base = b"", start
+                    loaded = start
+                buffer = buffer[start - base:] + self.reader.read(max(READ_WINDOW, end - loaded))
+                base = start
+            f.write(buffer[start - base:end - base].decode("utf-8", errors="replace"))
+            f.write("\n")
+
+    def clear(self):
+        listeners = self.listeners
+        self.close()
+        self.__init__(self.spill_dir, self.memory_lines)
+        self.listeners = listeners
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.reader.close()
+            self.file = self.reader = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
@@ -0,0 +1,226 @@
+"""
+계측(metrics) 모듈
+폴링 루프, 모드버스 요청, 하트비트, 소켓, Qt 시그널 적체 등을 수집하고
+Prometheus 텍스트 형식(HTTP)과 GUI 통계 패널로 제공
+
+비활성화 상태(기본)에서는 호출 지점에서 `if metrics.enabled:` 검사만 수행하므로 비용이 거의 없음
+"""
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 지연 시간 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram 과 같은 의미)"""
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """구간 내 선형 보간으로 근사한 분위수"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else lower
+            if n and seen + n >= rank:
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            lower = upper
+        return lower
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    items = list(key) + (extra or [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+
+class Metrics:
+    """카운터/게이지/히스토그램 저장소 - 스레드 안전"""
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.counters = {}    # (이름, 라벨) -> 값
+        self.gauges = {}      # (이름, 라벨) -> 값
+        self.histograms = {}  # (이름, 라벨) -> Histogram
+        self.help = {}
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def add(self, name, value, **labels):
+        """게이지 증감"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.gauges[key] = self.gauges.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def counter(self, name, **labels):
+        return self.counters.get((name, _label_key(labels)), 0)
+
+    def gauge(self, name, **labels):
+        return self.gauges.get((name, _label_key(labels)), 0)
+
+    def histogram(self, name, **labels):
+        return self.histograms.get((name, _label_key(labels)))
+
+    def series(self, name):
+        """이름이 같은 모든 라벨 조합 [(라벨 dict, 값 또는 Histogram), ...]"""
+        result = []
+        for store in (self.counters, self.gauges, self.histograms):
+            for (metric, key), value in list(store.items()):
+                if metric == name:
+                    result.append((dict(key), value))
+        return result
+
+    def reset(self, keep_gauges=False):
+        """누적 값 초기화 - 적체 같은 현재 상태 게이지는 keep_gauges 로 유지"""
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            if not keep_gauges:
+                self.gauges.clear()
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+
+            typed = set()
+            for (name, key), value in counters:
+                if name not in typed:
+                    typed.add(name)
+                    if name in self.help:
+                        lines.append(f"# HELP {name} {self.help[name]}")
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{_format_labels(key)} {value}")
+
+            for (name, key), value in gauges:
+                if name not in typed:
+                    typed.add(name)
+                    if name in self.help:
+                        lines.append(f"# HELP {name} {self.help[name]}")
+                    lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name}{_format_labels(key)} {value}")
+
+            for (name, key), histogram in histograms:
+                if name not in typed:
+                    typed.add(name)
+                    if name in self.help:
+                        lines.append(f"# HELP {name} {self.help[name]}")
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, n in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+# 애플리케이션 전체에서 공유하는 계측 저장소
+metrics = Metrics()
+metrics.describe("modbus_request_seconds", "Modbus request round-trip time")
+metrics.describe("modbus_request_errors_total", "Failed Modbus requests")
+metrics.describe("modbus_request_timeouts_total", "Modbus requests cancelled by the per-request timeout")
+metrics.describe("poll_cycle_seconds", "Duration of one run_monitor poll cycle")
+metrics.describe("poll_cycle_overruns_total", "Poll cycles with timed-out requests or blocks deferred past the cycle deadline")
+metrics.describe("poll_cycles_total", "Poll cycles by result state (complete / partial / timed_out / failed)")
+metrics.describe("poll_block_interval_seconds", "Current adaptive poll interval per register block")
+metrics.describe("heartbeat_interval_seconds", "Interval between welder heartbeat writes")
+metrics.describe("socket_bytes_total", "Bytes received per socket client")
+metrics.describe("socket_frames_total", "Messages framed per socket client")
+metrics.describe("qt_signal_backlog", "Signals emitted by worker threads but not yet handled by the GUI")
+
+
+class Stopwatch:
+    """`with Stopwatch("이름", 라벨...)` 구간 시간을 히스토그램에 기록 (비활성 시 아무것도 안 함)
+
+    errors 에 카운터 이름을 주면 예외가 발생한 구간을 함께 셈
+    """
+    __slots__ = ("name", "errors", "labels", "start")
+
+    def __init__(self, name, errors=None, **labels):
+        self.name = name
+        self.errors = errors
+        self.labels = labels
+        self.start = None
+
+    def __enter__(self):
+        if metrics.enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.start is not None:
+            metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+            if exc_type is not None and self.errors:
+                metrics.inc(self.errors, **self.labels)
+        return False
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 요청 로그 출력 안 함
+
+
+def start_http_server(port, host='127.0.0.1'):
+    """Prometheus 텍스트 엔드포인트를 데몬 스레드로 시작 (http://host:port/metrics)"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    return server
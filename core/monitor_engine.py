@@ -0,0 +1,158 @@
+"""
+모드버스 작업 엔진 모듈
+MonitorThread(GUI 프로세스의 스레드/공유 루프)와 AcquisitionEngine(수집 프로세스)이 함께 쓰는
+하트비트, 레지스터 쓰기, 폴링 범위 밖 레지스터 감시, 레지스터 초기화 로직
+
+결과 전달(Qt 시그널 / 프로세스 큐와 이벤트 링)은 호출자가 반환값으로 처리
+모든 메서드는 모니터 이벤트 루프 스레드에서 호출
+"""
+import asyncio
+import time
+from .read_registers import HEARTBEAT_REGISTER, heartbeat_word
+from .poller import split_key, format_address
+from .metrics import metrics
+
+# 하트비트 전송 간격 / 연결 끊김·오류 시 재시도 간격 (초)
+HEARTBEAT_INTERVAL = 0.5
+HEARTBEAT_RETRY = 1.0
+
+
+class MonitorEngine:
+    """RobotMonitor + RegisterPoller 위의 하트비트/쓰기/감시/초기화 (monitor 는 연결 전에 설정)"""
+    def __init__(self, poller, log, monitor=None):
+        self.poller = poller
+        self.monitor = monitor
+        self.log = log
+        self.heartbeat_active = False
+        self.heartbeat_value = 0  # 0-15 사이 순환 (4비트)
+        self._heartbeat_task = None
+        self._heartbeat_last_sent = None  # 하트비트 간격 계측용
+        self._watch_blocks = {}  # watch 가 추가한 단일 블록 {주소 키: PollBlock}
+
+    def connected(self):
+        return bool(self.monitor and self.monitor.client and self.monitor.client.connected)
+
+    # 하트비트 ---------------------------------------------------------------
+    def set_heartbeat(self, active):
+        """하트비트 켜기/끄기 - 켜면 바로 첫 전송"""
+        self.heartbeat_active = active
+        self._heartbeat_last_sent = None
+        if active and self._heartbeat_task is None:
+            self.heartbeat_value = 1
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        elif not active and self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    async def _heartbeat_loop(self):
+        """하트비트 반복 전송 - 연결이 끊긴 동안에도 재시도 간격으로 계속 돌아 재연결 후 다시 나감
+
+        간격은 전송 시작 시각 기준 (느린 링크에서 요청 시간만큼 간격이 늘어나지 않도록)
+        """
+        loop = asyncio.get_running_loop()
+        while self.heartbeat_active:
+            started = loop.time()
+            delay = await self.send_heartbeat()
+            await asyncio.sleep(max(0.0, started + delay - loop.time()))
+
+    async def send_heartbeat(self):
+        """하트비트 한 번 전송 - 다음 전송까지 기다릴 시간(초) 반환"""
+        if not self.connected():
+            return HEARTBEAT_RETRY
+        try:
+            # 예약된 비트(7, 5, 4, 8)를 보존하고 하트비트 값을 비트 0-3에 위치시킴
+            current_values = await self.monitor.read_registers(HEARTBEAT_REGISTER, 1, for_write=True)
+            current_value = current_values[0] if current_values else 0
+            await self.monitor.write_register(
+                address=HEARTBEAT_REGISTER,
+                value=heartbeat_word(current_value, self.heartbeat_value)
+            )
+        except Exception as e:
+            self.log(f"하트비트 전송 오류: {str(e)}")
+            return HEARTBEAT_RETRY
+
+        # 하트비트 전송 간격 계측
+        if metrics.enabled:
+            now = time.perf_counter()
+            if self._heartbeat_last_sent is not None:
+                metrics.observe("heartbeat_interval_seconds", now - self._heartbeat_last_sent)
+            self._heartbeat_last_sent = now
+
+        self.heartbeat_value = (self.heartbeat_value + 1) % 16
+        return HEARTBEAT_INTERVAL
+
+    # 쓰기 -------------------------------------------------------------------
+    async def write_value(self, register, value):
+        """레지스터(또는 코일) 하나 쓰고 다시 읽어 확인 - (성공 여부, 확인한 값 또는 None)"""
+        if not self.connected():
+            self.log(f"모드버스 연결이 활성화되지 않았습니다. 레지스터 {format_address(register)}에 {value} 쓰기 실패.")
+            return False, None
+
+        try:
+            await self.monitor.write_key(register, value)
+            self.log(f"레지스터 {format_address(register)}에 값 {value} 쓰기 성공")
+            result = await self.monitor.read_key(register, for_write=True)
+        except Exception as e:
+            self.log(f"레지스터 {format_address(register)}에 값 {value} 쓰기 실패: {str(e)}")
+            return False, None
+
+        if not result:
+            return True, None
+        self.log(f"레지스터 {format_address(register)} 값 확인: {result[0]}")
+        self.poller.previous_values[register] = result[0]
+        return True, result[0]
+
+    async def write_block(self, start, values):
+        """연속 홀딩 레지스터를 한 번의 FC16 으로 쓰고 한 번에 다시 읽음 - (성공 여부, 다시 읽은 값 또는 None)"""
+        end = start + len(values) - 1
+        if not self.connected():
+            self.log(f"모드버스 연결이 활성화되지 않았습니다. 레지스터 {start}-{end} 쓰기 실패.")
+            return False, None
+
+        try:
+            result = await self.monitor.write_registers(start, values)
+            if result is not None and result.isError():
+                self.log(f"레지스터 {start}-{end} 다중 쓰기 실패: {result}")
+                return False, None
+            self.log(f"레지스터 {start}-{end} 에 값 {len(values)}개 쓰기 성공")
+        except Exception as e:
+            self.log(f"레지스터 {start}-{end} 다중 쓰기 실패: {str(e)}")
+            return False, None
+
+        # 쓰기 후 값 확인 (실패해도 쓰기 자체는 성공)
+        try:
+            current = await self.monitor.read_registers(start, len(values), for_write=True)
+        except Exception:
+            current = None
+        return True, current or None
+
+    # 감시 / 초기화 ----------------------------------------------------------
+    def watch(self, register):
+        """폴링 블록 밖 레지스터는 단일 블록으로 추가하고, 다음 주기에 현재 값이 다시 보고되도록 이전 값 삭제"""
+        if not self.poller.covers(register):
+            source, address = split_key(register)
+            self._watch_blocks[register] = self.poller.add_block(address, 1, source=source)
+        self.poller.previous_values.pop(register, None)
+
+    def unwatch(self, register):
+        """watch 로 추가한 단일 블록만 제거 - 설정된 소스/범위 블록은 같은 모양이어도 남김
+
+        단일 블록은 그 주소 하나만 덮으므로 이 주소를 감시하던 쪽이 그만 보면 더 쓰는 곳이 없음
+        """
+        block = self._watch_blocks.pop(register, None)
+        if block is not None:
+            self.poller.remove_block(block.start, block.count, source=block.source)
+
+    async def reset_registers(self):
+        """레지스터 128-255 초기화 (진행 로그는 RobotMonitor 콜백으로 출력)"""
+        if not self.connected():
+            self.log("모드버스 연결이 활성화되지 않았습니다.")
+            return
+        try:
+            await self.monitor.reset_registers(start_address=128, count=128)
+        except Exception as e:
+            self.log(f"레지스터 초기화 중 오류 발생: {str(e)}")
+
+    def close(self):
+        """하트비트 중지 (모니터 종료 시)"""
+        self.set_heartbeat(False)
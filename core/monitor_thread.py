@@ -1,105 +1,160 @@
 import asyncio
 import re
+import time
 from datetime import datetime
 from PyQt5.QtCore import QThread, pyqtSignal
-from .read_registers import RobotMonitor
+from .read_registers import RobotMonitor, HEARTBEAT_REGISTER, REQUEST_TIMEOUT, WRITE_TIMEOUT
+from .poller import RegisterPoller, AdaptiveRate, DEFAULT_RANGES, format_address, format_addresses
+from .monitor_engine import MonitorEngine
+from .event_loop import wait_future
+from .change_publisher import ChangePublisher
+from .process_image_server import ProcessImage, ProcessImageServer
+from .triggers import TriggerEngine
+from .address_stats import AddressStats
+from .history import TrendHistory
+from .cycles import CycleAnalytics, DEFAULT_CYCLES
+from .timeline import EventTimeline
+from .filters import ChangeFilter
+from .metrics import metrics
+from .profiling import profiler
+
+# 폴링 주기 마감 (초) - 지나면 남은 블록은 다음 주기로 넘김
+CYCLE_TIMEOUT = 0.5
 
 class MonitorThread(QThread):
     log_signal = pyqtSignal(str)
     register_update_signal = pyqtSignal(int, int)  # 레지스터 주소, 값
-    request_read_register_signal = pyqtSignal(int)  # 읽을 레지스터 주소
     register_write_result_signal = pyqtSignal(int, bool)  # 쓰기 결과 시그널 (주소, 성공여부)
+    decoded_update_signal = pyqtSignal(dict)  # 레지스터 맵 디코딩 결과 {주소: 표시 문자열}
+    trigger_signal = pyqtSignal(str, dict)  # 트리거 이름, 조건 주소 값
 
-    def __init__(self, host, port=502):
+    def __init__(self, host, port=502, loop=None, publish=None, serve=None, register_map=None,
+                 triggers=None, capture_dir=None, adaptive=None, filters=None, sources=None, cycles=None,
+                 client=None, request_timeout=REQUEST_TIMEOUT, write_timeout=WRITE_TIMEOUT):
         super().__init__()
         self.host = host
         self.port = port
+        self.client = client  # 모드버스 클라이언트 주입 (None 이면 RobotMonitor 가 TCP 클라이언트 생성)
+        # 요청별 제한 시간 (초, None 이면 제한 없음) - 폴링 읽기 / 하트비트·쓰기
+        self.request_timeout = request_timeout
+        self.write_timeout = write_timeout
         self.monitor = None
         self._reset_requested = False
         self._monitored_registers = set()  # 모니터링할 레지스터 집합
-        self._last_values = {}  # 마지막으로 읽은 값을 저장
-        self._pending_registers = set()  # 읽기가 요청된 레지스터
 
-        # 하트비트 관련 변수 추가
-        self._heartbeat_active = False
-        self._heartbeat_value = 0  # 0부터 시작
-        self._heartbeat_max = 16   # 0-15 사이 순환 (4비트)
+        # 범위 폴링은 RegisterPoller 에 위임 (211은 하트비트 확인을 위해 변경 감지에 포함)
+        self.poller = RegisterPoller(
+            ranges=DEFAULT_RANGES,
+            excluded={128, 161},
+            interval=0.5,
+            callback=self.log_signal.emit
+        )
+        self._last_values = self.poller.previous_values  # 마지막으로 읽은 값을 저장 (폴러와 공유)
+
+        # 하트비트/쓰기/감시/초기화는 수집 프로세스(AcquisitionEngine)와 같은 엔진 사용
+        self.engine = MonitorEngine(self.poller, self.log_signal.emit)
+
+        # 추가 폴링 소스 (코일/디스크리트 입력/입력 레지스터) - 같은 연결, 같은 주기로 함께 읽음
+        for source, start, count in sources or []:
+            self.poller.add_block(start, count, source=source)
+
+        # 주소별 변경 통계 (폴러의 변경 묶음으로만 누적 - 추가 읽기 없음)
+        self.address_stats = AddressStats(start=128, count=128)
+        self.poller.stats = self.address_stats
+
+        # 트렌드 그래프용 주소별 시계열
+        self.trend_history = TrendHistory()
+
+        # 소켓 이벤트와 맞춰 보는 타임라인 (블록 응답 수신 시각으로 기록, 소켓 서버도 같은 객체에 기록)
+        self.timeline = EventTimeline()
+
+        # 적응형 폴링 (adaptive: AdaptiveRate 인자 dict) - 자체 하트비트 변경은 활동으로 보지 않음
+        if adaptive:
+            self.poller.set_adaptive(AdaptiveRate(**{"ignore": {HEARTBEAT_REGISTER}, **adaptive}))
+
+        # 변경 스트림 재게시 (publish: {"host", "port"} 또는 {"path"})
+        self.publisher = None
+        if publish:
+            self.publisher = ChangePublisher(
+                self.poller.previous_values,
+                callback=self.log_signal.emit,
+                **publish
+            )
+
+        # 레지스터 맵 디코더 (128-255 스냅샷 전용으로 한 번 컴파일)
+        self.decoder = register_map.compile(start=128, count=128) if register_map else None
+
+        # 변경 필터 (filters: [[filter]] 설정 목록) - 로그/시그널/재게시 전에 적용
+        self.change_filter = ChangeFilter.from_config(filters) if filters else None
+
+        # 사이클 분석 (상태 레지스터 전환으로 사이클을 나눠 사이클 시간 통계 누적)
+        self.cycle_analytics = CycleAnalytics(DEFAULT_CYCLES if cycles is None else cycles)
 
-        # 자체 이벤트 루프 생성
+        # 트리거 엔진 (변경된 주소에 걸린 규칙만 평가, 발생 시 전/후 구간 캡처)
+        self.trigger_engine = TriggerEngine(triggers, capture_dir=capture_dir) if triggers else None
+
+        # 폴링 스냅샷 (로컬 모드버스 서버와 레지스터 맵 디코딩에 사용)
+        self.process_image = None
+        if serve or self.decoder:
+            self.process_image = ProcessImage(start=128, count=128)
+
+        # 폴링 스냅샷을 제공하는 로컬 모드버스 서버 (serve: {"host", "port"})
+        self.image_server = None
+        if serve:
+            self.image_server = ProcessImageServer(
+                self.process_image,
+                write_handler=self._write_register_value,
+                write_block_handler=self._write_register_block,
+                callback=self.log_signal.emit,
+                **serve
+            )
+        self._pending_registers = set()  # 읽기가 요청된 레지스터
+
+        # 자체 이벤트 루프 생성 (loop 가 주어지면 공유 루프에서 태스크로 실행)
         self._loop = None
+        self._shared_loop = loop
+        self._main_future = None
+        self._running = True  # 자체 실행 상태 변수
+        self._cycle_state = "complete"  # 직전 폴링 주기 상태 (바뀔 때만 로그)
 
     # 하트비트 제어 메서드 추가
     def set_heartbeat(self, active):
-        """하트비트 상태 설정"""
-        self._heartbeat_active = active
+        """하트비트 상태 설정 (전송은 모니터 루프에서 MonitorEngine 이 처리)"""
         if active:
             self.log_signal.emit("웰딩 하트비트 전송 시작 (레지스터 211)")
-            # 하트비트 값 초기화
-            self._heartbeat_value = 1
-            # 첫 하트비트 전송
-            if self._loop:
-                asyncio.run_coroutine_threadsafe(self._send_heartbeat(), self._loop)
         else:
             self.log_signal.emit("웰딩 하트비트 전송 중지")
+        if self._loop:
+            self._loop.call_soon_threadsafe(self.engine.set_heartbeat, active)
+        else:
+            # 루프 시작 전이면 연결 후 run_monitor 에서 시작
+            self.engine.heartbeat_active = active
 
-    async def _send_heartbeat(self):
-        """하트비트 값 전송"""
-        if not self._heartbeat_active:
+    def start(self):
+        """공유 루프가 있으면 스레드 대신 루프에 모니터링 태스크 예약"""
+        if self._shared_loop is None:
+            super().start()
             return
-        
-        try:
-            if self.monitor and self.monitor.client and self.monitor.client.connected:
-                # 현재 레지스터 211의 값 읽기
-                current_values = await self.monitor.read_registers(211, 1)
-                current_value = current_values[0] if current_values else 0
-                
-                # 이미 할당된 비트들의 마스크 (비트 7, 5, 4, 8)
-                reserved_bits_mask = (1 << 7) | (1 << 5) | (1 << 4) | (1 << 8)
-                
-                # 현재 레지스터 값에서 예약된 비트들을 보존
-                preserved_bits = current_value & reserved_bits_mask
-                
-                # 하트비트 값을 비예약 비트들에 설정 (비트 0-3, 6, 9-15)
-                # 1~500 대신 0~15로 범위 조정 (4비트로 표현 가능한 범위)
-                heartbeat_bits = self._heartbeat_value & 0x0F  # 하위 4비트만 사용
-                
-                # 하트비트 값을 비트 0-3에 위치시킴 (또는 다른 사용 가능 비트에 배치 가능)
-                new_value = preserved_bits | heartbeat_bits
-                
-                # 레지스터에 쓰기
-                await self.monitor.client.write_register(
-                    address=211,
-                    value=new_value
-                )
-                
-                # 로그에 기록
-                # self.log_signal.emit(f"하트비트 전송: 레지스터 211 = {new_value} (하트비트 비트값: {heartbeat_bits})")
-                
-                # 다음 하트비트 값 계산 (0-15 사이 순환)
-                self._heartbeat_value = (self._heartbeat_value + 1) % 16
-                
-                # 0.5초 후 다음 하트비트 전송
-                if self._heartbeat_active and self._loop:
-                    self._loop.call_later(0.5, 
-                        lambda: asyncio.create_task(self._send_heartbeat())
-                    )
-        
-        except Exception as e:
-            self.log_signal.emit(f"하트비트 전송 오류: {str(e)}")
-            # 오류 발생해도 계속 시도
-            if self._heartbeat_active and self._loop:
-                self._loop.call_later(1.0, 
-                    lambda: asyncio.create_task(self._send_heartbeat())
-                )
-            
+
+        self._loop = self._shared_loop
+        self._main_future = asyncio.run_coroutine_threadsafe(self.run_monitor(), self._loop)
+
+    def isRunning(self):
+        if self._shared_loop is None:
+            return super().isRunning()
+        return self._main_future is not None and not self._main_future.done()
+
+    def wait(self, *args):
+        if self._shared_loop is None:
+            return super().wait(*args)
+        return wait_future(self._main_future, self._loop, *args)
+
     def run(self):
         
         # 새 이벤트 루프 생성
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
-        
-        # 읽기 요청 시그널 연결
-        self.request_read_register_signal.connect(self.handle_read_request)
+        profiler.instrument_loop(self._loop, "modbus")
 
         # 모니터링 실행
         # asyncio.run(self.run_monitor())
@@ -115,49 +170,58 @@ class MonitorThread(QThread):
             )
             
     async def _write_register_value(self, register, value):
-        """실제 비동기로 레지스터에 값을 쓰는 내부 메서드"""
-        if not self.monitor or not self.monitor.client or not self.monitor.client.connected:
-            self.log_signal.emit(f"모드버스 연결이 활성화되지 않았습니다. 레지스터 {register}에 {value} 쓰기 실패.")
-            self.register_write_result_signal.emit(register, False)
-            return
-        
-        try:
-            # 클라이언트로 레지스터 쓰기
-            await self.monitor.client.write_register(
-                address=register,
-                value=value
-            )
+        """실제 비동기로 레지스터에 값을 쓰는 내부 메서드 - 성공 여부 반환"""
+        ok, confirmed = await self.engine.write_value(register, value)
+        if confirmed is not None:
+            # 값 캐시는 엔진이 갱신 - UI 업데이트
+            self.register_update_signal.emit(register, confirmed)
+            if self.process_image:
+                self.process_image.set(register, confirmed)
+                self.emit_decoded({register})
+        self.register_write_result_signal.emit(register, ok)
+        return ok
 
-            # 성공 로그
-            self.log_signal.emit(f"레지스터 {register}에 값 {value} 쓰기 성공")
-            
-            # 쓰기 후 값 업데이트를 위해 읽기
-            result = await self.monitor.read_registers(register, 1)
-            if result:
-                # 로그에 값 추가
-                self.log_signal.emit(f"레지스터 {register} 값 확인: {result[0]}")
-                # 값 캐시 및 UI 업데이트
-                self._last_values[register] = result[0]
-                self.register_update_signal.emit(register, result[0])
-            
-            # 쓰기 성공 시그널
-            self.register_write_result_signal.emit(register, True)
+    async def _write_register_block(self, start, values):
+        """연속 홀딩 레지스터를 한 번의 FC16 으로 쓰고 한 번에 다시 읽어 반영 - 성공 여부 반환"""
+        ok, current = await self.engine.write_block(start, values)
+        if current:
+            for register, value in enumerate(current, start):
+                if register in self._monitored_registers:
+                    self._last_values[register] = value
+                    self.register_update_signal.emit(register, value)
+            if self.process_image:
+                self.process_image.write(start, current)
+                self.emit_decoded(set(range(start, start + len(current))))
+        return ok
 
-        except Exception as e:
-            self.log_signal.emit(f"레지스터 {register}에 값 {value} 쓰기 실패: {str(e)}")
-            self.register_write_result_signal.emit(register, False)
-            pass
-        
     async def run_monitor(self):
         self.monitor = RobotMonitor(
             host=self.host, 
             port=self.port,
-            callback=self.process_monitor_message
+            callback=self.process_monitor_message,
+            client=self.client,
+            request_timeout=self.request_timeout,
+            write_timeout=self.write_timeout
         )
+        self.poller.monitor = self.monitor
+        self.engine.monitor = self.monitor
         await self.monitor.connect()
-        
-        # 자체 실행 상태 변수 추가
-        self._running = True
+        if self.engine.heartbeat_active:
+            self.engine.set_heartbeat(True)
+
+        if self.publisher:
+            try:
+                await self.publisher.start()
+            except OSError as e:
+                self.log_signal.emit(f"변경 스트림 게시 시작 실패: {str(e)}")
+                self.publisher = None
+
+        if self.image_server:
+            try:
+                await self.image_server.start()
+            except OSError as e:
+                self.log_signal.emit(f"모드버스 서버 시작 실패: {str(e)}")
+                self.image_server = None
         
         # 초기화 요청 처리 및 레지스터 모니터링 루프
         while self._running:
@@ -165,167 +229,188 @@ class MonitorThread(QThread):
                 await self.do_reset_registers()
                 self._reset_requested = False
             
-            # 지정된 레지스터 값 읽기
-            if  self._pending_registers and self.monitor and self.monitor.client and self.monitor.client.connected:
-                for monitor_register in list(self._monitored_registers):
-                    try:
-                        # 단일 레지스터 읽기 (주소, 개수)
-                        result = await self.monitor.read_registers(monitor_register, 1)
-
-                        if result and hasattr(self, '_last_values'):
-                            # 값이 변경되었을 때만 신호 보내기
-                            if monitor_register not in self._last_values or self._last_values[monitor_register] != result[0]:
-                                self._last_values[monitor_register] = result[0]
-                                self.register_update_signal.emit(monitor_register, result[0])
-
-                        else:
-                            # 최초 읽기 시에는 항상 업데이트
-                            if not hasattr(self, '_last_values'):
-                                self._last_values = {}
-                            self._last_values[monitor_register] = result[0]
-                            self.register_update_signal.emit(monitor_register, result[0])
-
-                    except Exception as e:
-                        self.log_signal.emit(f"레지스터 {monitor_register} 읽기 오류: {str(e)}")
-
+            # 폴링에서 보고하지 않는 (제외된) 감시 레지스터만 따로 한 번 읽음
+            if self._pending_registers and self.engine.connected():
                 for register in list(self._pending_registers):
                     try:
-                        # 레지스터 읽기
-                        result = await self.monitor.read_registers(register, 1)
+                        result = await self.monitor.read_key(register)
                         if result:
-                            self.register_update_signal.emit(register, result[0])
                             self._last_values[register] = result[0]
-                            # self.log_signal.emit(f"레지스터 {register}의 초기값: {result[0]}")
-                            self._pending_registers.remove(register)
+                            self.register_update_signal.emit(register, result[0])
+                            self._pending_registers.discard(register)
                     except Exception as e:
-                        self.log_signal.emit(f"레지스터 {register} 읽기 오류: {str(e)}")
-                        self._pending_registers.remove(register)  # 오류나도 제거
-            
-            try:
-                # 짧은 시간 동안만 monitor_loop 실행
-                monitor_task = asyncio.create_task(self.run_monitor_once())
-                await asyncio.wait_for(monitor_task, timeout=0.5)  # 레지스터 업데이트 주기
+                        self.log_signal.emit(f"레지스터 {format_address(register)} 읽기 오류: {str(e)}")
+                        self._pending_registers.discard(register)  # 오류나도 제거
 
-            except asyncio.TimeoutError:
-                pass
+            cycle_started = time.perf_counter() if metrics.enabled else None
+            try:
+                # 주기 전체를 취소하지 않고 요청별 제한 시간 + 주기 마감으로 제한
+                # (마감이 지나면 남은 블록은 다음 주기로, 읽은 블록 결과는 그대로 반영)
+                status = await self.run_monitor_once(deadline=self.poller.clock() + CYCLE_TIMEOUT)
+                self.report_cycle_status(status)
 
             except Exception as e:
                 self.log_signal.emit(f"모니터링 오류: {str(e)}")
                 await asyncio.sleep(1)  # 오류 발생 시 잠시 대기
+
+            if cycle_started is not None:
+                metrics.observe("poll_cycle_seconds", time.perf_counter() - cycle_started)
             
-            # 잠시 대기
-            await asyncio.sleep(0.5)
+            # 잠시 대기 (적응형 폴링이면 다음 블록 차례까지)
+            await asyncio.sleep(self.poller.next_wakeup() if self.poller.adaptive else 0.5)
             
-    async def run_monitor_once(self):
-        """RobotMonitor의 한 주기만 실행"""
+    def report_cycle_status(self, status):
+        """주기 결과 계측, 상태가 바뀔 때만 로그 (완료/부분/시간 초과가 매 주기 쌓이지 않도록)"""
+        if metrics.enabled:
+            metrics.inc("poll_cycles_total", state=status.state)
+            if status.timed_out or status.skipped:
+                metrics.inc("poll_cycle_overruns_total")
+        if status.state == self._cycle_state:
+            return
+        if status.state == "complete":
+            self.log_signal.emit("폴링 주기 정상화")
+        else:
+            self.log_signal.emit(f"폴링 주기 {status.state}: 읽음 {status.read}, 시간 초과 {status.timed_out}, "
+                                 f"오류 {status.failed}, 다음 주기로 넘김 {status.skipped}")
+        self._cycle_state = status.state
+
+    async def run_monitor_once(self, deadline=None):
+        """RegisterPoller의 한 주기만 실행 - 주기 결과(CycleStatus) 반환"""
         # 범위 (128-255) 값 읽기 및 변경사항 감지
-        ranges = [
-            (128, 125),  # 첫 번째 범위: 128-252
-            (253, 3)     # 두 번째 범위: 253-255
-        ]
-        
-        all_changes = {}
-        for start_addr, count in ranges:
-            try:
-                values = await self.monitor.read_registers(start_addr, count)
-                if values:
-                    changes = self.check_changes(start_addr, values)
-                    all_changes.update(changes)
-            except Exception as e:
-                self.log_signal.emit(f"범위 읽기 오류 ({start_addr}-{start_addr+count-1}): {str(e)}")
+        all_changes = await self.poller.poll_once(deadline=deadline)
+
+        # 로컬 모드버스 서버 스냅샷 갱신
+        if self.process_image:
+            self.process_image.update(self.poller.last_blocks)
+
+        # 트리거 평가 - 필터 전 원본 변경 사용 (변경이 없어도 캡처 마무리를 위해 매 주기 호출)
+        if self.trigger_engine:
+            self.handle_triggers(*self.trigger_engine.process(all_changes, self.poller.previous_values))
+
+        # 사이클 분석 - 필터 전 원본 상태 전환 사용
+        if all_changes:
+            self.log_cycles(self.cycle_analytics.process(all_changes))
+
+        # 트렌드 기록 - 필터 전 원본 (흔들림은 최소/최대 폭으로 그대로 보이도록)
+        if all_changes:
+            self.trend_history.record(all_changes)
+
+        # 타임라인 기록 - 블록별 응답 수신 시각 그대로
+        for t_ns, changes in self.poller.last_stamps:
+            self.timeline.record("modbus", changes, t_ns)
+
+        # 흔들리는 레지스터 필터링 (보류 값 보고를 위해 매 주기 호출)
+        if self.change_filter:
+            all_changes = self.change_filter.apply(all_changes)
+
+        # 다른 소비자에게 변경 묶음 재게시
+        if self.publisher:
+            self.publisher.publish(all_changes)
         
         # 변경 사항이 있으면 로그로 출력
         if all_changes:
+            decoded = self.emit_decoded(all_changes)
+
             # timestamp = datetime.now().strftime('%H:%M:%S')
             # self.log_signal.emit(f"\n[{timestamp}] 값 변경 감지:")
             self.log_signal.emit(f"\n")
             for addr, value in sorted(all_changes.items()):
                 if addr == 202 or addr == 211:
-                    self.log_signal.emit(f"주소 {addr}: {value}")
+                    if addr in decoded:
+                        self.log_signal.emit(f"주소 {addr}: {value} ({decoded[addr]})")
+                    else:
+                        self.log_signal.emit(f"주소 {addr}: {value}")
                 
                 # 모니터링 중인 레지스터는 UI도 갱신
                 if addr in self._monitored_registers:
                     self.register_update_signal.emit(addr, value)
+
+        return self.poller.last_status
     
+    def log_cycles(self, completed):
+        """끝난 사이클 로그"""
+        for tracker, duration in completed:
+            stats = tracker.stats
+            self.log_signal.emit(f"[사이클] {tracker.name} 완료: {duration:.2f}s "
+                                 f"(평균 {stats.mean:.2f}s, {stats.count}회)")
+
+    def handle_triggers(self, fired, completed):
+        """트리거 발생/캡처 완료 알림"""
+        for event in fired:
+            self.log_signal.emit(event.summary())
+            self.trigger_signal.emit(event.rule.name, event.values)
+        for event in completed:
+            if event.path:
+                self.log_signal.emit(f"[트리거] {event.rule.name} 캡처 저장: {event.path}")
+
+    def emit_decoded(self, addresses):
+        """변경된 주소에 해당하는 레지스터 맵 항목을 디코딩해 전달"""
+        if not self.decoder:
+            return {}
+        decoded = self.decoder.describe(self.process_image.values, addresses)
+        if decoded:
+            self.decoded_update_signal.emit(decoded)
+        return decoded
+
     def check_changes(self, start_addr, current_values):
-        """값 변경 감지 메서드"""
-        changes = {}
-        for i, value in enumerate(current_values):
-            addr = start_addr + i
-            # 128, 161, 211은 제외 (RobotMonitor 클래스와 동일하게 처리)
-            if addr == 128 or addr == 161:
-                continue
-            if addr not in self._last_values or self._last_values[addr] != value:
-                changes[addr] = value
-                self._last_values[addr] = value
-        return changes
+        """값 변경 감지 메서드 (RegisterPoller 에 위임)"""
+        return self.poller.check_changes(start_addr, current_values)
 
     async def do_reset_registers(self):
-        try:
-            if self.monitor and self.monitor.client and self.monitor.client.connected:
-                # 레지스터 범위 128-255까지 초기화
-                start_address = 128
-                count = 128  # 128부터 255까지 (총 128개)
-
-                # 레지스터 초기화 로그
-                self.log_signal.emit(f"레지스터 {start_address}-{start_address+count-1} 초기화 시작...")
-                
-                 # 한 번에 여러 레지스터 쓰기 시도
-                try:
-                    # 배열로 한 번에 쓰기 시도
-                    registers = [0] * count
-                    await self.monitor.client.write_registers(
-                        address=start_address,
-                        values=registers
-                    )
-                    self.log_signal.emit(f"레지스터 {start_address}-{start_address+count-1} 일괄 초기화 완료")
-                except Exception as bulk_error:
-                    # 실패하면 개별적으로 쓰기
-                    self.log_signal.emit(f"일괄 초기화 실패, 개별 초기화로 전환: {str(bulk_error)}")
-                    
-                    for i in range(count):
-                        addr = start_address + i
-                        try:
-                            # 단일 레지스터 쓰기
-                            await self.monitor.client.write_register(
-                                address=addr,
-                                value=0
-                            )
-                        except Exception as e:
-                            self.log_signal.emit(f"레지스터 {addr} 초기화 오류: {str(e)}")
-                
-                self.log_signal.emit(f"레지스터 초기화 완료")
-            else:
-                self.log_signal.emit("모드버스 연결이 활성화되지 않았습니다.")
-        except Exception as e:
-            self.log_signal.emit(f"레지스터 초기화 중 오류 발생: {str(e)}")
+        # 레지스터 범위 128-255까지 초기화 (로그는 monitor 콜백으로 출력)
+        await self.engine.reset_registers()
     
     def reset_registers(self):
         self._reset_requested = True
     
     def add_monitored_register(self, register):
         """모니터링할 레지스터 추가"""
-        if register not in self._monitored_registers:
-            self._monitored_registers.add(register)
-            # 읽기 요청 신호 발생 - 스레드 안전한 방식
-            self.request_read_register_signal.emit(register)
-            self.log_signal.emit(f"레지스터 {register} 모니터링 시작")
-
-        # If there's already deleted _last_values entry, then delete
-        if register in self._last_values:
-            del self._last_values[register]
-
-    def handle_read_request(self, register):
-        """레지스터 읽기 요청 처리 - 스레드 안전한 슬롯"""
-        self._pending_registers.add(register)
-    
+        self.add_monitored_registers([register])
+
+    def add_monitored_registers(self, registers):
+        """모니터링할 레지스터 목록 추가 - 모니터 루프에서 한 번에 처리 (GUI 스레드에서 호출)"""
+        registers = list(registers)
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._watch_registers, registers)
+        else:
+            self._watch_registers(registers)
+
+    def _watch_registers(self, registers):
+        new = [register for register in registers if register not in self._monitored_registers]
+        if new:
+            self._monitored_registers.update(new)
+            self.log_signal.emit(f"레지스터 {format_addresses(new)} 모니터링 시작")
+        for register in registers:
+            # 폴링 블록 밖 주소는 단일 블록으로 추가 (같은 주기에 함께 읽음), 이전 값은 삭제해 다음 주기에 다시 보고
+            self.engine.watch(register)
+            # 다시 읽은 값은 데드밴드와 상관없이 보고
+            if self.change_filter:
+                self.change_filter.reset(register)
+            # 폴링 블록 안이어도 제외된 주소는 변경으로 보고되지 않으므로 따로 읽음
+            if register in self.poller.excluded:
+                self._pending_registers.add(register)
+
     def remove_monitored_register(self, register):
         """모니터링할 레지스터 제거"""
-        if register in self._monitored_registers:
-            self._monitored_registers.remove(register)
-            self.log_signal.emit(f"레지스터 {register} 모니터링 중지")
-        # if register in self._last_values:
-        #     del self._last_values[register]
+        self.remove_monitored_registers([register])
+
+    def remove_monitored_registers(self, registers):
+        """모니터링할 레지스터 목록 제거 - 모니터 루프에서 한 번에 처리 (GUI 스레드에서 호출)"""
+        registers = list(registers)
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._unwatch_registers, registers)
+        else:
+            self._unwatch_registers(registers)
+
+    def _unwatch_registers(self, registers):
+        removed = [register for register in registers if register in self._monitored_registers]
+        if not removed:
+            return
+        self._monitored_registers.difference_update(removed)
+        self._pending_registers.difference_update(removed)
+        self.log_signal.emit(f"레지스터 {format_addresses(removed)} 모니터링 중지")
+        for register in removed:
+            self.engine.unwatch(register)
 
     def process_monitor_message(self, msg):
         """모니터링 메시지 처리 - 레지스터 값 변경 감지 및 로그 출력"""
@@ -357,13 +442,18 @@ class MonitorThread(QThread):
     
     def stop(self):
         self._running = False
-        self._heartbeat_active = False
+        self.engine.heartbeat_active = False
         if self._loop:
             # 이벤트 루프 중지
             asyncio.run_coroutine_threadsafe(self.cleanup(), self._loop)
 
     async def cleanup(self):
         # 필요한 정리 작업
+        self.engine.close()
+        if self.publisher:
+            await self.publisher.stop()
+        if self.image_server:
+            await self.image_server.stop()
         if self.monitor:
             try:
                 self.monitor.stop()
@@ -381,27 +471,25 @@ class MonitorThread(QThread):
         try:
 
             # 직접 레지스터 범위를 읽어 출력
-            ranges = [
-                (128, 125),  # 첫 번째 범위: 128-252
-                (253, 3)     # 두 번째 범위: 253-255
-            ]
-
-            for start_addr, count in ranges:
-                try:
-                    values = await self.monitor.read_registers(start_addr, count)
-
-                    if values:
-                        for i, value in enumerate(values):
-                            addr = start_addr + i
-                            self.log_signal.emit(f"주소 {addr}: {value}")
-
-                            # 모니터링 중인 레지스터는 UI도 갱신
-                            if addr in self._monitored_registers:
-                                self._last_values[addr] = value
-                                self.register_update_signal.emit(addr, value)
-
-                except Exception as e:
-                    self.log_signal.emit(f"범위 읽기 오류 ({start_addr}-{start_addr+count-1}): {str(e)}")
+            values = await self.poller.read_all()
+
+            # 레지스터 맵 항목은 디코딩 값도 함께 출력
+            decoded = {}
+            if self.decoder:
+                for addr, value in values.items():
+                    self.process_image.set(addr, value)
+                decoded = self.emit_decoded(values)
+
+            for addr, value in values.items():
+                if addr in decoded:
+                    self.log_signal.emit(f"주소 {format_address(addr)}: {value} ({decoded[addr]})")
+                else:
+                    self.log_signal.emit(f"주소 {format_address(addr)}: {value}")
+
+                # 모니터링 중인 레지스터는 UI도 갱신
+                if addr in self._monitored_registers:
+                    self._last_values[addr] = value
+                    self.register_update_signal.emit(addr, value)
 
         except Exception as e:
             self.log_signal.emit(f"레지스터 출력 중 오류 발생: {str(e)}")
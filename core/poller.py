@@ -0,0 +1,420 @@
+"""
+Qt 비의존 레지스터 폴링 모듈
+GUI(MonitorThread)와 스크립트(RobotMonitor) 양쪽에서 같은 폴링 로직을 사용
+"""
+import asyncio
+import time
+from collections import namedtuple
+from .metrics import metrics
+
+# 기본 폴링 범위 (주소, 개수) - 한 번에 최대 125개까지 읽을 수 있음
+DEFAULT_RANGES = [
+    (128, 125),  # 첫 번째 범위: 128-252
+    (253, 3)     # 두 번째 범위: 253-255
+]
+
+# 변경 감지에서 제외할 주소
+DEFAULT_EXCLUDED = frozenset({128, 161, 211})
+
+DEFAULT_INTERVAL = 0.5
+
+# 폴링 소스 (기능 코드별 테이블) -> 주소 키 상위 16비트 코드
+# 키 = 코드 << 16 | 주소 이므로 홀딩 레지스터(FC3)는 주소 그대로 사용
+SOURCES = {
+    "holding": 0,   # FC3
+    "coil": 1,      # FC1
+    "discrete": 2,  # FC2
+    "input": 3,     # FC4
+}
+SOURCE_NAMES = {code: name for name, code in SOURCES.items()}
+BIT_SOURCES = frozenset({"coil", "discrete"})
+WRITABLE_SOURCES = frozenset({"holding", "coil"})
+
+
+def address_key(source, address):
+    """(소스, 주소) -> 변경 스트림/시그널에서 쓰는 정수 키"""
+    return SOURCES[source] << 16 | address
+
+
+def split_key(key):
+    """정수 키 -> (소스, 주소)"""
+    return SOURCE_NAMES[key >> 16], key & 0xFFFF
+
+
+def format_address(key):
+    """표시용 주소 문자열 - 홀딩 레지스터는 숫자만, 나머지는 "coil:12" 형식"""
+    source, address = split_key(key)
+    return str(address) if source == "holding" else f"{source}:{address}"
+
+
+def format_addresses(keys):
+    """로그용 주소 목록 요약 - 하나면 그 주소, 여럿이면 "130~135 (6개)" 형식"""
+    keys = sorted(keys)
+    if len(keys) == 1:
+        return format_address(keys[0])
+    return f"{format_address(keys[0])}~{format_address(keys[-1])} ({len(keys)}개)"
+
+
+def parse_sources(spec):
+    """"coil:0-31,discrete:0-15,input:100-109" -> [(소스, 시작, 개수), ...] (소스 생략 시 holding)"""
+    result = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        source, _, span = part.rpartition(':')
+        source = source or "holding"
+        if source not in SOURCES:
+            raise ValueError(f"알 수 없는 폴링 소스: {source} (가능: {', '.join(SOURCES)})")
+        lo, _, hi = span.partition('-')
+        start, end = int(lo), int(hi or lo)
+        if not 0 <= start <= end <= 0xFFFF:
+            raise ValueError(f"잘못된 주소 구간: {part}")
+        result.append((source, start, end - start + 1))
+    return result
+
+
+class RequestTimeout(Exception):
+    """요청별 시간 제한 초과 - 클라이언트 계층에서 그 요청만 취소하고 발생 (주기는 계속 진행)"""
+
+
+# 한 폴링 주기의 결과 - state: complete (주기가 된 블록을 모두 읽음) / partial (일부만 읽음)
+#                              timed_out (시간 초과로 하나도 못 읽음) / failed (오류로 하나도 못 읽음)
+# skipped: 주기 마감이 지나 이번 주기에 요청하지 않은 블록 (다음 주기에 먼저 읽음)
+CycleStatus = namedtuple("CycleStatus", ["state", "read", "timed_out", "failed", "skipped", "changes"])
+
+
+def cycle_state(read, timed_out, failed, skipped):
+    if not (timed_out or failed or skipped):
+        return "complete"
+    if read:
+        return "partial"
+    return "timed_out" if timed_out or skipped else "failed"
+
+
+class PollBlock:
+    """한 번의 요청으로 읽는 연속 레지스터(또는 비트) 블록"""
+    def __init__(self, start, count, interval=None, source="holding"):
+        self.start = start
+        self.count = count
+        self.interval = interval  # None이면 폴러 기본 주기 사용
+        self.source = source
+        self.base = address_key(source, start)  # 첫 주소의 키
+        self.bits = None  # 비트 소스의 직전 스냅샷 (비트 i = start + i)
+        self.next_due = 0.0
+        self.rate = None  # 적응형 주기 (AdaptiveRate 사용 시)
+        self.last_active = 0.0  # 마지막으로 활동이 관찰된 시각
+
+    @property
+    def end(self):
+        return self.start + self.count - 1
+
+    @property
+    def is_bits(self):
+        return self.source in BIT_SOURCES
+
+    @property
+    def label(self):
+        source = "" if self.source == "holding" else f"{self.source}:"
+        return f"{source}{self.start}-{self.end}"
+
+    def covers(self, key):
+        return self.base <= key < self.base + self.count
+
+    def __repr__(self):
+        return f"PollBlock({self.label}, interval={self.interval})"
+
+
+class AdaptiveRate:
+    """활동량에 따라 블록별 폴링 주기를 조절하는 정책
+
+    - 블록에서 변경이 보이거나 active_when 주소가 유휴 값을 벗어나면 min_interval 로 올림
+      (ignore 주소의 변경은 활동으로 보지 않음 - 예: 자체 하트비트 211)
+    - 활동이 없으면 hold 초 동안 유지한 뒤 decay 배씩 늘려 max_interval(하한 속도)로 복귀
+    - 전체 요청 수가 budget(초당 요청)을 넘지 않도록 모든 적응형 블록 주기를 같은 비율로 늘림
+    """
+    def __init__(self, min_interval=0.05, max_interval=DEFAULT_INTERVAL, decay=1.5, hold=2.0,
+                 budget=20.0, active_when=None, ignore=()):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.decay = decay
+        self.hold = hold
+        self.budget = budget
+        self.active_when = dict(active_when or {})  # 주소 -> 유휴 값
+        self.ignore = set(ignore)
+        self.factor = 1.0  # 예산 초과 시 주기 배율
+
+    def is_active(self, block, changes, values):
+        if any(addr not in self.ignore for addr in changes):
+            return True
+        for addr, idle in self.active_when.items():
+            if block.covers(addr) and values.get(addr, idle) != idle:
+                return True
+        return False
+
+    def adjust(self, block, changes, values, now):
+        """블록 한 번 읽은 뒤 주기 갱신 - 기록할 결정이 있으면 사유 문자열 반환"""
+        old = block.rate if block.rate is not None else self.max_interval
+        if self.is_active(block, changes, values):
+            block.last_active = now
+            new = self.min_interval
+        elif now - block.last_active < self.hold:
+            new = old
+        else:
+            new = min(self.max_interval, old * self.decay)
+        block.rate = new
+
+        if new == self.min_interval and old != new:
+            return "활동 감지"
+        if new == self.max_interval and old != new:
+            return "유휴 - 하한 주기 복귀"
+        return None
+
+    def rebalance(self, blocks, fixed_rate):
+        """전체 요청 예산 적용 - 배율이 바뀌었으면 사유 문자열 반환"""
+        adaptive_rate = sum(1 / b.rate for b in blocks if b.rate)
+        available = max(self.budget - fixed_rate, 0.0)
+        if adaptive_rate <= available or not adaptive_rate:
+            factor = 1.0
+        elif available:
+            factor = adaptive_rate / available
+        else:
+            factor = self.max_interval / self.min_interval
+        old, self.factor = self.factor, factor
+
+        if old == 1.0 and factor > 1.0:
+            return f"요청 예산 초과 ({adaptive_rate + fixed_rate:.1f}/{self.budget:.1f} req/s) - 주기 x{factor:.2f}"
+        if old > 1.0 and factor == 1.0:
+            return "요청 예산 제한 해제"
+        return None
+
+
+class RegisterPoller:
+    """레지스터 범위를 주기적으로 읽고 변경된 값만 묶어서 전달하는 폴러
+
+    사용 예:
+        poller = RegisterPoller(monitor)
+        async for batch in poller.changes():
+            for addr, value in sorted(batch.items()):
+                ...
+    """
+    def __init__(self, monitor=None, ranges=None, excluded=None,
+                 interval=DEFAULT_INTERVAL, callback=None):
+        # monitor 는 read_registers(address, count) 코루틴을 가진 객체 (RobotMonitor)
+        self.monitor = monitor
+        self.blocks = [self._make_block(r) for r in (ranges or DEFAULT_RANGES)]
+        self.excluded = set(DEFAULT_EXCLUDED if excluded is None else excluded)
+        self.interval = interval
+        self.callback = callback or print
+        self.previous_values = {}  # 마지막으로 읽은 값 (주소 -> 값)
+        self.last_blocks = []  # 직전 주기에 읽은 원본 블록 [(시작 주소, 값 리스트), ...]
+        self.last_stamps = []  # 직전 주기의 블록별 변경 [(응답 수신 monotonic_ns, {주소: 값}), ...]
+        self.running = False
+        self.adaptive = None  # AdaptiveRate (None 이면 고정 주기)
+        self.stats = None  # AddressStats (변경 묶음으로 주소별 통계 누적)
+        self.clock = time.monotonic  # 블록 주기 계산용 시계 (시뮬레이션에서는 가상 루프 시계)
+        self.last_status = CycleStatus("complete", 0, 0, 0, 0, 0)  # 직전 주기 결과
+        self._carry = {}  # 취소된 주기에서 이미 이전 값에 반영했지만 전달하지 못한 변경
+
+    def set_adaptive(self, policy):
+        """적응형 폴링 정책 설정 (None 이면 고정 주기로 복귀)"""
+        self.adaptive = policy
+        for block in self.blocks:
+            block.rate = policy.max_interval if policy and block.interval is None else None
+
+    @staticmethod
+    def _make_block(spec):
+        if isinstance(spec, PollBlock):
+            return spec
+        return PollBlock(*spec)
+
+    def add_block(self, start, count, interval=None, source="holding"):
+        """폴링 블록 추가 (이미 있으면 기존 블록 반환)"""
+        for block in self.blocks:
+            if block.source == source and block.start == start and block.count == count:
+                return block
+        block = PollBlock(start, count, interval, source)
+        if self.adaptive and interval is None:
+            block.rate = self.adaptive.max_interval
+        self.blocks.append(block)
+        return block
+
+    def remove_block(self, start, count, source="holding"):
+        self.blocks = [b for b in self.blocks
+                       if not (b.source == source and b.start == start and b.count == count)]
+
+    def covers(self, addr):
+        """주소 키가 폴링 블록 중 하나에 포함되는지 확인"""
+        return any(b.covers(addr) for b in self.blocks)
+
+    def block_interval(self, block):
+        if block.interval is not None:
+            return block.interval
+        if block.rate is not None:
+            return block.rate * self.adaptive.factor
+        return self.interval
+
+    def check_changes(self, start_addr, current_values):
+        """값 변경 감지 - 바뀐 주소만 반환하고 이전 값 갱신"""
+        changes = {}
+        previous = self.previous_values
+        excluded = self.excluded
+        for addr, value in enumerate(current_values, start_addr):
+            if addr in excluded:
+                continue
+            if previous.get(addr) != value:
+                changes[addr] = value
+                previous[addr] = value
+        return changes
+
+    def check_bit_changes(self, block, current_bits):
+        """비트 소스 변경 감지 - 정수 하나로 묶은 스냅샷의 XOR 로 바뀐 비트만 찾음"""
+        packed = 0
+        for i, bit in enumerate(current_bits):
+            if bit:
+                packed |= 1 << i
+        previous_bits = block.bits
+        block.bits = packed
+        # 첫 스냅샷은 전체 비트를 변경으로 보고
+        diff = (1 << block.count) - 1 if previous_bits is None else packed ^ previous_bits
+
+        changes = {}
+        previous = self.previous_values
+        excluded = self.excluded
+        while diff:
+            low = diff & -diff
+            i = low.bit_length() - 1
+            diff ^= low
+            key = block.base + i
+            if key in excluded:
+                continue
+            value = 1 if packed & low else 0
+            changes[key] = value
+            previous[key] = value
+        return changes
+
+    async def read_block(self, block):
+        """블록 하나 읽기 - 실패 시 None"""
+        values, _ = await self._read_block(block)
+        return values
+
+    async def _read_block(self, block):
+        """블록 하나 읽기 - (값 리스트 또는 None, "ok" / "timeout" / "error")"""
+        try:
+            if block.source == "holding":
+                values = await self.monitor.read_registers(block.start, block.count)
+            else:
+                values = await self.monitor.read_source(block.source, block.start, block.count)
+        except RequestTimeout as e:
+            self.callback(f"범위 읽기 시간 초과 ({block.label}): {str(e)}")
+            return None, "timeout"
+        except Exception as e:
+            self.callback(f"범위 읽기 오류 ({block.label}): {str(e)}")
+            return None, "error"
+        return values, "ok" if values else "error"
+
+    async def poll_once(self, force=False, deadline=None):
+        """주기가 된 블록을 한 번씩 읽고 변경 사항 반환 (결과는 last_status)
+
+        요청 시간 제한은 클라이언트 계층(RobotMonitor.request_timeout)에서 요청별로 적용하고,
+        deadline(self.clock 기준 시각)이 지나면 남은 블록은 요청하지 않고 다음 주기로 넘김.
+        블록 응답은 받은 즉시 변경 비교/스냅샷/통계까지 한 번에 반영되므로 주기가 중간에 끝나도
+        읽은 블록의 결과는 그대로 남음
+        """
+        now = self.clock()
+        # 직전 주기가 취소됐으면 이미 반영된 블록 변경을 이번 주기에 이어서 전달
+        all_changes, self._carry = self._carry, {}
+        self.last_blocks = []
+        self.last_stamps = []
+        polled = False
+        read = timed_out = failed = skipped = 0
+        for block in self.blocks:
+            if not force and block.next_due > now:
+                continue
+            if deadline is not None and self.clock() >= deadline:
+                skipped += 1  # next_due 를 그대로 두어 다음 주기에 바로 읽음
+                continue
+            polled = True
+            try:
+                values, outcome = await self._read_block(block)
+            except asyncio.CancelledError:
+                self._carry = all_changes
+                raise
+            # 타임라인 시각은 응답 수신 직후에 찍음 (비교/로그 처리 시간 제외)
+            received_ns = time.monotonic_ns()
+            changes = {}
+            if outcome == "timeout":
+                timed_out += 1
+            elif outcome == "error":
+                failed += 1
+            else:
+                read += 1
+                if block.is_bits:
+                    changes = self.check_bit_changes(block, values)
+                else:
+                    # 스냅샷(공유 메모리/로컬 모드버스 서버)은 홀딩 레지스터 블록만 사용
+                    if block.source == "holding":
+                        self.last_blocks.append((block.start, values))
+                    changes = self.check_changes(block.base, values)
+                all_changes.update(changes)
+                if changes:
+                    self.last_stamps.append((received_ns, changes))
+                if self.stats is not None and changes:
+                    self.stats.record(changes, now)
+            if block.rate is not None:
+                reason = self.adaptive.adjust(block, changes, self.previous_values, now)
+                if reason:
+                    self.callback(f"폴링 주기 {block.label}: {block.rate:.3f}s ({reason})")
+            block.next_due = now + self.block_interval(block)
+
+        self.last_status = CycleStatus(cycle_state(read, timed_out, failed, skipped),
+                                       read, timed_out, failed, skipped, len(all_changes))
+
+        if polled and self.adaptive:
+            self.rebalance()
+        return all_changes
+
+    def rebalance(self):
+        """적응형 블록 주기에 전체 요청 예산 적용"""
+        fixed_rate = sum(1 / self.block_interval(b) for b in self.blocks if b.rate is None)
+        reason = self.adaptive.rebalance(self.blocks, fixed_rate)
+        if reason:
+            self.callback(f"폴링 주기 조정: {reason}")
+        if metrics.enabled:
+            for block in self.blocks:
+                metrics.set("poll_block_interval_seconds", self.block_interval(block),
+                            block=block.label)
+
+    async def read_all(self):
+        """변경 여부와 상관없이 전체 범위 값 반환 (주소 -> 값)"""
+        values_by_addr = {}
+        for block in self.blocks:
+            values = await self.read_block(block)
+            if values:
+                values_by_addr.update(enumerate(values, block.base))
+        return values_by_addr
+
+    def next_wakeup(self):
+        """다음 블록을 읽어야 할 때까지 남은 시간(초)"""
+        if not self.blocks:
+            return self.interval
+        return max(0.0, min(b.next_due for b in self.blocks) - self.clock())
+
+    async def changes(self):
+        """변경 묶음 스트림 - 변경이 있는 주기마다 {주소: 값} 딕셔너리를 전달"""
+        self.running = True
+        while self.running:
+            batch = await self.poll_once()
+            if batch:
+                yield batch
+            await asyncio.sleep(self.next_wakeup())
+
+    def reset(self):
+        """이전 값 초기화 - 다음 주기에 전체 값이 변경으로 보고됨"""
+        self.previous_values.clear()
+        # 비트 블록은 block.bits 와 XOR 해 변경을 찾으므로 함께 비워야 다시 보고됨
+        for block in self.blocks:
+            block.bits = None
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,166 @@
+"""
+프로세스 이미지 모드버스 서버 모듈
+폴링한 128-255 스냅샷을 로컬 Modbus TCP 서버로 제공 (캐싱 게이트웨이)
+
+- 읽기(FC3)는 메모리 스냅샷에서 바로 응답 - 로봇 왕복 없음 (첫 폴링 전에는 SERVER_DEVICE_BUSY)
+- 입력 레지스터(FC4)는 홀딩 스냅샷과 다른 소스이므로 ILLEGAL_FUNCTION
+- 쓰기(FC6)는 write_handler(주소, 값), 다중 쓰기(FC16)는 write_block_handler(시작 주소, 값 목록) 코루틴으로
+  한 번에 전달 (MonitorThread 쓰기 경로, 로봇에도 FC16 한 번)
+"""
+import asyncio
+import struct
+from array import array
+
+MBAP_HEADER = struct.Struct('!HHHB')  # 트랜잭션 ID, 프로토콜 ID, 길이, 유닛 ID
+
+# 모드버스 예외 코드
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+SERVER_DEVICE_FAILURE = 0x04
+SERVER_DEVICE_BUSY = 0x06
+
+
+class ProcessImage:
+    """연속 주소 범위의 레지스터 값 (uint16 배열)"""
+    def __init__(self, start=128, count=128):
+        self.start = start
+        self.count = count
+        self.values = array('H', bytes(count * 2))
+        self.valid = False  # 한 번이라도 갱신되었는지
+
+    def update(self, blocks):
+        """폴러가 읽은 원본 블록 반영 - [(시작 주소, 값 리스트), ...]"""
+        for block_start, block_values in blocks:
+            lo = max(block_start, self.start)
+            hi = min(block_start + len(block_values), self.start + self.count)
+            if lo < hi:
+                self.values[lo - self.start:hi - self.start] = array(
+                    'H', block_values[lo - block_start:hi - block_start]
+                )
+                self.valid = True
+
+    def set(self, addr, value):
+        i = addr - self.start
+        if 0 <= i < self.count:
+            self.values[i] = value
+
+    def write(self, addr, values):
+        """쓰기 성공한 연속 주소 값 반영 (범위 밖 부분은 무시, valid 는 폴링으로만 설정)"""
+        for i, value in enumerate(values):
+            self.set(addr + i, value)
+
+    def read_bytes(self, addr, count):
+        """빅엔디안 레지스터 바이트 (범위를 벗어나면 None)"""
+        i = addr - self.start
+        if i < 0 or i + count > self.count:
+            return None
+        chunk = self.values[i:i + count]
+        chunk.byteswap()  # 모드버스는 빅엔디안
+        return chunk.tobytes()
+
+
+class ProcessImageServer:
+    """ProcessImage 를 제공하는 Modbus TCP 서버"""
+    def __init__(self, image, write_handler=None, host='127.0.0.1', port=5020, callback=None,
+                 write_block_handler=None):
+        self.image = image
+        self.write_handler = write_handler  # async (주소, 값) -> bool
+        self.write_block_handler = write_block_handler  # async (시작 주소, 값 목록) -> bool
+        self.host = host
+        self.port = port
+        self.callback = callback or print
+        self.server = None
+        self._tasks = set()
+        self.request_count = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.callback(f"프로세스 이미지 모드버스 서버 시작: {self.host}:{self.port}")
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+
+    async def handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            while True:
+                header = await reader.readexactly(MBAP_HEADER.size)
+                tid, pid, length, unit = MBAP_HEADER.unpack(header)
+                if length < 2:
+                    break
+                pdu = await reader.readexactly(length - 1)
+                response = await self.handle_pdu(pdu)
+                self.request_count += 1
+                writer.write(MBAP_HEADER.pack(tid, pid, len(response) + 1, unit) + response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            self.callback(f"모드버스 서버 오류: {type(e).__name__} - {str(e)}")
+        finally:
+            self._tasks.discard(task)
+            writer.close()
+
+    @staticmethod
+    def exception(function_code, code):
+        return bytes((function_code | 0x80, code))
+
+    async def handle_pdu(self, pdu):
+        function_code = pdu[0]
+
+        # FC3 (holding) - 스냅샷에서 응답
+        if function_code == 3:
+            if len(pdu) != 5:
+                return self.exception(function_code, ILLEGAL_DATA_VALUE)
+            addr, count = struct.unpack_from('!HH', pdu, 1)
+            if not 1 <= count <= 125:
+                return self.exception(function_code, ILLEGAL_DATA_VALUE)
+            if not self.image.valid:
+                # 첫 폴링 전의 0 값을 실제 데이터처럼 보내지 않음
+                return self.exception(function_code, SERVER_DEVICE_BUSY)
+            data = self.image.read_bytes(addr, count)
+            if data is None:
+                return self.exception(function_code, ILLEGAL_DATA_ADDRESS)
+            return bytes((function_code, len(data))) + data
+
+        # FC6 단일 쓰기
+        if function_code == 6:
+            if len(pdu) != 5:
+                return self.exception(function_code, ILLEGAL_DATA_VALUE)
+            addr, value = struct.unpack_from('!HH', pdu, 1)
+            if not await self.forward_write(addr, value):
+                return self.exception(function_code, SERVER_DEVICE_FAILURE)
+            return pdu
+
+        # FC16 다중 쓰기
+        if function_code == 16:
+            if len(pdu) < 6:
+                return self.exception(function_code, ILLEGAL_DATA_VALUE)
+            addr, count, byte_count = struct.unpack_from('!HHB', pdu, 1)
+            if not 1 <= count <= 123 or byte_count != count * 2 or len(pdu) != 6 + byte_count:
+                return self.exception(function_code, ILLEGAL_DATA_VALUE)
+            values = list(struct.unpack_from(f'!{count}H', pdu, 6))
+            if self.write_block_handler is None:
+                return self.exception(function_code, ILLEGAL_FUNCTION)
+            # 레지스터별로 나누면 중간 실패 시 일부만 쓰인 채 예외를 돌려주게 되므로 블록 그대로 전달
+            if not await self.write_block_handler(addr, values):
+                return self.exception(function_code, SERVER_DEVICE_FAILURE)
+            self.image.write(addr, values)
+            return pdu[:5]
+
+        return self.exception(function_code, ILLEGAL_FUNCTION)
+
+    async def forward_write(self, addr, value):
+        if self.write_handler is None:
+            return False
+        ok = await self.write_handler(addr, value)
+        if ok:
+            # 다음 폴링 전에도 읽기 결과가 맞도록 스냅샷 즉시 반영
+            self.image.set(addr, value)
+        return ok
@@ -0,0 +1,335 @@
+"""
+프로세스 분리 모니터 모듈
+모드버스 수집을 별도 프로세스(acquisition.py)에서 실행하고,
+GUI 는 공유 메모리 스냅샷과 이벤트 링을 자체 주기로 읽어 화면 갱신
+
+MonitorThread 와 같은 시그널/메서드를 제공하므로 main.py 에서 그대로 교체 가능
+"""
+import multiprocessing
+import queue
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from .acquisition import acquisition_main
+from .read_registers import REQUEST_TIMEOUT, WRITE_TIMEOUT
+from .shared_snapshot import SharedSnapshot, EventRing
+from .triggers import TriggerEngine
+from .address_stats import AddressStats
+from .poller import format_address, format_addresses
+from .history import TrendHistory
+from .timeline import EventTimeline
+from .cycles import CycleAnalytics, DEFAULT_CYCLES
+from .filters import ChangeFilter
+
+
+class ProcessMonitor(QObject):
+    log_signal = pyqtSignal(str)
+    register_update_signal = pyqtSignal(int, int)  # 레지스터 주소, 값
+    register_write_result_signal = pyqtSignal(int, bool)  # 쓰기 결과 시그널 (주소, 성공여부)
+    decoded_update_signal = pyqtSignal(dict)  # 레지스터 맵 디코딩 결과 {주소: 표시 문자열}
+    trigger_signal = pyqtSignal(str, dict)  # 트리거 이름, 조건 주소 값
+
+    def __init__(self, host, port=502, render_interval_ms=50, ring_capacity=8192, register_map=None,
+                 triggers=None, capture_dir=None, adaptive=None, filters=None, sources=None, cycles=None,
+                 request_timeout=REQUEST_TIMEOUT, write_timeout=WRITE_TIMEOUT):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.render_interval_ms = render_interval_ms
+        self.ring_capacity = ring_capacity
+        self.adaptive = adaptive  # 수집 프로세스에 전달할 AdaptiveRate 인자 dict
+        self.sources = sources  # 수집 프로세스에서 함께 읽을 추가 폴링 소스 [(소스, 시작, 개수)]
+        self.request_timeout = request_timeout  # 수집 프로세스의 요청별 제한 시간 (초) - 폴링 읽기 / 하트비트·쓰기
+        self.write_timeout = write_timeout
+        self._monitored_registers = set()  # 모니터링할 레지스터 집합
+        self._last_values = {}  # GUI 에 마지막으로 전달한 값
+        self._dropped = 0
+
+        # 주소별 변경 통계 (링에서 읽은 변경으로 GUI 쪽에서 누적)
+        self.address_stats = AddressStats(start=128, count=128)
+
+        # 트렌드 그래프용 주소별 시계열 (링에서 읽은 시각으로 기록)
+        self.trend_history = TrendHistory()
+
+        # 소켓 이벤트와 맞춰 보는 타임라인 (링 레코드의 응답 수신 시각으로 기록)
+        self.timeline = EventTimeline()
+
+        # 레지스터 맵 디코더 (공유 스냅샷 범위 전용)
+        self.decoder = register_map.compile(start=128, count=128) if register_map else None
+
+        # 사이클 분석 (링에서 읽은 변경으로 GUI 쪽에서 누적)
+        self.cycle_analytics = CycleAnalytics(DEFAULT_CYCLES if cycles is None else cycles)
+
+        # 변경 필터 - 링에는 원본 변경이 오므로 로그/레지스터 표시 경로에서만 적용 (MonitorThread 와 같음)
+        self.change_filter = ChangeFilter.from_config(filters) if filters else None
+
+        # 트리거 엔진 (링에서 읽은 변경 묶음으로 평가)
+        self.trigger_engine = TriggerEngine(triggers, capture_dir=capture_dir) if triggers else None
+
+        self.snapshot = None
+        self.ring = None
+        self._process = None
+        self._cmd_queue = None
+        self._event_queue = None
+
+        # GUI 갱신 타이머 - 수집 주기와 상관없이 자체 주기로 읽음
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.drain)
+
+    def start(self):
+        # Qt 스레드가 있는 프로세스에서 fork 하지 않도록 spawn 사용
+        ctx = multiprocessing.get_context('spawn')
+        self.snapshot = SharedSnapshot(start=128, count=128)
+        self.ring = EventRing(capacity=self.ring_capacity)
+        self._cmd_queue = ctx.Queue()
+        self._event_queue = ctx.Queue()
+
+        # 시작 전에 추가된 범위 밖 레지스터 전달
+        if self._monitored_registers:
+            self._cmd_queue.put(('watch', sorted(self._monitored_registers)))
+
+        self._process = ctx.Process(
+            target=acquisition_main,
+            args=(self.host, self.port, self.snapshot.name, self.ring.name,
+                  self._cmd_queue, self._event_queue),
+            kwargs={'adaptive': self.adaptive, 'sources': self.sources,
+                    'request_timeout': self.request_timeout, 'write_timeout': self.write_timeout},
+            daemon=True
+        )
+        self._process.start()
+        self._timer.start(self.render_interval_ms)
+
+    def isRunning(self):
+        return self._process is not None and self._process.is_alive()
+
+    def stop(self):
+        if self._cmd_queue:
+            self._cmd_queue.put(('stop',))
+
+    def wait(self, msecs=None):
+        if self._process is None:
+            return True
+        self._process.join(None if msecs is None else msecs / 1000)
+        if self._process.is_alive():
+            return False
+        self._timer.stop()
+        self.drain()
+        self._close_shared()
+        return True
+
+    def _close_shared(self):
+        if self.snapshot:
+            self.snapshot.close()
+            self.snapshot = None
+        if self.ring:
+            self.ring.close()
+            self.ring = None
+
+    def _send(self, *cmd):
+        if self._cmd_queue and self.isRunning():
+            self._cmd_queue.put(cmd)
+            return True
+        return False
+
+    def drain(self):
+        """링 이벤트와 로그를 읽어 시그널로 전달 (GUI 스레드 타이머)"""
+        if self._event_queue:
+            while True:
+                try:
+                    kind, *args = self._event_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'log':
+                    self.log_signal.emit(args[0])
+                elif kind == 'write_result':
+                    self.register_write_result_signal.emit(*args)
+                elif kind == 'exited':
+                    self.log_signal.emit("수집 프로세스가 종료되었습니다.")
+
+        if not self.ring:
+            return
+
+        events = self.ring.pop_all()
+        dropped = self.ring.dropped
+        if dropped != self._dropped:
+            self.log_signal.emit(f"이벤트 링이 가득 차 변경 {dropped - self._dropped}건을 놓쳤습니다.")
+            self._dropped = dropped
+
+        batches = self.cycle_batches(events)
+        if events:
+            self.address_stats.record({addr: value for addr, value, _, _ in events})
+            # 같은 주소가 여러 번 바뀐 경우도 모두 남도록 이벤트 단위로 기록
+            now = time.time()
+            for addr, value, _, _ in events:
+                self.trend_history.append(addr, value, now)
+            for batch in batches:
+                self.log_cycles(self.cycle_analytics.process(batch))
+            self.record_timeline(events)
+
+        # 트리거 평가 - 링 이벤트가 없어도 캡처 마무리를 위해 호출
+        if self.trigger_engine:
+            self.process_triggers(events)
+
+        # 흔들리는 레지스터 필터링 - 위의 분석은 원본, 로그/레지스터 표시만 필터 결과
+        # (보류 값 보고를 위해 이벤트가 없어도 매번 호출)
+        if self.change_filter:
+            batches = [self.change_filter.apply(batch) for batch in batches]
+            batches.append(self.change_filter.apply({}))
+        batches = [batch for batch in batches if batch]
+
+        # 표시할 주소의 레지스터 맵 항목을 스냅샷 한 번으로 디코딩
+        decoded = self.emit_decoded({addr for batch in batches for addr in batch}) if batches else {}
+
+        for batch in batches:
+            # 주기마다 MonitorThread 와 같은 형식으로 로그 출력
+            self.log_signal.emit("\n")
+            for addr, value in sorted(batch.items()):
+                if addr == 202 or addr == 211:
+                    if addr in decoded:
+                        self.log_signal.emit(f"주소 {addr}: {value} ({decoded[addr]})")
+                    else:
+                        self.log_signal.emit(f"주소 {addr}: {value}")
+
+                # 모니터링 중인 레지스터는 UI도 갱신
+                if addr in self._monitored_registers and self._last_values.get(addr) != value:
+                    self._last_values[addr] = value
+                    self.register_update_signal.emit(addr, value)
+
+    @staticmethod
+    def cycle_batches(events):
+        """링 이벤트를 수집 주기별 변경 묶음 [{주소: 값}, ...] 으로 나눔 (전환 순서 유지)"""
+        batches = []
+        last_cycle = None
+        for addr, value, cycle, _ in events:
+            if cycle != last_cycle or not batches:
+                batches.append({})
+                last_cycle = cycle
+            batches[-1][addr] = value
+        return batches
+
+    def record_timeline(self, events):
+        """링 이벤트를 응답 수신 시각별 변경 묶음으로 타임라인에 기록 (MonitorThread 의 블록 단위와 같음)"""
+        stamped = {}
+        for addr, value, _, t_ns in events:
+            stamped.setdefault(t_ns, {})[addr] = value
+        for t_ns, changes in stamped.items():
+            self.timeline.record("modbus", changes, t_ns)
+
+    def log_cycles(self, completed):
+        """끝난 사이클 로그"""
+        for tracker, duration in completed:
+            stats = tracker.stats
+            self.log_signal.emit(f"[사이클] {tracker.name} 완료: {duration:.2f}s "
+                                 f"(평균 {stats.mean:.2f}s, {stats.count}회)")
+
+    def process_triggers(self, events):
+        """링에서 읽은 변경을 트리거 엔진에 전달 (조건 값은 스냅샷 기준)"""
+        changes = {addr: value for addr, value, _, _ in events}
+        values = {}
+        if changes:
+            result = self.snapshot.read()
+            if result is not None:
+                values = dict(enumerate(result[1], self.snapshot.start))
+            values.update(changes)
+        fired, completed = self.trigger_engine.process(changes, values)
+
+        for event in fired:
+            self.log_signal.emit(event.summary())
+            self.trigger_signal.emit(event.rule.name, event.values)
+        for event in completed:
+            if event.path:
+                self.log_signal.emit(f"[트리거] {event.rule.name} 캡처 저장: {event.path}")
+
+    def emit_decoded(self, addresses):
+        """변경된 주소에 해당하는 레지스터 맵 항목을 디코딩해 전달"""
+        if not self.decoder or not self.snapshot:
+            return {}
+        result = self.snapshot.read()
+        if result is None:
+            return {}
+        decoded = self.decoder.describe(result[1], addresses)
+        if decoded:
+            self.decoded_update_signal.emit(decoded)
+        return decoded
+
+    def add_monitored_register(self, register):
+        """모니터링할 레지스터 추가"""
+        self.add_monitored_registers([register])
+
+    def add_monitored_registers(self, registers):
+        """모니터링할 레지스터 목록 추가 - 스냅샷 범위 밖 주소는 수집 프로세스에 명령 하나로 폴링 요청"""
+        registers = list(registers)
+        new = [register for register in registers if register not in self._monitored_registers]
+        if new:
+            self._monitored_registers.update(new)
+            self.log_signal.emit(f"레지스터 {format_addresses(new)} 모니터링 시작")
+
+        ready = self.snapshot and self.snapshot.ready()
+        shown, watch = set(), []
+        for register in registers:
+            self._last_values.pop(register, None)
+            # 다시 읽은 값은 데드밴드와 상관없이 보고
+            if self.change_filter:
+                self.change_filter.reset(register)
+            # 스냅샷 범위 안이면 바로 표시, 밖이면 수집 프로세스에 폴링 요청
+            value = self.snapshot.get(register) if ready else None
+            if value is not None:
+                self._last_values[register] = value
+                self.register_update_signal.emit(register, value)
+                shown.add(register)
+            else:
+                watch.append(register)
+        if shown:
+            self.emit_decoded(shown)
+        if watch:
+            self._send('watch', watch)
+
+    def remove_monitored_register(self, register):
+        """모니터링할 레지스터 제거"""
+        self.remove_monitored_registers([register])
+
+    def remove_monitored_registers(self, registers):
+        """모니터링할 레지스터 목록 제거"""
+        removed = [register for register in registers if register in self._monitored_registers]
+        if not removed:
+            return
+        self._monitored_registers.difference_update(removed)
+        self.log_signal.emit(f"레지스터 {format_addresses(removed)} 모니터링 중지")
+        unwatch = [register for register in removed if self.snapshot and self.snapshot.get(register) is None]
+        if unwatch:
+            self._send('unwatch', unwatch)
+
+    def write_register_value(self, register, value):
+        """레지스터에 값을 쓰는 메서드"""
+        if not self._send('write', register, value):
+            self.log_signal.emit(f"모드버스 연결이 활성화되지 않았습니다. 레지스터 {format_address(register)}에 {value} 쓰기 실패.")
+            self.register_write_result_signal.emit(register, False)
+
+    def set_heartbeat(self, active):
+        """하트비트 상태 설정"""
+        if active:
+            self.log_signal.emit("웰딩 하트비트 전송 시작 (레지스터 211)")
+        else:
+            self.log_signal.emit("웰딩 하트비트 전송 중지")
+        self._send('heartbeat', active)
+
+    def reset_registers(self):
+        self._send('reset')
+
+    def run_monitor_once_manual(self):
+        """스냅샷 전체 출력 - 로봇 왕복 없이 공유 메모리에서 읽음"""
+        result = self.snapshot.read() if self.snapshot else None
+        if result is None:
+            self.log_signal.emit("레지스터 스냅샷을 읽을 수 없습니다.")
+            return
+        _, values = result
+        decoded = self.decoder.describe(values, range(self.snapshot.start, self.snapshot.start + len(values))) if self.decoder else {}
+        if decoded:
+            self.decoded_update_signal.emit(decoded)
+        for addr, value in enumerate(values, self.snapshot.start):
+            if addr in decoded:
+                self.log_signal.emit(f"주소 {addr}: {value} ({decoded[addr]})")
+            else:
+                self.log_signal.emit(f"주소 {addr}: {value}")
+            if addr in self._monitored_registers:
+                self._last_values[addr] = value
+                self.register_update_signal.emit(addr, value)
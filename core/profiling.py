@@ -0,0 +1,209 @@
+"""
+프로파일링 모듈
+MODBUS_MONITOR_PROFILE=1 (또는 main.py --profile) 일 때만 동작하며 다음을 수집
+- asyncio 디버그 모드의 느린 콜백 (임계값: MODBUS_MONITOR_SLOW_CALLBACK_MS, 기본 100ms)
+- 워커 스레드와 GUI 스레드의 벽시계 샘플링 (스택별 누적 횟수)
+- Qt 슬롯 실행 시간 (@timed_slot)
+- tracemalloc 메모리 증가 스냅샷
+
+종료 시 write_report() 로 버그 티켓에 첨부할 텍스트 보고서를 생성
+"""
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime
+
+PROFILE_ENV = "MODBUS_MONITOR_PROFILE"
+SLOW_CALLBACK_ENV = "MODBUS_MONITOR_SLOW_CALLBACK_MS"
+PROFILE_DIR_ENV = "MODBUS_MONITOR_PROFILE_DIR"
+
+
+def _env_enabled():
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "on", "yes")
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """asyncio 로거의 느린 콜백 경고를 수집"""
+    def __init__(self, profiler):
+        super().__init__(logging.WARNING)
+        self.profiler = profiler
+
+    def emit(self, record):
+        message = record.getMessage()
+        if "took" in message and "seconds" in message:
+            self.profiler.slow_callbacks.append(
+                (time.time(), threading.current_thread().name, message)
+            )
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = _env_enabled()
+        self.slow_callback_ms = float(os.environ.get(SLOW_CALLBACK_ENV, "100"))
+        self.sample_interval = 0.01  # 샘플링 주기 (초)
+        self.snapshot_interval = 60.0  # tracemalloc 스냅샷 주기 (초)
+
+        self.threads = {}  # 스레드 ID -> 이름
+        self.samples = defaultdict(Counter)  # 스레드 이름 -> {축약 스택: 횟수}
+        self.sample_count = 0
+        self.slow_callbacks = []  # (시각, 스레드, 메시지)
+        self.slot_stats = defaultdict(lambda: [0, 0.0, 0.0])  # 슬롯 -> [횟수, 합계, 최대]
+        self.slow_slots = []  # (시각, 슬롯, 소요 초)
+        self.memory_snapshots = []  # (시각, tracemalloc 스냅샷)
+
+        self.started_at = None
+        self._stop = threading.Event()
+        self._sampler = None
+        self._log_handler = None
+
+    def start(self):
+        """샘플러와 tracemalloc 시작 (비활성 상태면 아무것도 안 함)"""
+        if not self.enabled or self._sampler:
+            return
+        self.started_at = time.time()
+        self.register_thread("gui")
+
+        self._log_handler = _SlowCallbackHandler(self)
+        logging.getLogger("asyncio").addHandler(self._log_handler)
+
+        tracemalloc.start(25)
+        self.memory_snapshots.append((time.time(), tracemalloc.take_snapshot()))
+
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        if not self._sampler:
+            return
+        self._stop.set()
+        self._sampler.join(1.0)
+        self._sampler = None
+        if tracemalloc.is_tracing():
+            self.memory_snapshots.append((time.time(), tracemalloc.take_snapshot()))
+            tracemalloc.stop()
+        if self._log_handler:
+            logging.getLogger("asyncio").removeHandler(self._log_handler)
+
+    def register_thread(self, name):
+        """현재 스레드를 샘플링 대상으로 등록"""
+        if self.enabled:
+            self.threads[threading.get_ident()] = name
+
+    def instrument_loop(self, loop, name):
+        """asyncio 디버그 모드와 느린 콜백 임계값 설정 - 루프를 돌리는 스레드에서 호출"""
+        if not self.enabled:
+            return
+        self.register_thread(name)
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.slow_callback_ms / 1000
+
+    def _sample_loop(self):
+        next_snapshot = time.monotonic() + self.snapshot_interval
+        while not self._stop.wait(self.sample_interval):
+            frames = sys._current_frames()
+            for ident, name in list(self.threads.items()):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples[name][self._collapse(frame)] += 1
+            self.sample_count += 1
+
+            if time.monotonic() >= next_snapshot and tracemalloc.is_tracing():
+                self.memory_snapshots.append((time.time(), tracemalloc.take_snapshot()))
+                # 처음과 마지막 두 개만 있으면 증가량 비교 가능
+                if len(self.memory_snapshots) > 3:
+                    del self.memory_snapshots[1]
+                next_snapshot = time.monotonic() + self.snapshot_interval
+
+    @staticmethod
+    def _collapse(frame, limit=40):
+        """flamegraph 축약 형식 스택 (바깥 -> 안쪽, ';' 구분)"""
+        names = []
+        while frame is not None and len(names) < limit:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def record_slot(self, name, elapsed):
+        stats = self.slot_stats[name]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        if elapsed * 1000 >= self.slow_callback_ms:
+            self.slow_slots.append((time.time(), name, elapsed))
+
+    def write_report(self, path=None):
+        """보고서 파일 작성 후 경로 반환 (flamegraph 용 .folded 파일도 함께 생성)"""
+        if not self.enabled:
+            return None
+        if path is None:
+            directory = os.environ.get(PROFILE_DIR_ENV, os.getcwd())
+            path = os.path.join(directory, f"profile_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+
+        lines = []
+        started = datetime.fromtimestamp(self.started_at).strftime('%Y-%m-%d %H:%M:%S') if self.started_at else "-"
+        lines.append("=== Modbus Monitor profile report ===")
+        lines.append(f"started: {started}  duration: {time.time() - (self.started_at or time.time()):.1f}s")
+        lines.append(f"slow callback threshold: {self.slow_callback_ms:.0f}ms  samples: {self.sample_count}")
+
+        lines.append("\n--- slow asyncio callbacks ---")
+        for ts, thread, message in self.slow_callbacks[-200:]:
+            lines.append(f"{datetime.fromtimestamp(ts).strftime('%H:%M:%S.%f')[:-3]} [{thread}] {message}")
+
+        lines.append("\n--- Qt slots (count / total / mean / max) ---")
+        for name, (count, total, worst) in sorted(self.slot_stats.items(), key=lambda i: -i[1][1]):
+            lines.append(f"{name}: {count} / {total * 1000:.1f}ms / {total / count * 1000:.3f}ms / {worst * 1000:.1f}ms")
+        for ts, name, elapsed in self.slow_slots[-100:]:
+            lines.append(f"  slow {datetime.fromtimestamp(ts).strftime('%H:%M:%S.%f')[:-3]} {name} {elapsed * 1000:.1f}ms")
+
+        lines.append("\n--- wall-clock samples (top stacks per thread) ---")
+        for thread, stacks in self.samples.items():
+            total = sum(stacks.values())
+            lines.append(f"[{thread}] {total} samples")
+            for stack, count in stacks.most_common(15):
+                leaf = " <- ".join(reversed(stack.split(";")[-4:]))
+                lines.append(f"  {count / total * 100:5.1f}%  {leaf}")
+
+        lines.append("\n--- memory growth (tracemalloc, first -> last snapshot) ---")
+        if len(self.memory_snapshots) >= 2:
+            first = self.memory_snapshots[0][1]
+            last = self.memory_snapshots[-1][1]
+            for stat in last.compare_to(first, 'lineno')[:20]:
+                lines.append(f"  {stat}")
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        # flamegraph.pl / speedscope 에서 열 수 있는 축약 스택
+        with open(os.path.splitext(path)[0] + ".folded", 'w', encoding='utf-8') as f:
+            for thread, stacks in self.samples.items():
+                for stack, count in stacks.items():
+                    f.write(f"{thread};{stack} {count}\n")
+
+        return path
+
+
+# 애플리케이션 전체에서 공유하는 프로파일러
+profiler = Profiler()
+
+
+def timed_slot(name):
+    """Qt 슬롯 실행 시간 측정 데코레이터 - 프로파일링이 꺼져 있으면 원래 함수를 그대로 반환"""
+    def decorator(func):
+        if not profiler.enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record_slot(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
@@ -1,69 +1,201 @@
 import asyncio
+import time
 from pymodbus.client import AsyncModbusTcpClient
 from datetime import datetime
 from typing import Callable
+from .poller import RegisterPoller, RequestTimeout, DEFAULT_RANGES, DEFAULT_EXCLUDED, BIT_SOURCES, split_key
+from .metrics import metrics, Stopwatch
+
+# 소스별 pymodbus 읽기 메서드 (FC1/FC2/FC3/FC4)
+READ_METHODS = {
+    "coil": "read_coils",
+    "discrete": "read_discrete_inputs",
+    "holding": "read_holding_registers",
+    "input": "read_input_registers",
+}
+
+# 용접기 하트비트 레지스터 - 이미 할당된 비트들의 마스크 (비트 7, 5, 4, 8)
+HEARTBEAT_REGISTER = 211
+HEARTBEAT_RESERVED_MASK = (1 << 7) | (1 << 5) | (1 << 4) | (1 << 8)
+
+# 폴링 읽기 요청 하나의 응답 제한 시간 (초) - 주기 마감(0.5초)과 같은 예산
+REQUEST_TIMEOUT = 0.5
+# 하트비트/사용자 쓰기(와 쓰기 후 확인 읽기) 요청의 제한 시간 (초) - 느린 링크에서도 워치독이 끊기지 않도록 더 길게
+WRITE_TIMEOUT = 1.0
+
+def heartbeat_word(current_value, counter):
+    """예약된 비트를 보존하고 하위 4비트(0-3)에 하트비트 값을 넣은 레지스터 값"""
+    preserved_bits = current_value & HEARTBEAT_RESERVED_MASK
+    heartbeat_bits = counter & 0x0F  # 하위 4비트만 사용
+    return preserved_bits | heartbeat_bits
 
 class RobotMonitor:
-    def __init__(self, host='192.168.225.178', port=502, callback: Callable[[str], None] = None):
-        self.client = AsyncModbusTcpClient(
+    def __init__(self, host='192.168.225.178', port=502, callback: Callable[[str], None] = None, client=None,
+                 request_timeout=REQUEST_TIMEOUT, write_timeout=WRITE_TIMEOUT):
+        # client: 같은 인터페이스의 모드버스 클라이언트 (시뮬레이션용 가짜 클라이언트 등, None 이면 TCP)
+        self.client = client or AsyncModbusTcpClient(
             host=host,
             port=port,
         )
-        self.previous_values = {}
         self.callback = callback or print  # 콜백이 없으면 print 사용
+        self.request_timeout = request_timeout  # 폴링 읽기 요청별 제한 시간 (None 이면 제한 없음)
+        self.write_timeout = write_timeout  # 쓰기 경로 요청별 제한 시간 (None 이면 제한 없음)
         self.running = True
+        # 폴링 로직은 RegisterPoller 에 위임 (MonitorThread 와 공유)
+        self.poller = RegisterPoller(
+            self,
+            ranges=DEFAULT_RANGES,
+            excluded=DEFAULT_EXCLUDED,
+            interval=0.1,
+            callback=self.callback
+        )
+        self.previous_values = self.poller.previous_values
         
     async def connect(self):
         await self.client.connect()
         self.callback("로봇 서버에 연결되었습니다.")
     
-    async def read_registers(self, address, count):
+    async def request(self, call, op, for_write=False):
+        """클라이언트 요청 하나에 제한 시간 적용 - 넘으면 이 요청만 취소하고 RequestTimeout
+
+        호출한 주기 전체가 아니라 진행 중인 요청 하나만 취소되므로 앞서 받은 블록 결과는 유지됨
+        (늦게 도착한 응답은 트랜잭션 ID 가 달라 pymodbus 가 버림)
+        for_write 면 폴링 읽기 대신 쓰기 경로 제한 시간(write_timeout) 적용
+        """
+        timeout = self.write_timeout if for_write else self.request_timeout
+        if timeout is None:
+            return await call
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            if metrics.enabled:
+                metrics.inc("modbus_request_timeouts_total", op=op)
+            raise RequestTimeout(f"{timeout * 1000:.0f}ms 안에 응답 없음") from None
+
+    async def read_registers(self, address, count, for_write=False):
+        """홀딩 레지스터 읽기 - 실패 시 None, 제한 시간 초과는 RequestTimeout
+
+        for_write: 하트비트/쓰기 후 확인처럼 쓰기 경로의 읽기 (write_timeout 적용)
+        """
+        started = time.perf_counter() if metrics.enabled else None
         try:
-            result = await self.client.read_holding_registers(
+            result = await self.request(self.client.read_holding_registers(
                 address=address,
                 count=count
-            )
+            ), "read", for_write)
             if not result.isError():
                 return result.registers
+            if started is not None:
+                metrics.inc("modbus_request_errors_total", op="read")
             return None
+        except RequestTimeout:
+            raise
         except Exception as e:
+            if started is not None:
+                metrics.inc("modbus_request_errors_total", op="read")
             self.callback(f"레지스터 읽기 오류: {e}")
             return None
+        finally:
+            if started is not None:
+                metrics.observe("modbus_request_seconds", time.perf_counter() - started, op="read")
+
+    async def read_source(self, source, address, count, for_write=False):
+        """소스(coil/discrete/holding/input)에서 읽기 - 비트 소스는 0/1 리스트, 실패 시 None (시간 초과는 RequestTimeout)"""
+        started = time.perf_counter() if metrics.enabled else None
+        try:
+            result = await self.request(getattr(self.client, READ_METHODS[source])(
+                address=address,
+                count=count
+            ), f"read_{source}", for_write)
+            if not result.isError():
+                if source in BIT_SOURCES:
+                    # 비트 응답은 8의 배수로 채워져 옴
+                    return [1 if bit else 0 for bit in result.bits[:count]]
+                return result.registers
+            if started is not None:
+                metrics.inc("modbus_request_errors_total", op=f"read_{source}")
+            return None
+        except RequestTimeout:
+            raise
+        except Exception as e:
+            if started is not None:
+                metrics.inc("modbus_request_errors_total", op=f"read_{source}")
+            self.callback(f"{source} 읽기 오류: {e}")
+            return None
+        finally:
+            if started is not None:
+                metrics.observe("modbus_request_seconds", time.perf_counter() - started, op=f"read_{source}")
+
+    async def read_key(self, key, for_write=False):
+        """주소 키(poller.address_key) 하나 읽기 - [값] 또는 None"""
+        source, address = split_key(key)
+        if source == "holding":
+            return await self.read_registers(address, 1, for_write)
+        return await self.read_source(source, address, 1, for_write)
+
+    async def write_key(self, key, value):
+        """주소 키 하나 쓰기 - 홀딩 레지스터(FC6)와 코일(FC5)만 가능 (예외는 호출자에게 전달)"""
+        source, address = split_key(key)
+        if source == "holding":
+            return await self.write_register(address, value)
+        if source == "coil":
+            with Stopwatch("modbus_request_seconds", errors="modbus_request_errors_total", op="write_coil"):
+                return await self.request(self.client.write_coil(address=address, value=bool(value)), "write_coil", True)
+        raise ValueError(f"{source} 는 읽기 전용입니다")
+
+    async def write_register(self, address, value):
+        """단일 레지스터 쓰기 (예외는 호출자에게 전달)"""
+        with Stopwatch("modbus_request_seconds", errors="modbus_request_errors_total", op="write"):
+            return await self.request(self.client.write_register(address=address, value=value), "write", True)
+
+    async def write_registers(self, address, values):
+        """연속 레지스터 쓰기 (예외는 호출자에게 전달)"""
+        with Stopwatch("modbus_request_seconds", errors="modbus_request_errors_total", op="write_multiple"):
+            return await self.request(self.client.write_registers(address=address, values=values), "write_multiple", True)
+
+    async def reset_registers(self, start_address=128, count=128):
+        """레지스터 범위를 0으로 초기화 - 일괄 쓰기 실패 시 개별 쓰기"""
+        # 레지스터 초기화 로그
+        self.callback(f"레지스터 {start_address}-{start_address+count-1} 초기화 시작...")
+
+        # 한 번에 여러 레지스터 쓰기 시도
+        try:
+            # 배열로 한 번에 쓰기 시도
+            registers = [0] * count
+            await self.write_registers(
+                address=start_address,
+                values=registers
+            )
+            self.callback(f"레지스터 {start_address}-{start_address+count-1} 일괄 초기화 완료")
+        except Exception as bulk_error:
+            # 실패하면 개별적으로 쓰기
+            self.callback(f"일괄 초기화 실패, 개별 초기화로 전환: {str(bulk_error)}")
+
+            for i in range(count):
+                addr = start_address + i
+                try:
+                    # 단일 레지스터 쓰기
+                    await self.write_register(
+                        address=addr,
+                        value=0
+                    )
+                except Exception as e:
+                    self.callback(f"레지스터 {addr} 초기화 오류: {str(e)}")
+
+        self.callback(f"레지스터 초기화 완료")
 
     def check_changes(self, start_addr, current_values):
-        changes = {}
-        for i, value in enumerate(current_values):
-            addr = start_addr + i
-            if addr == 128 or addr ==161 or addr ==211:
-                continue
-            if addr not in self.previous_values or self.previous_values[addr] != value:
-                changes[addr] = value
-                self.previous_values[addr] = value
-        return changes
+        return self.poller.check_changes(start_addr, current_values)
 
     async def monitor_loop(self):
-        ranges = [
-            (128, 125),  # 첫 번째 범위: 128-252
-            (253, 3)     # 두 번째 범위: 253-255
-        ]
-        
         try:
-            while self.running:
-                all_changes = {}
-                
-                for start_addr, count in ranges:
-                    values = await self.read_registers(start_addr, count)
-                    if values:
-                        changes = self.check_changes(start_addr, values)
-                        all_changes.update(changes)
-                
-                if all_changes:
-                    # self.callback(f"\n{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                    self.callback("\n")
-                    for addr, value in sorted(all_changes.items()):
-                        self.callback(f"주소 {addr}: {value}")
-                
-                await asyncio.sleep(0.1)
+            async for all_changes in self.poller.changes():
+                if not self.running:
+                    break
+                # self.callback(f"\n{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                self.callback("\n")
+                for addr, value in sorted(all_changes.items()):
+                    self.callback(f"주소 {addr}: {value}")
                 
         except Exception as e:
             self.callback(f"모니터링 오류: {e}")
@@ -73,6 +205,7 @@ class RobotMonitor:
     
     def stop(self):
         self.running = False
+        self.poller.stop()
 
 async def main():
     monitor = RobotMonitor(host="192.168.1.7")
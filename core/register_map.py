@@ -0,0 +1,198 @@
+"""
+레지스터 맵 모듈
+TOML 파일로 주소별 이름/타입/스케일/비트필드를 선언하고,
+스냅샷 범위에 맞춰 한 번 컴파일한 struct 디코더로 전체 배열을 한 번에 해석
+
+예시 (register_map.example.toml 참고):
+
+    [[register]]
+    address = 150
+    name = "weld_current"
+    type = "uint16"
+    scale = 0.1
+    unit = "A"
+
+    [[register]]
+    address = 211
+    name = "welder_status"
+    type = "bits"
+    [register.bits]
+    heartbeat = "0:3"   # 비트 0-3
+    arc_on = 4          # 단일 비트
+"""
+import struct
+import sys
+from array import array
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10 이하
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# 타입 이름 -> (struct 코드, 워드 수)
+FIELD_TYPES = {
+    "uint16": ("H", 1),
+    "int16": ("h", 1),
+    "uint32": ("I", 2),
+    "int32": ("i", 2),
+    "float32": ("f", 2),
+    "bits": ("H", 1),
+}
+
+
+class RegisterField:
+    """레지스터 맵의 항목 하나"""
+    def __init__(self, address, name, type="uint16", scale=None, offset=0.0,
+                 unit="", word_order="big", bits=None):
+        if type not in FIELD_TYPES:
+            raise ValueError(f"레지스터 {address}: 알 수 없는 타입 '{type}'")
+        if word_order not in ("big", "little"):
+            raise ValueError(f"레지스터 {address}: word_order 는 big 또는 little")
+        if type == "bits" and not bits:
+            raise ValueError(f"레지스터 {address}: bits 타입에는 [register.bits] 가 필요합니다")
+
+        self.address = address
+        self.name = name
+        self.type = type
+        self.scale = scale
+        self.offset = offset
+        self.unit = unit
+        self.word_order = word_order
+        self.code, self.words = FIELD_TYPES[type]
+        # 비트필드: [(이름, 시프트, 마스크), ...]
+        self.bits = [self._parse_bits(name, spec) for name, spec in (bits or {}).items()]
+
+    def _parse_bits(self, name, spec):
+        if isinstance(spec, int):
+            lo = hi = spec
+        else:
+            lo, _, hi = str(spec).partition(":")
+            lo, hi = int(lo), int(hi or lo)
+        if not 0 <= lo <= hi <= 15:
+            raise ValueError(f"레지스터 {self.address}: 비트 범위 오류 {name}={spec}")
+        return name, lo, (1 << (hi - lo + 1)) - 1
+
+    @property
+    def scaled(self):
+        return self.scale is not None or self.offset
+
+    def format(self, value):
+        """디코딩된 값을 표시 문자열로 변환"""
+        if self.bits:
+            return " ".join(f"{name}={(value >> shift) & mask}" for name, shift, mask in self.bits)
+        if isinstance(value, float):
+            text = f"{value:.6g}"
+        else:
+            text = str(value)
+        return f"{text} {self.unit}" if self.unit else text
+
+
+class RegisterMap:
+    """주소 -> RegisterField"""
+    def __init__(self, fields=()):
+        self.fields = sorted(fields, key=lambda f: f.address)
+        self.by_address = {f.address: f for f in self.fields}
+        if len(self.by_address) != len(self.fields):
+            raise ValueError("같은 주소가 두 번 정의되었습니다")
+        for prev, field in zip(self.fields, self.fields[1:]):
+            if prev.address + prev.words > field.address:
+                raise ValueError(f"레지스터 {prev.address}({prev.name}) 와 {field.address}({field.name}) 가 겹칩니다")
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(RegisterField(**entry) for entry in data.get("register", []))
+
+    def get(self, address):
+        return self.by_address.get(address)
+
+    def compile(self, start=128, count=128):
+        return RegisterDecoder(self, start, count)
+
+
+def load_register_map(path):
+    """TOML 레지스터 맵 파일 로드"""
+    if tomllib is None:
+        raise RuntimeError("TOML 파서가 없습니다 (Python 3.11+ 또는 pip install tomli)")
+    with open(path, "rb") as f:
+        return RegisterMap.from_dict(tomllib.load(f))
+
+
+class RegisterDecoder:
+    """연속 스냅샷(start..start+count) 전용으로 컴파일된 디코더
+
+    맵 전체를 하나의 빅엔디안 struct 형식(사이 간격은 패딩)으로 만들어
+    decode() 한 번의 unpack_from 으로 모든 항목을 해석함.
+    스케일/비트필드/워드 순서 뒤집기가 필요한 항목만 후처리
+    """
+    def __init__(self, register_map, start, count):
+        self.start = start
+        self.count = count
+        self.fields = []
+        self.skipped = []  # 스냅샷 범위 밖이라 제외된 항목
+
+        fmt = [">"]
+        position = start
+        for field in register_map.fields:
+            if field.address < start or field.address + field.words > start + count:
+                self.skipped.append(field)
+                continue
+            if field.address > position:
+                fmt.append(f"{(field.address - position) * 2}x")
+            # 하위 워드가 먼저 오는 32비트 값은 두 워드로 읽어 후처리에서 조합
+            fmt.append("HH" if field.words == 2 and field.word_order == "little" else field.code)
+            position = field.address + field.words
+            self.fields.append(field)
+        self.struct = struct.Struct("".join(fmt))
+
+        # unpack 결과 인덱스, 후처리 대상 목록
+        self._slots = []
+        self._swapped = []
+        index = 0
+        for i, field in enumerate(self.fields):
+            self._slots.append(index)
+            if field.words == 2 and field.word_order == "little":
+                self._swapped.append((i, struct.Struct(">" + field.code)))
+                index += 2
+            else:
+                index += 1
+        self._scaled = [(i, f.scale if f.scale is not None else 1, f.offset)
+                        for i, f in enumerate(self.fields) if f.scaled]
+
+        self.by_address = {f.address: f for f in self.fields}
+
+        # 주소 -> 그 주소를 포함하는 항목 인덱스 (32비트는 두 주소 모두)
+        self._affected = {}
+        for i, field in enumerate(self.fields):
+            for addr in range(field.address, field.address + field.words):
+                self._affected[addr] = i
+
+    def get(self, address):
+        """이 디코더가 해석하는 항목 (범위 밖으로 제외된 항목은 None)"""
+        return self.by_address.get(address)
+
+    def decode(self, values):
+        """스냅샷 워드 배열 -> self.fields 순서의 디코딩 값 리스트"""
+        words = array('H', values)  # 복사본 - 원본 스냅샷은 그대로 둠
+        if sys.byteorder == "little":
+            words.byteswap()
+        raw = self.struct.unpack_from(words.tobytes())
+
+        slots = self._slots
+        result = [raw[s] for s in slots]
+        for i, swap in self._swapped:
+            s = slots[i]
+            result[i] = swap.unpack(struct.pack(">HH", raw[s + 1], raw[s]))[0]
+        for i, scale, offset in self._scaled:
+            result[i] = result[i] * scale + offset
+        return result
+
+    def describe(self, values, addresses):
+        """변경된 주소에 해당하는 항목만 {항목 시작 주소: 표시 문자열} 로 반환"""
+        indices = {self._affected[a] for a in addresses if a in self._affected}
+        if not indices:
+            return {}
+        decoded = self.decode(values)
+        return {self.fields[i].address: self.fields[i].format(decoded[i]) for i in indices}
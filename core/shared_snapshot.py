@@ -0,0 +1,171 @@
+"""
+공유 메모리 스냅샷 모듈
+수집 프로세스가 레지스터 스냅샷과 변경 이벤트를 GUI 프로세스에 전달할 때 사용
+
+- SharedSnapshot: seqlock 으로 보호되는 uint16 배열 + 변경 시퀀스 번호
+- EventRing:      단일 생산자/단일 소비자 lock-free 링 버퍼 (주소, 값, 주기 번호, 수신 시각)
+"""
+import struct
+import time
+from array import array
+from multiprocessing import shared_memory
+
+# 스냅샷 헤더: seqlock 카운터(uint32), 예약(uint32), 변경 시퀀스(uint64), 시작 주소(uint32), 개수(uint32)
+_SNAPSHOT_HEADER = struct.Struct('<IIQII')
+# 링 헤더: head(uint64, 생산자), tail(uint64, 소비자), dropped(uint64), capacity(uint64)
+_RING_HEADER = struct.Struct('<QQQQ')
+# 링 레코드: 주소 키(uint32 - 상위 16비트는 폴링 소스), 값(uint16), 주기 번호(uint32),
+#           응답 수신 시각(int64 monotonic_ns - 같은 호스트의 프로세스끼리 같은 시계)
+RING_RECORD = struct.Struct('<IHIq')
+
+
+class SharedSnapshot:
+    """seqlock 으로 보호되는 레지스터 스냅샷 (쓰기 1개, 읽기 여러 개)"""
+    def __init__(self, name=None, start=128, count=128, create=True):
+        size = _SNAPSHOT_HEADER.size + count * 2
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _SNAPSHOT_HEADER.pack_into(self.shm.buf, 0, 0, 0, 0, start, count)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            _, _, _, start, count = _SNAPSHOT_HEADER.unpack_from(self.shm.buf, 0)
+        self.owner = create
+        self.start = start
+        self.count = count
+        self._buf = self.shm.buf
+        # 헤더 뒤의 uint16 배열을 복사 없이 참조
+        self.values = self._buf[_SNAPSHOT_HEADER.size:size].cast('H')
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _seq(self):
+        return struct.unpack_from('<I', self._buf, 0)[0]
+
+    def ready(self):
+        """한 번이라도 게시된 적이 있는지 확인"""
+        return self._seq() > 0
+
+    def change_seq(self):
+        return struct.unpack_from('<Q', self._buf, 8)[0]
+
+    def publish(self, blocks, change_seq):
+        """읽은 원본 블록 기록 (쓰기 프로세스 전용) - [(시작 주소, 값 리스트), ...]
+
+        범위 밖 주소는 잘라내고 블록마다 슬라이스 복사 한 번으로 기록
+        """
+        seq = self._seq() + 1
+        struct.pack_into('<I', self._buf, 0, seq)  # 홀수: 쓰기 중
+        for block_start, block_values in blocks:
+            lo = max(block_start, self.start)
+            hi = min(block_start + len(block_values), self.start + self.count)
+            if lo >= hi:
+                continue
+            self.values[lo - self.start:hi - self.start] = array(
+                'H', block_values[lo - block_start:hi - block_start]
+            )
+        struct.pack_into('<Q', self._buf, 8, change_seq)
+        struct.pack_into('<I', self._buf, 0, seq + 1)  # 짝수: 쓰기 완료
+
+    def read(self, retries=1000):
+        """일관된 스냅샷 복사본 반환 (변경 시퀀스, 값 리스트) - 실패 시 None"""
+        for _ in range(retries):
+            before = self._seq()
+            if before & 1:
+                continue
+            change_seq = self.change_seq()
+            values = self.values.tolist()
+            if self._seq() == before:
+                return change_seq, values
+        return None
+
+    def get(self, addr):
+        """단일 주소 값 (범위 밖이면 None) - 한 워드라 찢어진 읽기가 없음"""
+        i = addr - self.start
+        if 0 <= i < self.count:
+            return self.values[i]
+        return None
+
+    def close(self):
+        self.values.release()
+        self._buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class EventRing:
+    """단일 생산자/단일 소비자 변경 이벤트 링 버퍼 (락 없음)
+
+    생산자는 head 만, 소비자는 tail 만 갱신하므로 두 프로세스 사이에 락이 필요 없음.
+    링이 가득 차면 새 이벤트는 버리고 dropped 카운터를 증가시킴.
+    """
+    def __init__(self, name=None, capacity=4096, create=True):
+        if create:
+            size = _RING_HEADER.size + capacity * RING_RECORD.size
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _RING_HEADER.pack_into(self.shm.buf, 0, 0, 0, 0, capacity)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            capacity = _RING_HEADER.unpack_from(self.shm.buf, 0)[3]
+        self.owner = create
+        self.capacity = capacity
+        self._buf = self.shm.buf
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _load(self, offset):
+        return struct.unpack_from('<Q', self._buf, offset)[0]
+
+    def _store(self, offset, value):
+        struct.pack_into('<Q', self._buf, offset, value)
+
+    @property
+    def dropped(self):
+        return self._load(16)
+
+    def push_many(self, changes, cycle, stamps=None):
+        """변경 묶음 기록 (생산자 전용) - 기록한 개수 반환
+
+        stamps: {주소: 응답 수신 monotonic_ns} (없는 주소는 지금 시각)
+        """
+        head = self._load(0)
+        tail = self._load(8)
+        free = self.capacity - (head - tail)
+        items = sorted(changes.items())
+        if len(items) > free:
+            self._store(16, self.dropped + len(items) - free)
+            items = items[:free]
+        base = _RING_HEADER.size
+        now = time.monotonic_ns()
+        stamps = stamps or {}
+        for addr, value in items:
+            RING_RECORD.pack_into(
+                self._buf, base + (head % self.capacity) * RING_RECORD.size,
+                addr, value, cycle & 0xFFFFFFFF, stamps.get(addr, now)
+            )
+            head += 1
+        # 레코드를 모두 쓴 뒤 head 공개
+        self._store(0, head)
+        return len(items)
+
+    def pop_all(self):
+        """쌓인 이벤트를 모두 꺼냄 (소비자 전용) - [(주소, 값, 주기 번호, 수신 시각), ...]"""
+        head = self._load(0)
+        tail = self._load(8)
+        base = _RING_HEADER.size
+        events = [
+            RING_RECORD.unpack_from(self._buf, base + (i % self.capacity) * RING_RECORD.size)
+            for i in range(tail, head)
+        ]
+        self._store(8, head)
+        return events
+
+    def close(self):
+        self._buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,454 @@
+"""
+가상 시간 시뮬레이션 모듈
+실제 로봇과 실제 시간 없이 MonitorThread.run_monitor 의 타이밍 동작
+(요청별 REQUEST_TIMEOUT / WRITE_TIMEOUT 제한과 CYCLE_TIMEOUT 주기 마감, MonitorEngine 하트비트 재시도, 초기화 처리, 연결 끊김)을 확인
+
+- VirtualClockLoop: 할 일이 없으면 기다리지 않고 다음 타이머 시각으로 시계를 옮기는 이벤트 루프
+  (몇 시간 분량의 폴링이 몇 초 안에 끝나고, 같은 스크립트는 항상 같은 결과)
+- ScriptedModbusClient: pymodbus 비동기 클라이언트 대용 - 요청별 지연, 오류 응답, 예외, 연결 끊김을
+  가상 시각 구간으로 지정하고 모든 요청을 (시작, 끝, 주기 번호, 결과) 로 기록
+- Simulation: MonitorThread 를 스레드 없이 가상 루프에서 실행하고 기록으로 확인
+    missed_heartbeats(): 하트비트 쓰기 간격이 허용치를 넘은 구간
+    duplicate_reads():   한 폴링 주기 안에서 같은 블록을 두 번 이상 읽은 경우
+
+사용법:
+    sim = Simulation(latency=0.005)
+    sim.client.fault(600, 630, "disconnect")
+    sim.set_heartbeat(True)
+    sim.run(3600)
+    sim.assert_healthy()  # 끊김 구간의 공백은 재연결 후 HEARTBEAT_RETRY 안에 다시 나가면 허용
+    (t, gap), = sim.missed_heartbeats(excuse_outages=False)  # 끊김 구간 공백 하나뿐
+    assert 600 - 1.0 <= t and gap <= 30 + HEARTBEAT_RETRY + 1.0
+
+    python -m modbus_monitoring.core.simulation --hours 2 --fault 600:630:disconnect
+"""
+import asyncio
+import contextvars
+import random
+import selectors
+import time
+from collections import namedtuple, Counter
+from .monitor_thread import MonitorThread
+from .monitor_engine import HEARTBEAT_RETRY
+from .read_registers import HEARTBEAT_REGISTER, REQUEST_TIMEOUT, WRITE_TIMEOUT
+
+# 요청 기록 - outcome: ok / error (오류 응답) / exception / cancelled (응답 전에 취소됨)
+Request = namedtuple("Request", ["start", "end", "op", "address", "count", "cycle", "outcome"])
+
+# 폴링 주기 기록 - outcome: CycleStatus.state (complete / partial / timed_out / failed) / cancelled / error
+Cycle = namedtuple("Cycle", ["index", "start", "end", "outcome"])
+
+FAULTS = ("error", "exception", "disconnect", "slow")
+
+# 지금 실행 중인 폴링 주기 번호 (폴링 태스크 안에서만 설정 - 하트비트/쓰기 요청은 None)
+current_cycle = contextvars.ContextVar("current_cycle", default=None)
+
+
+class _VirtualSelector:
+    """실제 셀렉터를 감싸 대기 시간만큼 가상 시계를 앞으로 옮김 (자기 파이프 등 실제 I/O 는 그대로 확인)"""
+    def __init__(self, loop):
+        self.loop = loop
+        self.selector = selectors.DefaultSelector()
+
+    def select(self, timeout=None):
+        events = self.selector.select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # 예약된 타이머도 준비된 콜백도 없음 - 가상 시간에서는 영원히 기다리게 됨
+            raise RuntimeError("가상 시간 교착: 기다릴 타이머가 없습니다")
+        self.loop.advance(timeout)
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self.selector, name)
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """가상 시계 이벤트 루프 - loop.time() 은 가상 시각, sleep/call_later/요청별 wait_for 시간 제한은 즉시 다음 타이머로 이동"""
+    def __init__(self, start=0.0):
+        self._virtual_time = start
+        super().__init__(_VirtualSelector(self))
+
+    def time(self):
+        return self._virtual_time
+
+    def advance(self, seconds):
+        self._virtual_time += seconds
+
+
+class _Response:
+    """pymodbus 응답 대용"""
+    def __init__(self, registers=None, bits=None, error=False):
+        self.registers = registers or []
+        self.bits = bits or []
+        self.error = error
+
+    def isError(self):
+        return self.error
+
+
+class _Fault:
+    def __init__(self, start, end, kind, ops=None, addresses=None, latency=None):
+        if kind not in FAULTS:
+            raise ValueError(f"알 수 없는 장애 종류: {kind}")
+        self.start = start
+        self.end = end
+        self.kind = kind
+        self.ops = set(ops) if ops else None
+        self.addresses = set(addresses) if addresses else None
+        self.latency = latency
+
+    def matches(self, t, op, address):
+        return (self.start <= t < self.end
+                and (self.ops is None or op in self.ops)
+                and (self.addresses is None or address in self.addresses))
+
+
+class ScriptedModbusClient:
+    """스크립트대로 지연/실패하는 가짜 모드버스 클라이언트 (RobotMonitor(client=...) 로 주입)
+
+    latency: 요청 하나의 지연(초) 또는 (op, address, count, t) -> 초 함수
+    registers / coils / discretes / inputs: 주소 -> 값 (없는 주소는 0)
+    """
+    def __init__(self, loop, latency=0.005, registers=None, coils=None, discretes=None, inputs=None):
+        self.loop = loop
+        self.latency = latency
+        self.tables = {
+            "holding": dict(registers or {}),
+            "coil": dict(coils or {}),
+            "discrete": dict(discretes or {}),
+            "input": dict(inputs or {}),
+        }
+        self.faults = []
+        self.requests = []  # [Request, ...] 요청 순서대로
+        self._connected = False
+
+    # 스크립트 ------------------------------------------------------------
+    def fault(self, start, end, kind="exception", ops=None, addresses=None, latency=None):
+        """가상 시각 start~end 동안 장애 - error: 오류 응답, exception: 예외, disconnect: 연결 끊김,
+        slow: latency 초 지연 (ops/addresses 로 대상 요청 제한)"""
+        self.faults.append(_Fault(start, end, kind, ops, addresses, latency))
+
+    def schedule(self, t, values, source="holding"):
+        """가상 시각 t 에 장치 값 변경 {주소: 값}"""
+        self.loop.call_at(t, self.tables[source].update, values)
+
+    def _active_fault(self, t, op, address):
+        for fault in self.faults:
+            if fault.matches(t, op, address):
+                return fault
+        return None
+
+    @property
+    def connected(self):
+        if not self._connected:
+            return False
+        t = self.loop.time()
+        return not any(f.kind == "disconnect" and f.start <= t < f.end for f in self.faults)
+
+    # pymodbus 인터페이스 ----------------------------------------------------
+    async def connect(self):
+        self._connected = True
+        return True
+
+    async def close(self):
+        self._connected = False
+
+    async def _request(self, op, address, count, respond):
+        start = self.loop.time()
+        cycle = current_cycle.get()
+        fault = self._active_fault(start, op, address)
+        if fault is not None and fault.kind == "slow":
+            latency = fault.latency
+        elif callable(self.latency):
+            latency = self.latency(op, address, count, start)
+        else:
+            latency = self.latency
+        outcome = "cancelled"
+        try:
+            if not self.connected or (fault is not None and fault.kind == "disconnect"):
+                outcome = "exception"
+                raise ConnectionError("가짜 장치 연결 끊김")
+            await asyncio.sleep(latency)
+            if fault is not None and fault.kind == "exception":
+                outcome = "exception"
+                raise ConnectionError(f"가짜 장치 응답 오류 ({op} {address})")
+            if fault is not None and fault.kind == "error":
+                outcome = "error"
+                return _Response(error=True)
+            outcome = "ok"
+            return respond()
+        finally:
+            self.requests.append(Request(start, self.loop.time(), op, address, count, cycle, outcome))
+
+    def _read(self, source, address, count):
+        table = self.tables[source]
+        values = [table.get(address + i, 0) for i in range(count)]
+        if source in ("coil", "discrete"):
+            # 실제 응답처럼 8의 배수로 채움
+            return _Response(bits=[bool(v) for v in values] + [False] * (-count % 8))
+        return _Response(registers=values)
+
+    async def read_holding_registers(self, address, count=1):
+        return await self._request("read_holding", address, count, lambda: self._read("holding", address, count))
+
+    async def read_input_registers(self, address, count=1):
+        return await self._request("read_input", address, count, lambda: self._read("input", address, count))
+
+    async def read_coils(self, address, count=1):
+        return await self._request("read_coil", address, count, lambda: self._read("coil", address, count))
+
+    async def read_discrete_inputs(self, address, count=1):
+        return await self._request("read_discrete", address, count, lambda: self._read("discrete", address, count))
+
+    def _write(self, source, values):
+        self.tables[source].update(values)
+        return _Response()
+
+    async def write_register(self, address, value):
+        return await self._request("write", address, 1, lambda: self._write("holding", {address: value}))
+
+    async def write_registers(self, address, values):
+        return await self._request("write_multiple", address, len(values),
+                                   lambda: self._write("holding", dict(enumerate(values, address))))
+
+    async def write_coil(self, address, value):
+        return await self._request("write_coil", address, 1, lambda: self._write("coil", {address: int(value)}))
+
+
+class Simulation:
+    """MonitorThread 를 가상 시간 루프에서 스레드 없이 실행 (monitor_kwargs 는 MonitorThread 인자)"""
+    def __init__(self, latency=0.005, registers=None, start=0.0, **monitor_kwargs):
+        self.loop = VirtualClockLoop(start)
+        self.client = ScriptedModbusClient(self.loop, latency=latency, registers=registers)
+        self.thread = MonitorThread("simulation", client=self.client, **monitor_kwargs)
+        # QThread.run() 대신 직접 실행 - 하트비트/쓰기 예약이 이 루프를 사용하도록
+        self.thread._loop = self.loop
+        self.thread.poller.clock = self.loop.time
+        self.logs = []  # [(가상 시각, 로그)]
+        self.thread.log_signal.connect(lambda msg: self.logs.append((self.loop.time(), msg)))
+        self.cycles = []  # [Cycle, ...]
+        self.heartbeat_started = None  # 하트비트를 켠 가상 시각 (누락 확인의 첫 기준점)
+        self._wrap_poll_once()
+        self.task = None
+
+    def _wrap_poll_once(self):
+        """폴링 주기마다 번호를 붙여 그 주기에서 나간 요청을 구분"""
+        poll_once = self.thread.poller.poll_once
+
+        async def numbered_poll_once(*args, **kwargs):
+            index = len(self.cycles)
+            started = self.loop.time()
+            token = current_cycle.set(index)
+            outcome = "error"
+            try:
+                result = await poll_once(*args, **kwargs)
+                outcome = self.thread.poller.last_status.state
+                return result
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                current_cycle.reset(token)
+                self.cycles.append(Cycle(index, started, self.loop.time(), outcome))
+
+        self.thread.poller.poll_once = numbered_poll_once
+
+    @property
+    def now(self):
+        return self.loop.time()
+
+    def at(self, t, callback, *args):
+        """가상 시각 t 에 호출 (예: sim.at(60, sim.thread.reset_registers))"""
+        self.loop.call_at(t, callback, *args)
+
+    def start(self):
+        """모니터 태스크 시작 (연결까지 진행)"""
+        if self.task is None:
+            self.task = self.loop.create_task(self.thread.run_monitor())
+            self.loop.run_until_complete(asyncio.sleep(0))
+
+    def set_heartbeat(self, active):
+        """하트비트 켜기/끄기 - GUI 처럼 모니터가 연결된 뒤에 첫 전송"""
+        self.start()
+        if active and not self.thread.engine.heartbeat_active:
+            self.heartbeat_started = self.now
+        self.thread.set_heartbeat(active)
+
+    def run(self, seconds):
+        """가상 시간으로 seconds 초 진행 - 실제 걸린 시간(초) 반환"""
+        started = time.perf_counter()
+        self.start()
+        self.loop.run_until_complete(asyncio.sleep(seconds))
+        if self.task.done() and not self.task.cancelled() and self.task.exception():
+            raise self.task.exception()
+        return time.perf_counter() - started
+
+    def close(self):
+        """모니터 루프를 멈추고 남은 태스크 정리"""
+        self.thread.engine.heartbeat_active = False
+        self.thread._running = False
+        if self.task is not None:
+            self.loop.run_until_complete(asyncio.wait([self.task], timeout=5.0))
+        self.loop.run_until_complete(self.thread.cleanup())
+        pending = [task for task in asyncio.all_tasks(self.loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.close()
+
+    # 확인 ----------------------------------------------------------------
+    def heartbeat_writes(self):
+        """성공한 하트비트 쓰기 시각 목록"""
+        return [r.end for r in self.client.requests
+                if r.op == "write" and r.address == HEARTBEAT_REGISTER and r.outcome == "ok"]
+
+    def heartbeat_outages(self):
+        """하트비트 쓰기가 성공할 수 없는 스크립트 장애 구간 [(시작, 끝)]"""
+        return [(f.start, f.end) for f in self.client.faults
+                if f.kind in ("disconnect", "exception", "error")
+                and (f.ops is None or f.ops & {"read_holding", "write"})
+                and (f.addresses is None or HEARTBEAT_REGISTER in f.addresses)]
+
+    def missed_heartbeats(self, max_gap=1.0, until=None, excuse_outages=True):
+        """하트비트 쓰기 간격이 max_gap 초를 넘은 구간 [(이전 쓰기 시각, 간격)]
+
+        하트비트를 켠 시각(heartbeat_started)부터 첫 쓰기까지도 간격으로 보므로 쓰기가 한 번도 없으면 누락
+        until 을 주면 마지막 쓰기부터 until 까지도 간격으로 봄 (마지막에 멈춘 경우)
+        excuse_outages 면 장애 구간에 걸친 간격은, 장애가 끝난 뒤 재시도 간격(HEARTBEAT_RETRY) + max_gap
+        안에 하트비트가 다시 나갔을 때만 허용 (재연결 후 재예약이 안 되면 여전히 누락)
+        """
+        writes = self.heartbeat_writes()
+        if self.heartbeat_started is not None:
+            writes = [self.heartbeat_started] + [t for t in writes if t >= self.heartbeat_started]
+        if until is not None:
+            writes = writes + [until]
+        outages = self.heartbeat_outages() if excuse_outages else []
+        missed = []
+        for a, b in zip(writes, writes[1:]):
+            if b - a <= max_gap:
+                continue
+            if any(start - max_gap <= a and b <= end + HEARTBEAT_RETRY + max_gap and a < end
+                   for start, end in outages):
+                continue
+            missed.append((a, b - a))
+        return missed
+
+    def duplicate_reads(self):
+        """한 폴링 주기 안에서 두 번 이상 나간 같은 읽기 {주기 번호: [(op, 주소, 개수, 횟수)]}"""
+        by_cycle = {}
+        for r in self.client.requests:
+            if r.cycle is not None and r.op.startswith("read"):
+                by_cycle.setdefault(r.cycle, Counter())[(r.op, r.address, r.count)] += 1
+        return {cycle: [(*key, n) for key, n in counts.items() if n > 1]
+                for cycle, counts in by_cycle.items() if any(n > 1 for n in counts.values())}
+
+    def summary(self):
+        outcomes = Counter(r.outcome for r in self.client.requests)
+        cycle_outcomes = Counter(c.outcome for c in self.cycles)
+        writes = self.heartbeat_writes()
+        gaps = [b - a for a, b in zip(writes, writes[1:])]
+        return {
+            "virtual_seconds": self.now,
+            "requests": len(self.client.requests),
+            "request_outcomes": dict(outcomes),
+            "cycles": len(self.cycles),
+            "cycle_outcomes": dict(cycle_outcomes),
+            "heartbeats": len(writes),
+            "heartbeat_max_gap": max(gaps) if gaps else 0.0,
+            "duplicate_read_cycles": len(self.duplicate_reads()),
+            "logs": len(self.logs),
+        }
+
+    def assert_healthy(self, max_heartbeat_gap=1.0, allow_cancelled=True, excuse_outages=True):
+        """하트비트 누락, 완료된 폴링 주기 없음, 주기 내 중복 읽기 (allow_cancelled=False 면 취소된 주기도) 가 있으면 AssertionError
+
+        스크립트 장애 구간의 하트비트 공백은 장애가 끝난 뒤 곧바로 다시 나가면 허용 (missed_heartbeats 참고)
+        """
+        problems = []
+        # 하트비트가 켜져 있으면 마지막 쓰기 이후 멈춘 구간도 누락으로 봄
+        until = self.now if self.thread.engine.heartbeat_active else None
+        missed = self.missed_heartbeats(max_heartbeat_gap, until, excuse_outages)
+        if missed:
+            t, gap = missed[0]
+            if not self.heartbeat_writes():
+                problems.append(f"하트비트 쓰기 없음 ({t:.3f}s 부터 {gap:.3f}s 동안)")
+            else:
+                problems.append(f"하트비트 누락 {len(missed)}회 (처음: {t:.3f}s 부터 {gap:.3f}s)")
+        if not any(c.outcome == "complete" for c in self.cycles):
+            outcomes = dict(Counter(c.outcome for c in self.cycles))
+            problems.append(f"완료된 폴링 주기 없음 (주기 {len(self.cycles)}개: {outcomes})")
+        duplicates = self.duplicate_reads()
+        if duplicates:
+            cycle, reads = next(iter(duplicates.items()))
+            problems.append(f"중복 읽기 주기 {len(duplicates)}개 (처음: 주기 {cycle} {reads})")
+        if not allow_cancelled:
+            cancelled = [c for c in self.cycles if c.outcome == "cancelled"]
+            if cancelled:
+                problems.append(f"취소된 폴링 주기 {len(cancelled)}개 (처음: {cancelled[0].start:.3f}s)")
+        if problems:
+            raise AssertionError("; ".join(problems))
+
+
+def parse_fault(spec):
+    """'시작:끝:종류[:지연]' -> fault() 인자"""
+    parts = spec.split(":")
+    if len(parts) not in (3, 4):
+        raise ValueError(f"장애 형식은 시작:끝:종류[:지연] 입니다: {spec}")
+    latency = float(parts[3]) if len(parts) == 4 else None
+    return float(parts[0]), float(parts[1]), parts[2], latency
+
+
+def main():
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="가상 시간 폴링/하트비트 시뮬레이션")
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=5.0, help="요청 지연 ms")
+    parser.add_argument("--jitter", type=float, default=2.0, help="요청 지연 흔들림 ms (0~)")
+    parser.add_argument("--fault", action="append", default=[],
+                        help="시작:끝:종류[:지연] (초, 종류: error/exception/disconnect/slow)")
+    parser.add_argument("--changes", type=float, default=2.0, help="초당 장치 값 변경 수")
+    parser.add_argument("--reset-at", type=float, action="append", default=[], help="레지스터 초기화 요청 시각 (초)")
+    parser.add_argument("--request-timeout", type=float, default=REQUEST_TIMEOUT * 1000, help="폴링 읽기 요청 제한 시간 ms")
+    parser.add_argument("--write-timeout", type=float, default=WRITE_TIMEOUT * 1000, help="하트비트/쓰기 요청 제한 시간 ms")
+    parser.add_argument("--max-heartbeat-gap", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base, jitter = args.latency / 1000, args.jitter / 1000
+    sim = Simulation(latency=lambda op, address, count, t: base + rng.random() * jitter,
+                     request_timeout=args.request_timeout / 1000, write_timeout=args.write_timeout / 1000)
+    for spec in args.fault:
+        start, end, kind, latency = parse_fault(spec)
+        sim.client.fault(start, end, kind, latency=latency)
+    duration = args.hours * 3600
+    if args.changes > 0:
+        t = 0.0
+        while t < duration:
+            t += rng.expovariate(args.changes)
+            sim.client.schedule(t, {rng.randrange(129, 256): rng.randrange(1000)})
+    for t in args.reset_at:
+        sim.at(t, sim.thread.reset_registers)
+
+    sim.set_heartbeat(True)
+    elapsed = sim.run(duration)
+    summary = sim.summary()
+    summary["real_seconds"] = round(elapsed, 3)
+    try:
+        sim.assert_healthy(args.max_heartbeat_gap)
+        summary["healthy"] = True
+    except AssertionError as e:
+        summary["healthy"] = False
+        summary["problems"] = str(e)
+    sim.close()
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if not summary["healthy"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
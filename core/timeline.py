@@ -0,0 +1,138 @@
+"""
+스트림 간 타임라인 모듈
+소켓 메시지와 모드버스 변경을 같은 단조 나노초 시계(time.monotonic_ns)로 찍어
+하나의 시간순 타임라인으로 합침
+
+- 시각은 가능한 한 이른 지점에서 찍음: 소켓은 reader.read() 반환 직후,
+  모드버스는 블록 응답 수신 직후 (변경 비교/로그 처리 전)
+- 스트림마다 시간순 버퍼를 따로 두고(스트림별 기록자는 하나), 조회할 때만
+  heapq.merge 로 k-way 병합 - 기록 쪽은 append 한 번으로 끝남
+- window(t, ±50ms): 각 스트림에서 이분 탐색으로 구간만 잘라 병합
+"""
+import bisect
+import heapq
+import threading
+import time
+from collections import namedtuple
+from .poller import format_address
+
+WINDOW_NS = 50_000_000  # 기본 조회 구간 ±50ms
+
+TimelineEvent = namedtuple("TimelineEvent", ["t_ns", "stream", "payload"])
+
+now_ns = time.monotonic_ns
+
+
+class TimelineStream:
+    """스트림 하나의 시간순 이벤트 버퍼 (가득 차면 가장 오래된 이벤트부터 버림)
+
+    이분 탐색을 위해 시각과 이벤트를 리스트 두 개에 나란히 두고,
+    앞쪽 버린 부분은 offset 으로 건너뛰다가 capacity 만큼 쌓이면 한 번에 잘라냄
+    """
+    def __init__(self, name, capacity=100000):
+        self.name = name
+        self.capacity = capacity
+        self.times = []
+        self.events = []
+        self.offset = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.times) - self.offset
+
+    def append(self, t_ns, payload):
+        event = TimelineEvent(t_ns, self.name, payload)
+        with self.lock:
+            if self.times and t_ns < self.times[-1]:
+                # 응답 순서와 기록 순서가 다른 경우 (예: 주소순으로 정렬된 링 이벤트)
+                i = bisect.bisect_right(self.times, t_ns, self.offset)
+                self.times.insert(i, t_ns)
+                self.events.insert(i, event)
+            else:
+                self.times.append(t_ns)
+                self.events.append(event)
+            if len(self.times) - self.offset > self.capacity:
+                self.offset += 1
+                if self.offset >= self.capacity:
+                    del self.times[:self.offset]
+                    del self.events[:self.offset]
+                    self.offset = 0
+        return event
+
+    def slice(self, t0=None, t1=None):
+        """t0 <= 시각 <= t1 인 이벤트 목록 (None 이면 끝까지)"""
+        with self.lock:
+            lo = self.offset if t0 is None else bisect.bisect_left(self.times, t0, self.offset)
+            hi = len(self.times) if t1 is None else bisect.bisect_right(self.times, t1, lo)
+            return self.events[lo:hi]
+
+    def tail(self, count):
+        with self.lock:
+            return self.events[max(self.offset, len(self.events) - count):]
+
+    def clear(self):
+        with self.lock:
+            self.times = []
+            self.events = []
+            self.offset = 0
+
+
+class EventTimeline:
+    """스트림별 버퍼 모음 - 워커 스레드에서 기록, GUI 에서 병합 조회"""
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self.streams = {}
+        self._lock = threading.Lock()  # 스트림 생성만 보호
+        # 표시용 벽시계 변환 기준 (monotonic_ns 는 시스템 부팅 기준이라 프로세스 간에도 같은 시계)
+        self.anchor_wall_ns = time.time_ns()
+        self.anchor_ns = now_ns()
+
+    def stream(self, name):
+        stream = self.streams.get(name)
+        if stream is None:
+            with self._lock:
+                stream = self.streams.setdefault(name, TimelineStream(name, self.capacity))
+        return stream
+
+    def record(self, stream, payload, t_ns=None):
+        """이벤트 기록 - t_ns 는 수신 시점에 찍어 둔 monotonic_ns (없으면 지금)"""
+        return self.stream(stream).append(now_ns() if t_ns is None else t_ns, payload)
+
+    def merged(self, t0=None, t1=None, streams=None):
+        """t0~t1 구간의 모든 스트림 이벤트를 시간순으로 병합 (같은 시각이면 스트림 이름순)"""
+        names = sorted(self.streams) if streams is None else streams
+        slices = [self.streams[name].slice(t0, t1) for name in names if name in self.streams]
+        return heapq.merge(*slices, key=lambda event: event.t_ns)
+
+    def window(self, t_ns, before_ns=WINDOW_NS, after_ns=WINDOW_NS, streams=None):
+        """t_ns 앞뒤 구간에 일어난 이벤트 목록 - 이 시각 ±50ms 에 무슨 일이 있었나"""
+        return list(self.merged(t_ns - before_ns, t_ns + after_ns, streams))
+
+    def around(self, event, before_ns=WINDOW_NS, after_ns=WINDOW_NS, streams=None):
+        """이벤트 주변 구간 - [(기준 대비 ms, 이벤트)] (기준 이벤트 자신 포함)"""
+        return [((other.t_ns - event.t_ns) / 1e6, other)
+                for other in self.window(event.t_ns, before_ns, after_ns, streams)]
+
+    def latest(self, count):
+        """모든 스트림의 최근 이벤트 count 개 (오래된 순)"""
+        tails = [stream.tail(count) for stream in list(self.streams.values())]
+        return list(heapq.merge(*tails, key=lambda event: event.t_ns))[-count:]
+
+    def wall_time(self, t_ns):
+        """monotonic_ns -> 벽시계 초 (표시용)"""
+        return (self.anchor_wall_ns + t_ns - self.anchor_ns) / 1e9
+
+    def clear(self):
+        for stream in list(self.streams.values()):
+            stream.clear()
+
+
+def describe_event(event):
+    """타임라인 이벤트 한 줄 요약 (모드버스: 변경 묶음, 소켓: (상대, 메시지))"""
+    if event.stream == "modbus":
+        return ", ".join(f"{format_address(key)}={value}" for key, value in sorted(event.payload.items()))
+    if event.stream == "socket":
+        peer, message = event.payload
+        text = " ".join(message.split())
+        return f"{peer} {text[:120]}{'...' if len(text) > 120 else ''}"
+    return str(event.payload)
@@ -0,0 +1,216 @@
+"""
+트리거/알람 모듈
+레지스터 값과 비트 조건으로 이루어진 규칙을 주소 -> 규칙 색인으로 컴파일하고,
+주기마다 변경된 주소에 걸린 규칙만 평가 (에지 검출, 히스테리시스, 홀드오프)
+
+발생 시 변경 이력(history.ChangeHistory)에서 트리거 전/후 구간을 잘라
+오실로스코프처럼 캡처하고 CSV 로 저장
+
+규칙 파일 예시 (triggers.example.toml 참고):
+
+    [[trigger]]
+    name = "ready_drop_during_weld"
+    edge = "rising"      # rising (기본) / falling / both / level
+    hold_off = 2.0       # 재발생 최소 간격 (초)
+    pre = 2.0            # 트리거 전 캡처 구간 (초)
+    post = 1.0           # 트리거 후 캡처 구간 (초)
+    when = [
+        { address = 211, bit = 6, equals = 0 },
+        { address = 202, equals = 3 },
+    ]
+"""
+import csv
+import os
+import time
+from datetime import datetime
+from .history import ChangeHistory
+from .register_map import tomllib
+
+EDGES = ("rising", "falling", "both", "level")
+
+
+class Condition:
+    """주소 하나에 대한 조건 - bit/mask 로 값 일부만 비교할 수 있음
+
+    above/below 는 hysteresis 만큼 되돌아와야 거짓이 됨
+    """
+    def __init__(self, address, bit=None, mask=None, equals=None, not_equals=None,
+                 above=None, below=None, hysteresis=0):
+        if sum(op is not None for op in (equals, not_equals, above, below)) != 1:
+            raise ValueError(f"주소 {address}: equals/not_equals/above/below 중 하나만 지정하세요")
+        self.address = address
+        self.shift = bit if bit is not None else 0
+        self.mask = 1 if bit is not None else (mask if mask is not None else 0xFFFF)
+        self.equals = equals
+        self.not_equals = not_equals
+        self.above = above
+        self.below = below
+        self.hysteresis = hysteresis
+        self.state = False
+
+    def evaluate(self, value):
+        if value is None:
+            self.state = False
+            return False
+        value = (value >> self.shift) & self.mask
+
+        if self.equals is not None:
+            self.state = value == self.equals
+        elif self.not_equals is not None:
+            self.state = value != self.not_equals
+        elif self.above is not None:
+            threshold = self.above - self.hysteresis if self.state else self.above
+            self.state = value > threshold
+        else:
+            threshold = self.below + self.hysteresis if self.state else self.below
+            self.state = value < threshold
+        return self.state
+
+    def describe(self):
+        target = f"{self.address}" if self.mask == 0xFFFF else f"{self.address}[{self.shift}]"
+        for op, symbol in (("equals", "=="), ("not_equals", "!="), ("above", ">"), ("below", "<")):
+            if getattr(self, op) is not None:
+                return f"{target} {symbol} {getattr(self, op)}"
+
+
+class TriggerRule:
+    """조건들의 AND 와 발생 방식"""
+    def __init__(self, name, when, edge="rising", hold_off=0.0, pre=1.0, post=1.0):
+        if edge not in EDGES:
+            raise ValueError(f"트리거 {name}: edge 는 {', '.join(EDGES)} 중 하나")
+        if not when:
+            raise ValueError(f"트리거 {name}: 조건(when)이 없습니다")
+        self.name = name
+        self.conditions = [c if isinstance(c, Condition) else Condition(**c) for c in when]
+        self.edge = edge
+        self.hold_off = hold_off
+        self.pre = pre
+        self.post = post
+
+        self.state = None  # 첫 평가 전에는 에지 판단 안 함
+        self.last_fired = None
+
+    @property
+    def addresses(self):
+        return {c.address for c in self.conditions}
+
+    def evaluate(self, values, now):
+        """조건 재평가 후 이번에 발생했으면 True"""
+        # 히스테리시스 상태를 위해 모든 조건을 평가 (단락 평가 안 함)
+        results = [c.evaluate(values.get(c.address)) for c in self.conditions]
+        state = all(results)
+        previous, self.state = self.state, state
+
+        if self.edge == "level":
+            fired = state
+        elif previous is None:
+            fired = False
+        elif self.edge == "rising":
+            fired = state and not previous
+        elif self.edge == "falling":
+            fired = previous and not state
+        else:
+            fired = state != previous
+
+        if fired and self.last_fired is not None and now - self.last_fired < self.hold_off:
+            return False
+        if fired:
+            self.last_fired = now
+        return fired
+
+    def describe(self):
+        return " and ".join(c.describe() for c in self.conditions)
+
+
+class TriggerEvent:
+    """트리거 발생 기록 - post 구간이 지나면 캡처 완료"""
+    def __init__(self, rule, now, timestamp, values, pre_changes):
+        self.rule = rule
+        self.time = now  # monotonic
+        self.timestamp = timestamp  # 벽시계 (파일명, 표시용)
+        self.values = {addr: values.get(addr) for addr in rule.addresses}
+        self.pre_changes = pre_changes
+        self.post_changes = []
+        self.path = None
+
+    @property
+    def due(self):
+        return self.time + self.rule.post
+
+    def summary(self):
+        values = ", ".join(f"{addr}={value}" for addr, value in sorted(self.values.items()))
+        return f"[트리거] {self.rule.name} 발생 ({values})"
+
+    def save_csv(self, directory):
+        """캡처 구간을 CSV 로 저장 (트리거 시점 기준 상대 시각)"""
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.timestamp).strftime('%Y%m%d_%H%M%S_%f')[:-3]
+        self.path = os.path.join(directory, f"trigger_{self.rule.name}_{stamp}.csv")
+        with open(self.path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["offset_s", "address", "value"])
+            for at, addr, value in self.pre_changes + self.post_changes:
+                writer.writerow([f"{at - self.time:.3f}", addr, value])
+        return self.path
+
+
+class TriggerEngine:
+    """주소 -> 규칙 색인으로 변경된 주소의 규칙만 평가하는 트리거 엔진"""
+    def __init__(self, rules, history=None, capture_dir=None):
+        self.rules = list(rules)
+        self.history = history if history is not None else ChangeHistory()
+        self.capture_dir = capture_dir
+        self.pending = []  # post 구간을 기다리는 발생 기록
+
+        self.index = {}
+        for rule in self.rules:
+            for addr in rule.addresses:
+                self.index.setdefault(addr, []).append(rule)
+
+    def process(self, changes, values, now=None):
+        """한 주기 처리 - (이번에 발생한 TriggerEvent 목록, 캡처가 끝난 TriggerEvent 목록)
+
+        values 는 모든 주소의 현재 값 (changes 가 이미 반영된 상태)
+        """
+        now = time.monotonic() if now is None else now
+        self.history.record(changes, now)
+
+        fired = []
+        if changes:
+            touched = []
+            seen = set()
+            for addr in changes:
+                for rule in self.index.get(addr, ()):
+                    if id(rule) not in seen:
+                        seen.add(id(rule))
+                        touched.append(rule)
+            for rule in touched:
+                if rule.evaluate(values, now):
+                    pre = self.history.window(now - rule.pre, now)
+                    event = TriggerEvent(rule, now, time.time(), values, pre)
+                    fired.append(event)
+                    self.pending.append(event)
+
+        return fired, self.collect(now)
+
+    def collect(self, now=None):
+        """post 구간이 지난 캡처 마무리 (저장 경로가 있으면 CSV 저장)"""
+        now = time.monotonic() if now is None else now
+        completed = [event for event in self.pending if event.due <= now]
+        if not completed:
+            return []
+        self.pending = [event for event in self.pending if event.due > now]
+        for event in completed:
+            event.post_changes = self.history.window(event.time, event.due)
+            if self.capture_dir:
+                event.save_csv(self.capture_dir)
+        return completed
+
+
+def load_triggers(path):
+    """TOML 규칙 파일 로드 -> TriggerRule 목록"""
+    if tomllib is None:
+        raise RuntimeError("TOML 파서가 없습니다 (Python 3.11+ 또는 pip install tomli)")
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    return [TriggerRule(**entry) for entry in data.get("trigger", [])]
@@ -1,22 +1,150 @@
 import sys
 import os
+import asyncio
 from PyQt5.QtWidgets import QTabWidget, QApplication, QMainWindow, QWidget, QHBoxLayout
 
+# --profile 은 슬롯 데코레이터가 적용되기 전(모듈 import 전)에 환경 변수로 전달
+if "--profile" in sys.argv:
+    sys.argv.remove("--profile")
+    os.environ["MODBUS_MONITOR_PROFILE"] = "1"
+
 # 패키지 모듈 가져오기
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 __package__ = 'modbus_monitoring'
-from .widgets import RegisterDisplayWidget, LogWidget
-from .core import MonitorThread
-from .socket import SocketLogWidget
+from .widgets import RegisterDisplayWidget, LogWidget, StatsWidget, SignalBacklogProbe, HeatmapWidget, TrendWidget, CycleWidget, TimelineWidget
+from .core import MonitorThread, ProcessMonitor
+from .core.event_loop import SharedLoopThread, create_qt_event_loop, LOOP_MODES
+from .core.metrics import metrics, start_http_server
+from .core.profiling import profiler
+from .core.register_map import load_register_map
+from .core.triggers import load_triggers
+from .core.cycles import load_cycles
+from .core.filters import load_filters
+from .core.poller import parse_sources
+from .core.discovery import load_discovered
+from .core.log_index import LogIndex
+from .socket import SocketLogWidget, ParsePool
+
+# asyncio 루프 실행 모드: "thread"(기본, 스레드별 루프), "shared"(공유 워커 루프), "qt"(qasync 통합 루프)
+LOOP_MODE = os.environ.get("MODBUS_MONITOR_LOOP", "thread")
+# 모드버스 수집 위치: "thread"(기본, GUI 프로세스 내 스레드), "process"(별도 프로세스 + 공유 메모리)
+ACQUISITION_MODE = os.environ.get("MODBUS_MONITOR_ACQUISITION", "thread")
+# 변경 스트림 재게시 주소: "127.0.0.1:15020" 또는 "unix:/tmp/modbus_monitor.sock" (비우면 사용 안 함)
+PUBLISH_ADDRESS = os.environ.get("MODBUS_MONITOR_PUBLISH", "")
+# 폴링 스냅샷을 제공하는 로컬 모드버스 TCP 서버 주소: "0.0.0.0:5020" (비우면 사용 안 함)
+SERVE_ADDRESS = os.environ.get("MODBUS_MONITOR_SERVE", "")
+# 계측: "on" 이면 통계 탭만, 포트 번호면 통계 탭 + Prometheus 엔드포인트 (비우면 사용 안 함)
+METRICS_OPTION = os.environ.get("MODBUS_MONITOR_METRICS", "")
+# 레지스터 맵 TOML 파일 경로 (비우면 원본 값만 표시, 예시: register_map.example.toml)
+REGISTER_MAP_PATH = os.environ.get("MODBUS_MONITOR_REGISTER_MAP", "")
+# 트리거 규칙 TOML 파일 경로와 캡처 저장 폴더 (예시: triggers.example.toml)
+TRIGGERS_PATH = os.environ.get("MODBUS_MONITOR_TRIGGERS", "")
+CAPTURE_DIR = os.environ.get("MODBUS_MONITOR_CAPTURE_DIR", "captures")
+# 사이클 정의 TOML 파일 경로 (비우면 202 != 0 구간을 용접 사이클로 봄, 예시: cycles.example.toml)
+CYCLES_PATH = os.environ.get("MODBUS_MONITOR_CYCLES", "")
+# 변경 필터 TOML 파일 경로 ([[filter]] 표, 레지스터 맵 파일과 같은 파일이어도 됨)
+FILTERS_PATH = os.environ.get("MODBUS_MONITOR_FILTERS", "")
+# 적응형 폴링: "on" 또는 "최소주기,최대주기,초당요청예산[,주소=유휴값...]" 예: "0.05,0.5,20,202=0" (비우면 고정 주기)
+ADAPTIVE_OPTION = os.environ.get("MODBUS_MONITOR_ADAPTIVE", "")
+# 소켓 원본 수신 캡처 폴더 (비우면 캡처 안 함, 재생: python -m modbus_monitoring.socket.capture)
+SOCKET_CAPTURE_DIR = os.environ.get("MODBUS_MONITOR_SOCKET_CAPTURE", "")
+# 포즈 파싱 워커 풀: "종류[,작업자 수[,포화 정책]]" 예: "process,4,drop" ("inline" 이면 소켓 루프에서 바로 파싱)
+SOCKET_PARSE_OPTION = os.environ.get("MODBUS_MONITOR_SOCKET_PARSE", "thread")
+# 추가 폴링 소스: "coil:0-31,discrete:0-15,input:100-109" 또는 주소 탐색 결과 파일(.toml) (비우면 홀딩 레지스터만)
+SOURCES_OPTION = os.environ.get("MODBUS_MONITOR_SOURCES", "")
+# 모드버스 요청별 제한 시간(초): "폴링 읽기[,하트비트·쓰기]" 예: "0.5,1.0" (비우면 기본값, "off" 면 제한 없음)
+TIMEOUT_OPTION = os.environ.get("MODBUS_MONITOR_TIMEOUT", "")
+# 로그 검색 색인: 전체 로그 본문을 보관할 폴더 (비우면 시스템 임시 폴더, "off" 면 검색 막대 없이 기존 로그 창만)
+LOG_DIR = os.environ.get("MODBUS_MONITOR_LOG_DIR", "")
+
+
+def parse_listen_address(address):
+    """"호스트:포트" 또는 "unix:경로" 를 서버 인자로 변환"""
+    if not address:
+        return None
+    if address.startswith("unix:"):
+        return {"path": address[5:]}
+    host, _, port = address.rpartition(":")
+    return {"host": host or "127.0.0.1", "port": int(port)}
+
+def parse_adaptive_option(option):
+    """적응형 폴링 옵션을 AdaptiveRate 인자로 변환"""
+    if not option:
+        return None
+    if option == "on":
+        return {}
+    adaptive = {}
+    numbers = []
+    active_when = {}
+    for token in option.split(","):
+        token = token.strip()
+        if "=" in token:
+            addr, _, idle = token.partition("=")
+            active_when[int(addr)] = int(idle)
+        elif token:
+            numbers.append(float(token))
+    for key, value in zip(("min_interval", "max_interval", "budget"), numbers):
+        adaptive[key] = value
+    if active_when:
+        adaptive["active_when"] = active_when
+    return adaptive
+
+def parse_timeout_option(option):
+    """요청 제한 시간 옵션을 {"request_timeout", "write_timeout"} 인자로 변환 (비우면 기본값)"""
+    if not option:
+        return {}
+    if option == "off":
+        return {"request_timeout": None, "write_timeout": None}
+    timeouts = {}
+    for key, token in zip(("request_timeout", "write_timeout"), option.split(",")):
+        if token.strip():
+            seconds = float(token)
+            if seconds <= 0:
+                raise ValueError(option)
+            timeouts[key] = seconds
+    return timeouts
+
+def parse_socket_parse_option(option):
+    """포즈 파싱 풀 옵션을 ParsePool 인자로 변환 (inline 이면 None)"""
+    if not option or option == "inline":
+        return None
+    kind, *rest = [token.strip() for token in option.split(",")]
+    pool = {"kind": kind}
+    if rest and rest[0]:
+        pool["workers"] = int(rest[0])
+    if len(rest) > 1 and rest[1]:
+        pool["policy"] = rest[1]
+    ParsePool(**pool)  # 인자 검증 (실제 풀은 소켓 서버 시작 시 생성)
+    return pool
+
+def parse_sources_option(option):
+    """추가 폴링 소스 옵션을 [(소스, 시작, 개수)] 로 변환 - 탐색 결과 파일이면 코일/디스크리트/입력 구간 사용"""
+    if not option:
+        return None
+    if option.endswith(".toml"):
+        discovered = load_discovered(option)
+        return [(source, start, count)
+                for source in ("coil", "discrete", "input") if source in discovered
+                for start, count in discovered[source]["poll"]]
+    return parse_sources(option)
 
 class MainWindow(QMainWindow):
 
-    def __init__(self):
+    def __init__(self, loop=None, loop_mode=LOOP_MODE):
         # 로봇 ip 입력
         self.robot_address = "192.168.1.7"  # real robot
         # self.robot_address = "192.168.225.178" # wsl robot
         
         super().__init__()
+
+        # 공유 asyncio 루프 (None 이면 각 스레드가 자체 루프 사용)
+        self.loop = loop
+        self.loop_thread = None
+        if self.loop is None and loop_mode in ("shared", "qt"):
+            self.loop_thread = SharedLoopThread()
+            self.loop_thread.start()
+            self.loop = self.loop_thread.loop
+
         self.setWindowTitle("Modbus & Socket Monitoring")
         self.setGeometry(100, 100, 1000, 600)
         
@@ -34,11 +162,113 @@ class MainWindow(QMainWindow):
         self.modbus_tab = QWidget()
         self.modbus_layout = QHBoxLayout()
         
-        # 모니터링 스레드 생성
-        self.monitor_thread = MonitorThread(host=self.robot_address)
+        # 레지스터 맵 로드 (오류 시 원본 값만 표시)
+        register_map = None
+        load_errors = []
+        if REGISTER_MAP_PATH:
+            try:
+                register_map = load_register_map(REGISTER_MAP_PATH)
+            except Exception as e:
+                load_errors.append(f"레지스터 맵 로드 실패 ({REGISTER_MAP_PATH}): {str(e)}")
+
+        # 트리거 규칙 로드
+        triggers = None
+        if TRIGGERS_PATH:
+            try:
+                triggers = load_triggers(TRIGGERS_PATH)
+            except Exception as e:
+                load_errors.append(f"트리거 규칙 로드 실패 ({TRIGGERS_PATH}): {str(e)}")
+
+        # 사이클 정의 로드 (오류 시 기본 정의)
+        cycles = None
+        if CYCLES_PATH:
+            try:
+                cycles = load_cycles(CYCLES_PATH)
+            except Exception as e:
+                load_errors.append(f"사이클 정의 로드 실패 ({CYCLES_PATH}): {str(e)}")
+
+        # 변경 필터 로드
+        filters = None
+        if FILTERS_PATH:
+            try:
+                filters = load_filters(FILTERS_PATH)
+            except Exception as e:
+                load_errors.append(f"변경 필터 로드 실패 ({FILTERS_PATH}): {str(e)}")
+
+        # 적응형 폴링 옵션
+        adaptive = None
+        try:
+            adaptive = parse_adaptive_option(ADAPTIVE_OPTION)
+        except ValueError:
+            load_errors.append(f"적응형 폴링 옵션 오류: {ADAPTIVE_OPTION}")
+
+        # 추가 폴링 소스 (FC1/FC2/FC4)
+        sources = None
+        try:
+            sources = parse_sources_option(SOURCES_OPTION)
+        except Exception as e:
+            load_errors.append(f"폴링 소스 옵션 오류 ({SOURCES_OPTION}): {str(e)}")
+
+        # 요청별 제한 시간 옵션
+        timeouts = {}
+        try:
+            timeouts = parse_timeout_option(TIMEOUT_OPTION)
+        except ValueError:
+            load_errors.append(f"요청 제한 시간 옵션 오류: {TIMEOUT_OPTION}")
+
+        # 포즈 파싱 풀 옵션
+        parse_pool = None
+        try:
+            parse_pool = parse_socket_parse_option(SOCKET_PARSE_OPTION)
+        except ValueError:
+            load_errors.append(f"포즈 파싱 풀 옵션 오류: {SOCKET_PARSE_OPTION}")
+
+        # 로그 검색 색인 (모드버스/소켓 탭 공유, 종료 시 보관 파일 삭제)
+        self.log_index = None
+        if LOG_DIR != "off":
+            try:
+                self.log_index = LogIndex(spill_dir=LOG_DIR or None)
+            except OSError as e:
+                load_errors.append(f"로그 색인 파일 생성 실패 ({LOG_DIR}): {str(e)}")
+
+        # 모니터링 스레드 생성 (process 모드면 별도 수집 프로세스)
+        if ACQUISITION_MODE == "process":
+            # 재게시/로컬 서버/폴링 계측은 RobotMonitor 루프에 붙어 있어 수집 프로세스에는 전달되지 않음
+            unsupported = [name for name, value in (("MODBUS_MONITOR_PUBLISH", PUBLISH_ADDRESS),
+                                                    ("MODBUS_MONITOR_SERVE", SERVE_ADDRESS)) if value]
+            if unsupported:
+                load_errors.append(f"수집 프로세스 모드에서는 {', '.join(unsupported)} 를 지원하지 않아 무시합니다.")
+            if METRICS_OPTION:
+                load_errors.append("수집 프로세스 모드에서는 폴링 계측(modbus_*)이 수집되지 않고 GUI 쪽 계측만 표시됩니다.")
+            self.monitor_thread = ProcessMonitor(
+                host=self.robot_address,
+                register_map=register_map,
+                triggers=triggers,
+                capture_dir=CAPTURE_DIR,
+                adaptive=adaptive,
+                filters=filters,
+                sources=sources,
+                cycles=cycles,
+                **timeouts
+            )
+        else:
+            self.monitor_thread = MonitorThread(
+                host=self.robot_address,
+                loop=self.loop,
+                publish=parse_listen_address(PUBLISH_ADDRESS),
+                serve=parse_listen_address(SERVE_ADDRESS),
+                register_map=register_map,
+                triggers=triggers,
+                capture_dir=CAPTURE_DIR,
+                adaptive=adaptive,
+                filters=filters,
+                sources=sources,
+                cycles=cycles,
+                **timeouts
+            )
         
         # LogWidget 생성
-        self.log_widget = LogWidget(self.monitor_thread)
+        self.log_widget = LogWidget(self.monitor_thread, log_index=self.log_index)
         
         # RegisterDisplayWidget 생성
         self.register_widget = RegisterDisplayWidget()
@@ -48,11 +278,24 @@ class MainWindow(QMainWindow):
         
         # 레지스터 업데이트 시그널 연결
         self.monitor_thread.register_update_signal.connect(self.register_widget.update_register_value)
+
+        # 레지스터 맵 디코딩 값 표시
+        for error in load_errors:
+            self.log_widget.append_log(error)
+        if self.monitor_thread.decoder:
+            self.register_widget.set_decoder(self.monitor_thread.decoder)
+            self.monitor_thread.decoded_update_signal.connect(self.register_widget.update_decoded_values)
+            for field in self.monitor_thread.decoder.skipped:
+                self.log_widget.append_log(f"레지스터 맵 항목 {field.address}({field.name}) 는 스냅샷 범위(128-255) 밖이라 디코딩하지 않습니다.")
+        if triggers:
+            self.log_widget.append_log(f"트리거 규칙 {len(triggers)}개 로드")
+        if filters:
+            self.log_widget.append_log(f"변경 필터 {len(filters)}개 로드")
+        if sources:
+            self.log_widget.append_log("추가 폴링 소스: " + ", ".join(f"{s}:{a}-{a + n - 1}" for s, a, n in sources))
         
-        # 레지스터 추가 버튼 클릭 시그널 연결
-        self.register_widget.add_button.clicked.connect(
-            lambda: self.monitor_thread.add_monitored_register(self.register_widget.register_spinbox.value())
-        )
+        # 레지스터 추가 콜백 (구간 추가 시 주소 목록으로 한 번 호출)
+        self.register_widget.on_registers_added = self.monitor_thread.add_monitored_registers
 
         # 레지스터 값 쓰기 시그널 연결 (새로 추가)
         self.register_widget.register_write_signal.connect(
@@ -60,7 +303,7 @@ class MainWindow(QMainWindow):
         )
 
         # 레지스터 삭제 후 재추가 콜백
-        self.register_widget.on_register_removed = self.monitor_thread.remove_monitored_register
+        self.register_widget.on_registers_removed = self.monitor_thread.remove_monitored_registers
 
         # 레이아웃에 위젯 추가
         self.modbus_layout.addWidget(self.log_widget, 2)  # 로그 위젯 (비율 2)
@@ -68,11 +311,34 @@ class MainWindow(QMainWindow):
         self.modbus_tab.setLayout(self.modbus_layout)
 
         # 소켓 모니터링 탭
-        self.socket_log_widget = SocketLogWidget()
+        self.socket_log_widget = SocketLogWidget(loop=self.loop, timeline=self.monitor_thread.timeline,
+                                                 capture_dir=SOCKET_CAPTURE_DIR or None, parse_pool=parse_pool,
+                                                 log_index=self.log_index)
 
         # 탭에 위젯 추가
         self.tab_widget.addTab(self.modbus_tab, "Modbus Monitoring")
         self.tab_widget.addTab(self.socket_log_widget, "Socket Monitoring")
+
+        # 주소별 변경 통계 히트맵 탭
+        self.heatmap_widget = HeatmapWidget(self.monitor_thread.address_stats)
+        self.tab_widget.addTab(self.heatmap_widget, "Heatmap")
+
+        # 사이클 시간 통계 탭
+        self.cycle_widget = CycleWidget(self.monitor_thread.cycle_analytics)
+        self.tab_widget.addTab(self.cycle_widget, "Cycles")
+
+        # 레지스터 트렌드 탭
+        self.trend_widget = TrendWidget(self.monitor_thread.trend_history)
+        self.tab_widget.addTab(self.trend_widget, "Trend")
+
+        # 소켓/모드버스 통합 타임라인 탭
+        self.timeline_widget = TimelineWidget(self.monitor_thread.timeline)
+        self.tab_widget.addTab(self.timeline_widget, "Timeline")
+
+        # 계측 탭 (활성화된 경우만)
+        self.metrics_server = None
+        if METRICS_OPTION:
+            self.setup_metrics(METRICS_OPTION)
         
         # 메인 레이아웃에 탭 위젯 추가
         self.main_layout.addWidget(self.tab_widget)
@@ -80,10 +346,9 @@ class MainWindow(QMainWindow):
         
         # MainWindow 생성자 내부
         # 출력할 레지스터 
+        self.register_widget.add_registers([202, 171, 172])
         for reg in [202, 171, 172]:
-            self.monitor_thread.add_monitored_register(reg)
-            self.register_widget.register_spinbox.setValue(reg)
-            self.register_widget.add_register_monitor()
+            self.trend_widget.add_register(reg)
         
         # 모니터 스레드 시작
         self.monitor_thread.start()
@@ -93,6 +358,27 @@ class MainWindow(QMainWindow):
             self.monitor_thread.set_heartbeat
         )
         
+    def setup_metrics(self, option):
+        """계측 활성화 - 통계 탭, 시그널 적체 계측, Prometheus 엔드포인트"""
+        metrics.enabled = True
+
+        http_address = None
+        if option.isdigit():
+            try:
+                self.metrics_server = start_http_server(int(option))
+                http_address = f"127.0.0.1:{option}"
+            except OSError as e:
+                self.log_widget.append_log(f"계측 HTTP 서버 시작 실패: {str(e)}")
+
+        # 기존 슬롯 연결 뒤에 붙여야 처리 완료 시점이 맞음
+        self.log_backlog_probe = SignalBacklogProbe("log", self)
+        self.log_backlog_probe.attach(self.monitor_thread.log_signal)
+        self.register_backlog_probe = SignalBacklogProbe("register_update", self)
+        self.register_backlog_probe.attach(self.monitor_thread.register_update_signal)
+
+        self.stats_widget = StatsWidget(http_address=http_address)
+        self.tab_widget.addTab(self.stats_widget, "Stats")
+
     def closeEvent(self, event):
         self.monitor_thread.stop()
         self.monitor_thread.wait()
@@ -100,15 +386,65 @@ class MainWindow(QMainWindow):
         # 소켓 스레드 종료 - 소켓 로그 위젯 내에서 관리하므로 여기서는 체크만 함
         if hasattr(self.socket_log_widget, 'socket_thread') and self.socket_log_widget.socket_thread:
             self.socket_log_widget.stop_socket_server()
+
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+
+        if self.log_index is not None:
+            self.log_index.close()
+
+        # 프로파일링 보고서 저장
+        if profiler.enabled:
+            profiler.stop()
+            try:
+                path = profiler.write_report()
+                print(f"프로파일링 보고서 저장: {path}")
+            except OSError as e:
+                print(f"프로파일링 보고서 저장 실패: {str(e)}")
+
+        # 공유 루프 스레드는 모든 태스크가 끝난 뒤 종료
+        if self.loop_thread:
+            self.loop_thread.stop()
+            self.loop_thread.wait()
         
         event.accept()
 
+    async def wait_pending_tasks(self, timeout=2.0):
+        """qt 모드 종료 시 공유 루프에 남은 태스크 대기"""
+        futures = [getattr(self.monitor_thread, '_main_future', None)]
+        socket_thread = getattr(self.socket_log_widget, 'socket_thread', None)
+        if socket_thread:
+            futures.append(socket_thread._main_future)
+
+        pending = [asyncio.wrap_future(f) for f in futures if f and not f.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
 
 def main():
     app = QApplication(sys.argv)
-    window = MainWindow()
+
+    # 프로파일링 (MODBUS_MONITOR_PROFILE=1 또는 --profile)
+    profiler.start()
+
+    if LOOP_MODE not in LOOP_MODES:
+        print(f"알 수 없는 루프 모드: {LOOP_MODE}, thread 모드로 실행합니다.")
+
+    # qt 모드: Qt 이벤트 루프와 통합된 asyncio 루프에서 모든 태스크 실행
+    loop = create_qt_event_loop(app) if LOOP_MODE == "qt" else None
+    if LOOP_MODE == "qt" and loop is None:
+        print("qasync 가 설치되지 않아 shared 모드로 실행합니다.")
+
+    window = MainWindow(loop=loop)
     window.show()
-    sys.exit(app.exec_())
+
+    if loop is None:
+        sys.exit(app.exec_())
+
+    with loop:
+        loop.run_forever()
+        # 창이 닫힌 뒤 남은 모니터/소켓 태스크가 끝날 때까지 루프 실행
+        loop.run_until_complete(window.wait_pending_tasks())
 
 
 if __name__ == "__main__":
@@ -4,7 +4,11 @@
 from .socket_server import SocketMonitorThread, SocketServer
 from .socket_widget import SocketLogWidget, SocketMonitorApp
 from .utils import PoseParser
+from .capture import SocketCapture, read_capture, replay, feed
+from .parse_pool import ParsePool
 
 __all__ = ['SocketMonitorThread','SocketServer',
            'SocketLogWidget','SocketMonitorApp',
-           'PoseParser']
\ No newline at end of file
+           'PoseParser',
+           'SocketCapture','read_capture','replay','feed',
+           'ParsePool']
\ No newline at end of file
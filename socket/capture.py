@@ -0,0 +1,216 @@
+"""
+소켓 원본 수신 캡처 / 재생 모듈
+프레이밍(process_buffer)과 포즈 파싱 버그는 TCP 가 스트림을 어디서 나눴는지에 따라 달라지므로,
+연결별로 받은 원본 바이트를 읽기 단위(조각 경계)와 monotonic_ns 시각 그대로 파일에 남기고 다시 흘려 보냄
+
+파일 형식 (리틀 엔디안):
+    헤더:   b"SOCKCAP1", 캡처 시작 벽시계 ns(int64), 캡처 시작 monotonic ns(int64)
+    레코드: 종류(uint8), 연결 번호(uint32), monotonic ns(int64), 길이(uint32), 데이터
+            종류 1 = 연결 (데이터: 상대 주소 utf-8), 2 = 수신 조각, 3 = 연결 종료
+
+재생:
+    python -m modbus_monitoring.socket.capture info capture.sockcap
+    python -m modbus_monitoring.socket.capture replay capture.sockcap --port 12345            # 원래 간격
+    python -m modbus_monitoring.socket.capture replay capture.sockcap --port 12345 --speed 10 # 10배속
+    python -m modbus_monitoring.socket.capture replay capture.sockcap --port 12345 --speed 0  # 최대 속도
+    python -m modbus_monitoring.socket.capture feed capture.sockcap   # TCP 없이 조각 경계 그대로 SocketServer 에 입력
+"""
+import asyncio
+import os
+import socket
+import struct
+import time
+from collections import namedtuple
+from datetime import datetime
+
+MAGIC = b"SOCKCAP1"
+CAPTURE_HEADER = struct.Struct('<8sqq')
+RECORD_HEADER = struct.Struct('<BIqI')
+
+OPEN, DATA, CLOSE = 1, 2, 3
+
+CaptureRecord = namedtuple("CaptureRecord", ["kind", "conn", "t_ns", "data"])
+
+
+class SocketCapture:
+    """연결별 수신 조각 기록기 (소켓 서버 루프에서만 호출)"""
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "wb", buffering=1 << 16)
+        self.file.write(CAPTURE_HEADER.pack(MAGIC, time.time_ns(), time.monotonic_ns()))
+        self.next_conn = 0
+        self.bytes = 0
+
+    @classmethod
+    def in_directory(cls, directory, prefix="socket"):
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return cls(os.path.join(directory, f"{prefix}_{stamp}.sockcap"))
+
+    def _write(self, kind, conn, t_ns, data=b""):
+        if self.file is None:
+            return
+        self.file.write(RECORD_HEADER.pack(kind, conn, t_ns, len(data)))
+        if data:
+            self.file.write(data)
+
+    def open_connection(self, peer, t_ns=None):
+        """새 연결 기록 - 연결 번호 반환"""
+        conn = self.next_conn
+        self.next_conn += 1
+        self._write(OPEN, conn, time.monotonic_ns() if t_ns is None else t_ns, peer.encode("utf-8"))
+        return conn
+
+    def data(self, conn, data, t_ns):
+        self.bytes += len(data)
+        self._write(DATA, conn, t_ns, data)
+
+    def close_connection(self, conn, t_ns=None):
+        self._write(CLOSE, conn, time.monotonic_ns() if t_ns is None else t_ns)
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_capture(path):
+    """캡처 파일 -> (시작 벽시계 ns, 시작 monotonic ns, [CaptureRecord, ...])
+
+    기록 중 끊긴 파일은 마지막 완전한 레코드까지만 읽음
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) < CAPTURE_HEADER.size:
+        raise ValueError(f"캡처 파일이 아닙니다: {path}")
+    magic, wall_ns, start_ns = CAPTURE_HEADER.unpack_from(raw, 0)
+    if magic != MAGIC:
+        raise ValueError(f"캡처 파일이 아닙니다: {path}")
+    records = []
+    offset = CAPTURE_HEADER.size
+    while offset + RECORD_HEADER.size <= len(raw):
+        kind, conn, t_ns, length = RECORD_HEADER.unpack_from(raw, offset)
+        offset += RECORD_HEADER.size
+        if offset + length > len(raw):
+            break
+        records.append(CaptureRecord(kind, conn, t_ns, raw[offset:offset + length]))
+        offset += length
+    return wall_ns, start_ns, records
+
+
+def summarize(path):
+    """캡처 요약 문자열"""
+    wall_ns, start_ns, records = read_capture(path)
+    chunks = [r for r in records if r.kind == DATA]
+    peers = {r.conn: r.data.decode("utf-8", errors="replace") for r in records if r.kind == OPEN}
+    duration = (records[-1].t_ns - start_ns) / 1e9 if records else 0.0
+    sizes = sorted(len(r.data) for r in chunks)
+    lines = [
+        f"{path}: {datetime.fromtimestamp(wall_ns / 1e9):%Y-%m-%d %H:%M:%S}, {duration:.1f}s",
+        f"연결 {len(peers)}개, 조각 {len(chunks)}개, {sum(sizes)} bytes",
+    ]
+    if sizes:
+        lines.append(f"조각 크기: 최소 {sizes[0]}, 중간 {sizes[len(sizes) // 2]}, 최대 {sizes[-1]}")
+    for conn, peer in sorted(peers.items()):
+        count = sum(1 for r in chunks if r.conn == conn)
+        lines.append(f"  #{conn} {peer}: 조각 {count}개")
+    return "\n".join(lines)
+
+
+async def replay(path, host="127.0.0.1", port=12345, speed=1.0, callback=print):
+    """캡처를 TCP 로 다시 보냄 - speed: 배속 (0 이면 기다리지 않고 최대 속도)
+
+    조각마다 TCP_NODELAY 로 바로 보내지만, 수신 측에서 커널이 조각을 합칠 수는 있음
+    (조각 경계를 정확히 재현하려면 feed() 사용)
+    """
+    _, start_ns, records = read_capture(path)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    writers = {}
+    sent = 0
+    try:
+        for record in records:
+            if speed:
+                delay = started + (record.t_ns - start_ns) / 1e9 / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if record.kind == OPEN:
+                _, writer = await asyncio.open_connection(host, port)
+                sock = writer.get_extra_info("socket")
+                if sock is not None:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                writers[record.conn] = writer
+            elif record.kind == DATA and record.conn in writers:
+                writer = writers[record.conn]
+                writer.write(record.data)
+                await writer.drain()
+                sent += len(record.data)
+            elif record.kind == CLOSE and record.conn in writers:
+                writer = writers.pop(record.conn)
+                writer.close()
+                await writer.wait_closed()
+    finally:
+        for writer in writers.values():
+            writer.close()
+    elapsed = loop.time() - started
+    callback(f"재생 완료: {sent} bytes, {elapsed:.2f}s")
+    return sent, elapsed
+
+
+def feed(path, server=None, callback=None):
+    """TCP 없이 캡처 조각을 경계 그대로 SocketServer.feed() 에 입력 (프레이밍/파싱 회귀 확인용)
+
+    반환: (콜백으로 나온 메시지 목록, 처리 시간 초)
+    """
+    from .socket_server import SocketServer
+
+    server = server or SocketServer()
+    messages = []
+    server.set_callback(callback or messages.append)
+    _, _, records = read_capture(path)
+    peers = {}
+    started = time.perf_counter()
+    for record in records:
+        if record.kind == OPEN:
+            peers[record.conn] = record.data.decode("utf-8", errors="replace")
+            server.buffers[peers[record.conn]] = ""  # handle_client 와 같이 연결마다 버퍼 초기화
+        elif record.kind == DATA:
+            server.feed(record.data, record.t_ns, peers.get(record.conn, "unknown"),
+                        (server.host, server.port))
+    return messages, time.perf_counter() - started
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="소켓 수신 캡처 요약 / 재생")
+    commands = parser.add_subparsers(dest="command", required=True)
+    info = commands.add_parser("info", help="캡처 요약")
+    info.add_argument("path")
+    play = commands.add_parser("replay", help="TCP 로 다시 보냄")
+    play.add_argument("path")
+    play.add_argument("--host", default="127.0.0.1")
+    play.add_argument("--port", type=int, default=12345)
+    play.add_argument("--speed", type=float, default=1.0, help="배속 (0 이면 최대 속도)")
+    offline = commands.add_parser("feed", help="TCP 없이 조각 경계 그대로 파서에 입력")
+    offline.add_argument("path")
+    offline.add_argument("--quiet", action="store_true", help="메시지 출력 없이 처리 시간만")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        print(summarize(args.path))
+    elif args.command == "replay":
+        asyncio.run(replay(args.path, args.host, args.port, args.speed))
+    else:
+        messages, elapsed = feed(args.path)
+        if not args.quiet:
+            for message in messages:
+                print(message)
+        print(f"메시지 {len(messages)}개, {elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
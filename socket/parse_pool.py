@@ -0,0 +1,159 @@
+"""
+포즈 파싱 워커 풀 모듈
+이벤트 루프는 바이트를 메시지로 나누고 넘기기만 하고, 무거운 포즈 파싱(literal_eval, 포맷팅)은
+제한된 스레드/프로세스 풀에서 실행. 결과는 연결별로 받은 순서 그대로 전달
+
+- 연결마다 대기열(deque)을 두고, 앞쪽 항목이 끝난 만큼만 꺼내 전달 (뒤 메시지가 먼저 끝나도 순서 유지)
+- 일반 텍스트 메시지도 같은 대기열을 거쳐 앞선 포즈 결과보다 먼저 나가지 않음
+- 풀이 가득 차면(처리 중 max_pending 개) 정책에 따라:
+    block:  그 연결의 읽기를 멈춤 (TCP 흐름 제어로 송신 측까지 전달) - 기본
+    drop:   새 포즈 메시지를 버리고 개수만 셈
+    inline: 루프에서 바로 파싱 (기존 동작, 과부하 시 모든 연결이 느려짐)
+"""
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+from .utils import parse_pose_message
+from ..core.metrics import metrics
+
+POLICIES = ("block", "drop", "inline")
+
+
+class _Entry:
+    """연결 대기열 항목 - 끝나면 done, 값은 파싱 결과 튜플 또는 이미 만들어진 문자열"""
+    __slots__ = ("done", "value")
+
+    def __init__(self, done=False, value=None):
+        self.done = done
+        self.value = value
+
+
+class ParsePool:
+    """제한된 포즈 파싱 풀 + 연결별 순서 보장 전달 (submit/push/deliver 는 모두 루프 스레드에서)"""
+    def __init__(self, kind="thread", workers=2, max_pending=64, policy="block"):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"알 수 없는 파싱 풀 종류: {kind}")
+        if policy not in POLICIES:
+            raise ValueError(f"알 수 없는 포화 정책: {policy}")
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.policy = policy
+        self.deliver = None  # 결과 전달 함수 (루프 스레드에서 호출)
+        self.executor = None
+        self.loop = None
+        self.queues = {}  # 연결 -> deque[_Entry]
+        self.pending = 0  # 풀에서 처리 중인 메시지 수
+        self.dropped = 0
+        self._ready = None  # 포화 해제 대기 이벤트
+        self._generation = 0  # shutdown 이후 도착한 이전 작업 결과 무시용
+
+    def start(self, loop):
+        """풀 생성 (소켓 서버 루프에서 호출)"""
+        self.loop = loop
+        self._ready = asyncio.Event()
+        self._ready.set()
+        if self.executor is None:
+            if self.kind == "process":
+                # Qt 스레드가 있는 프로세스에서 fork 하지 않도록 spawn 사용
+                self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            else:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="pose-parse")
+
+    @property
+    def saturated(self):
+        return self.pending >= self.max_pending
+
+    def submit(self, conn, message):
+        """포즈 메시지 파싱 요청 - 버렸으면 False"""
+        if self.saturated:
+            if self.policy == "drop":
+                self.dropped += 1
+                if metrics.enabled:
+                    metrics.inc("socket_parse_dropped_total")
+                return False
+            if self.policy == "inline":
+                self._append(conn, _Entry(True, parse_pose_message(message)))
+                return True
+
+        entry = _Entry()
+        self.queues.setdefault(conn, deque()).append(entry)
+        self.pending += 1
+        if self.saturated:
+            self._ready.clear()
+        if metrics.enabled:
+            metrics.set("socket_parse_pending", self.pending)
+        submitted = time.perf_counter()
+        try:
+            future = self.executor.submit(parse_pose_message, message)
+        except RuntimeError:
+            # 풀이 깨졌거나 종료됨 - 이 메시지는 루프에서 파싱
+            self.pending -= 1
+            entry.done, entry.value = True, parse_pose_message(message)
+            self._drain(conn)
+            return True
+        generation = self._generation
+        future.add_done_callback(lambda f: self._from_worker(generation, conn, entry, f, submitted))
+        return True
+
+    def push(self, conn, value):
+        """이미 만들어진 결과 (일반 텍스트) - 앞선 파싱이 끝난 뒤 전달"""
+        self._append(conn, _Entry(True, value))
+
+    def _append(self, conn, entry):
+        queue = self.queues.get(conn)
+        if not queue:
+            self.deliver(entry.value)
+        else:
+            queue.append(entry)
+
+    def _from_worker(self, generation, conn, entry, future, submitted):
+        """워커 스레드/풀 관리 스레드에서 호출 - 루프로 넘김"""
+        try:
+            self.loop.call_soon_threadsafe(self._complete, generation, conn, entry, future, submitted)
+        except RuntimeError:
+            pass  # 루프가 이미 닫힘
+
+    def _complete(self, generation, conn, entry, future, submitted):
+        if generation != self._generation:
+            return
+        entry.done = True
+        if future.cancelled():
+            entry.value = None
+        elif future.exception() is not None:
+            entry.value = (None, [f"포즈 파싱 작업 오류: {future.exception()}"], None, None)
+        else:
+            entry.value = future.result()
+        self.pending -= 1
+        if not self.saturated:
+            self._ready.set()
+        if metrics.enabled:
+            metrics.set("socket_parse_pending", self.pending)
+            metrics.observe("socket_parse_seconds", time.perf_counter() - submitted)
+        self._drain(conn)
+
+    def _drain(self, conn):
+        queue = self.queues.get(conn)
+        while queue and queue[0].done:
+            value = queue.popleft().value
+            if value is not None:
+                self.deliver(value)
+        if not queue:
+            self.queues.pop(conn, None)
+
+    async def wait_ready(self):
+        """block 정책에서 풀에 여유가 생길 때까지 대기"""
+        if self.policy == "block" and self.saturated:
+            await self._ready.wait()
+
+    def shutdown(self):
+        self._generation += 1
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.queues.clear()
+        self.pending = 0
+        if self._ready is not None:
+            self._ready.set()
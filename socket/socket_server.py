@@ -1,17 +1,32 @@
 import asyncio
+import time
 from datetime import datetime
 from PyQt5.QtCore import QThread, pyqtSignal
 from .utils import PoseParser
+from .capture import SocketCapture
+from .parse_pool import ParsePool
+from ..core.event_loop import wait_future
+from ..core.metrics import metrics
+from ..core.profiling import profiler
 
 class SocketServer:
-    def __init__(self, host='0.0.0.0', port=12345):
+    def __init__(self, host='0.0.0.0', port=12345, timeline=None, capture_dir=None, parse_pool=None):
         self.host = host
         self.port = port
+        self.timeline = timeline  # EventTimeline (모드버스 변경과 같은 시계로 메시지 기록)
+        self.capture_dir = capture_dir  # 원본 수신 캡처 폴더 (None 이면 캡처 안 함)
+        self.capture = None
         self.callback = None
         self.server = None
         self.running = True
-        self.buffer = ""  # 메시지 버퍼 추가
+        self.buffer = ""  # 메시지 버퍼 추가 (처리 중인 연결의 버퍼)
+        self.buffers = {}  # 연결별 미완성 메시지 버퍼 (동시 접속 클라이언트끼리 섞이지 않도록)
         self.pose_parser = PoseParser()  # 포즈 파서 추가
+        # 포즈 파싱 워커 풀 (None 이면 루프에서 바로 파싱)
+        self.parse_pool = parse_pool
+        if parse_pool is not None:
+            parse_pool.deliver = self._deliver
+        self._tasks = set()  # 이 서버가 만든 태스크 (서버 태스크 + 클라이언트 태스크)
         
     def set_callback(self, callback):
         """콜백 함수 설정"""
@@ -20,6 +35,9 @@ class SocketServer:
 
     async def start(self):
         """소켓 서버 시작"""
+        self._tasks.add(asyncio.current_task())
+        if self.parse_pool is not None:
+            self.parse_pool.start(asyncio.get_running_loop())
         self.server = await asyncio.start_server(
             self.handle_client, self.host, self.port
         )
@@ -27,50 +45,59 @@ class SocketServer:
         addr = self.server.sockets[0].getsockname()
         if self.callback:
             self.callback(f"Socket Server Started {addr[0]}:{addr[1]}")
+
+        if self.capture_dir:
+            self.capture = SocketCapture.in_directory(self.capture_dir)
+            if self.callback:
+                self.callback(f"소켓 수신 캡처: {self.capture.path}")
         
-        async with self.server:
-            await self.server.serve_forever()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            if self.capture:
+                self.capture.close()
             
     async def handle_client(self, reader, writer):
         """클라이언트 연결 처리"""
         addr = self.server.sockets[0].getsockname()
+
+        # 클라이언트별 계측/로그 라벨 (로그 검색의 상대 주소 필터도 이 값 사용)
+        peer = writer.get_extra_info('peername')
+        peer_label = f"{peer[0]}:{peer[1]}" if peer else "unknown"
         if self.callback:
-            self.callback(f"클라이언트 연결 수락: {addr[0]}:{addr[1]}")
+            self.callback(f"클라이언트 연결 수락: {peer_label}")
+
+        task = asyncio.current_task()
+        self._tasks.add(task)
             
         # 버퍼 초기화
-        self.buffer = ""
+        self.buffers[peer_label] = ""
+
+        # 원본 수신 캡처 (조각 경계 + 수신 시각)
+        conn = self.capture.open_connection(peer_label) if self.capture else None
 
         try:
             while self.running:
                 data = await reader.read(4096)
+                # 타임라인 시각은 읽기 직후에 찍음 (디코딩/파싱 시간 제외)
+                received_ns = time.monotonic_ns()
                 if not data:
                     break
-                    
-                timestamp = datetime.now().strftime('%H:%M:%S')
-                message = data.decode('utf-8', errors='replace')
 
-                # 버퍼에 추가
-                self.buffer += message
+                if self.capture:
+                    self.capture.data(conn, data, received_ns)
 
-                # 완전한 메시지 처리 (줄바꿈으로 구분)
-                messages = self.process_buffer()
-                
-                # 각 메시지 별로 콜백 호출
-                for message in messages:
-                    if self.callback:
-                        # A_로 시작하는 메시지는 별도 처리
-                        if message.startswith("A_"):
-                            parsed = self.pose_parser.parsing_poses(message)
-                            if parsed:
-                                # self.callback(f"[{timestamp}] {addr[0]}:{addr[1]} \n {message}")
-                                self.callback(parsed)
-                        else:
-                            self.callback(f"\n [{timestamp}] {addr[0]}:{addr[1]} \n {message}\n")
+                self.feed(data, received_ns, peer_label, addr)
+
+                # 파싱 풀이 가득 차면 풀릴 때까지 이 연결은 더 읽지 않음 (block 정책)
+                if self.parse_pool is not None:
+                    await self.parse_pool.wait_ready()
                         
                 # 잠시 대기 (CPU 사용량 감소)
                 await asyncio.sleep(0.01)    
 
-        except (ConnectionResetError, asyncio.CancelledError):
+        except (ConnectionResetError, asyncio.CancelledError) as e:
             if self.callback:
                 self.callback(f"연결 종료: {type(e).__name__} - {str(e)}")
 
@@ -79,10 +106,73 @@ class SocketServer:
                 self.callback(f"소켓 오류: {type(e).__name__} - {str(e)}")
                 
         finally:
+            self._tasks.discard(task)
+            self.buffers.pop(peer_label, None)
+            if self.capture:
+                self.capture.close_connection(conn)
             writer.close()
             await writer.wait_closed()
             if self.callback:
-                self.callback(f"클라이언트 연결 종료: {addr[0]}:{addr[1]}")
+                self.callback(f"클라이언트 연결 종료: {peer_label}")
+
+    def feed(self, data, received_ns, peer_label, addr):
+        """수신 조각 하나 처리 - 프레이밍, 타임라인 기록, 포즈 파싱, 콜백 (캡처 재생도 이 경로 사용)"""
+        if metrics.enabled:
+            metrics.inc("socket_bytes_total", len(data), peer=peer_label)
+            
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        message = data.decode('utf-8', errors='replace')
+
+        # 이 연결의 버퍼에 추가
+        self.buffer = self.buffers.get(peer_label, "") + message
+
+        # 완전한 메시지 처리 (줄바꿈으로 구분)
+        messages = self.process_buffer()
+        self.buffers[peer_label] = self.buffer
+        if messages and metrics.enabled:
+            metrics.inc("socket_frames_total", len(messages), peer=peer_label)
+
+        # 완성된 메시지는 마지막 조각을 읽은 시각으로 기록
+        if self.timeline is not None:
+            for message in messages:
+                self.timeline.record("socket", (peer_label, message), received_ns)
+        
+        # 각 메시지 별로 콜백 호출
+        for message in messages:
+            if self.callback:
+                # A_로 시작하는 메시지는 별도 처리
+                if message.startswith("A_"):
+                    if self.parse_pool is not None:
+                        # 파싱은 풀에서, 결과는 연결별 수신 순서대로 _deliver 로 전달
+                        self.parse_pool.submit(peer_label, message)
+                        continue
+                    parsed = self.pose_parser.parsing_poses(message)
+                    if parsed:
+                        # self.callback(f"[{timestamp}] {addr[0]}:{addr[1]} \n {message}")
+                        self.callback(parsed)
+                else:
+                    text = f"\n [{timestamp}] {peer_label} \n {message}\n"
+                    if self.parse_pool is not None:
+                        self.parse_pool.push(peer_label, text)
+                    else:
+                        self.callback(text)
+
+    def _deliver(self, value):
+        """파싱 풀 결과 전달 (루프 스레드) - 일반 텍스트는 문자열, 포즈는 parse_pose_message 반환값"""
+        if not self.callback:
+            return
+        if isinstance(value, str):
+            self.callback(value)
+            return
+        parsed, errors, prepos, touch = value
+        for error in errors:
+            self.callback(error)
+        if prepos:
+            self.pose_parser.prepos_data = prepos
+        if touch:
+            self.pose_parser.touch_data = touch
+        if parsed:
+            self.callback(parsed)
 
     def process_buffer(self):
         """버퍼에서 완전한 메시지 추출"""
@@ -112,34 +202,71 @@ class SocketServer:
         self.running = False
         if self.server:
             self.server.close()
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
 
-        # 현재 실행 중인 모든 태스크를 강제 취소
-        for task in asyncio.all_tasks(asyncio.get_event_loop()):
+        # 이 서버가 만든 태스크만 취소 (공유 루프의 다른 태스크는 유지)
+        for task in list(self._tasks):
             if task is not asyncio.current_task():
                 task.cancel()
+        self._tasks.clear()
 
 class SocketMonitorThread(QThread):
     log_signal = pyqtSignal(str)
     
-    def __init__(self, host='0.0.0.0', port=12345):
+    def __init__(self, host='0.0.0.0', port=12345, loop=None, timeline=None, capture_dir=None, parse_pool=None):
         super().__init__()
         self.host = host
         self.port = port
-        self.socket_server = SocketServer(host, port)
+        # parse_pool: ParsePool 인자 dict (None 이면 루프에서 바로 파싱)
+        self.socket_server = SocketServer(host, port, timeline=timeline, capture_dir=capture_dir,
+                                          parse_pool=ParsePool(**parse_pool) if parse_pool is not None else None)
         self.socket_server.set_callback(self.process_message)
         self._loop = None
+        self._shared_loop = loop  # 주어지면 공유 루프에서 태스크로 실행
+        self._main_future = None
         self._running = True
         self.server_started = True
+
+    def start(self):
+        """공유 루프가 있으면 스레드 대신 루프에 서버 태스크 예약"""
+        if self._shared_loop is None:
+            super().start()
+            return
+
+        self._loop = self._shared_loop
+        self._main_future = asyncio.run_coroutine_threadsafe(self.serve(), self._loop)
+
+    def isRunning(self):
+        if self._shared_loop is None:
+            return super().isRunning()
+        return self._main_future is not None and not self._main_future.done()
+
+    def wait(self, *args):
+        if self._shared_loop is None:
+            return super().wait(*args)
+        return wait_future(self._main_future, self._loop, *args)
+
+    def terminate(self):
+        if self._shared_loop is None:
+            super().terminate()
+        elif self._main_future:
+            self._main_future.cancel()
         
     def run(self):
         """쓰레드 시작 메서드"""
         # 새 이벤트 루프 생성
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
+        profiler.instrument_loop(self._loop, "socket")
         
         # 서버 시작
+        self._loop.run_until_complete(self.serve())
+
+    async def serve(self):
+        """서버 실행 (전용 스레드와 공유 루프 모두에서 사용)"""
         try:
-            self._loop.run_until_complete(self.socket_server.start())
+            await self.socket_server.start()
             
         except OSError as e:
             # 바인딩 오류 발생 시 로그에 메시지 전송
@@ -3,11 +3,25 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QH
                          QTextEdit, QPushButton, QLabel, QSpinBox, QFileDialog, QGroupBox,
                          QCheckBox, QLineEdit, QGridLayout)  # QGridLayout 추가
 from .socket_server import SocketMonitorThread
+from ..core.profiling import timed_slot
+from ..widgets.log_filter import LogFilterBar, LIVE_BLOCKS
 import socket
 
 class SocketLogWidget(QWidget):
-    def __init__(self):
+    def __init__(self, loop=None, timeline=None, capture_dir=None, parse_pool=None, log_index=None):
         super().__init__()
+
+        # 공유 asyncio 루프 (None 이면 소켓 스레드가 자체 루프 생성)
+        self.loop = loop
+
+        # 모드버스 변경과 함께 보는 타임라인 (None 이면 기록 안 함)
+        self.timeline = timeline
+
+        # 원본 수신 캡처 폴더 (None 이면 캡처 안 함, 서버 시작마다 새 파일)
+        self.capture_dir = capture_dir
+
+        # 포즈 파싱 워커 풀 설정 (ParsePool 인자 dict, None 이면 루프에서 바로 파싱)
+        self.parse_pool = parse_pool
         
         # 메인 레이아웃
         self.layout = QVBoxLayout()
@@ -18,6 +32,13 @@ class SocketLogWidget(QWidget):
         # 로그 디스플레이
         self.log_display = QTextEdit()
         self.log_display.setReadOnly(True)
+
+        # 로그 검색/필터 막대 (색인이 있을 때만, 모드버스 탭과 같은 색인 공유)
+        self.filter_bar = None
+        if log_index is not None:
+            self.filter_bar = LogFilterBar(log_index, "socket", live_display=self.log_display)
+            self.layout.addWidget(self.filter_bar)
+            self.log_display.document().setMaximumBlockCount(LIVE_BLOCKS)
         self.layout.addWidget(self.log_display)
         
         # 버튼 레이아웃
@@ -102,7 +123,8 @@ class SocketLogWidget(QWidget):
             self.socket_thread.wait()
         
         # 새 스레드 생성 및 시작
-        self.socket_thread = SocketMonitorThread(host=host, port=port)
+        self.socket_thread = SocketMonitorThread(host=host, port=port, loop=self.loop, timeline=self.timeline,
+                                                capture_dir=self.capture_dir, parse_pool=self.parse_pool)
         self.socket_thread.log_signal.connect(self.append_log)
         self.socket_thread.start()
         
@@ -136,8 +158,11 @@ class SocketLogWidget(QWidget):
             
             self.append_log("소켓 서버가 중지되었습니다.")
     
+    @timed_slot("SocketLogWidget.append_log")
     def append_log(self, text):
         """로그 추가"""
+        if self.filter_bar is not None:
+            self.filter_bar.record(text)
         self.log_display.append(text)
         # 자동 스크롤
         cursor = self.log_display.textCursor()
@@ -154,7 +179,11 @@ class SocketLogWidget(QWidget):
         )
         if filename:
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.log_display.toPlainText())
+                if self.filter_bar is not None:
+                    # 화면에서 잘린 줄까지 전체 기록 저장
+                    self.filter_bar.index.export(f, "socket")
+                else:
+                    f.write(self.log_display.toPlainText())
     
     def clear_log(self):
         """로그 지우기"""
@@ -110,3 +110,14 @@ class PoseParser:
 
         return pose_meanings.get(index, f"미사용 포즈 ({index})")
 
+
+
+def parse_pose_message(message):
+    """워커 풀용 포즈 메시지 파싱 (스레드/프로세스 어디서든 호출 가능한 모듈 함수)
+
+    반환: (결과 문자열 또는 None, 오류 메시지 목록, A_prepos_l 데이터, A_touch_p 데이터)
+    """
+    errors = []
+    parser = PoseParser(callback=errors.append)
+    parsed = parser.parsing_poses(message)
+    return parsed, errors, parser.prepos_data, parser.touch_data
@@ -1,7 +1,13 @@
 """
 로봇 모니터링 UI 위젯 모듈
 """
-from .register_display import RegisterDisplayWidget
+from .register_display import RegisterDisplayWidget, RegisterTableModel
 from .log_widget import LogWidget
+from .log_filter import LogFilterBar
+from .stats_widget import StatsWidget, SignalBacklogProbe
+from .heatmap_widget import HeatmapWidget
+from .trend_widget import TrendWidget
+from .cycle_widget import CycleWidget
+from .timeline_widget import TimelineWidget
 
-__all__ = ['RegisterDisplayWidget', 'LogWidget']
\ No newline at end of file
+__all__ = ['RegisterDisplayWidget', 'RegisterTableModel', 'LogWidget', 'LogFilterBar', 'StatsWidget', 'SignalBacklogProbe', 'HeatmapWidget', 'TrendWidget', 'CycleWidget', 'TimelineWidget']
\ No newline at end of file
@@ -0,0 +1,101 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
+                           QTableWidgetItem, QHeaderView, QPushButton, QLabel)
+from PyQt5.QtCore import Qt, QTimer
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.2f}s"
+
+
+class CycleWidget(QWidget):
+    """사이클 시간 통계 패널 - 정의별 한 줄, 선택한 정의의 상태별 체류 시간"""
+    COLUMNS = ["Cycle", "Count", "Mean", "Std", "Min", "P50", "P90", "P99", "Max", "Last", "Running"]
+
+    def __init__(self, analytics, refresh_ms=500):
+        super().__init__()
+        self.analytics = analytics
+        self.layout = QVBoxLayout()
+
+        # 정의별 통계 표
+        self.table = QTableWidget(len(analytics.trackers), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        for row, tracker in enumerate(analytics.trackers):
+            item = QTableWidgetItem(tracker.name)
+            item.setToolTip(tracker.describe())
+            self.table.setItem(row, 0, item)
+            for col in range(1, len(self.COLUMNS)):
+                cell = QTableWidgetItem("-")
+                cell.setTextAlignment(Qt.AlignCenter)
+                self.table.setItem(row, col, cell)
+        self.table.itemSelectionChanged.connect(self.refresh)
+        self.layout.addWidget(self.table, 2)
+
+        # 상태별 체류 시간 (선택한 정의, 상태 레지스터가 있는 경우)
+        self.state_label = QLabel("Time in state:")
+        self.layout.addWidget(self.state_label)
+        self.state_table = QTableWidget(0, 3)
+        self.state_table.setHorizontalHeaderLabels(["State", "Time", "Share"])
+        self.state_table.horizontalHeader().setStretchLastSection(True)
+        self.state_table.verticalHeader().setVisible(False)
+        self.state_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.layout.addWidget(self.state_table, 1)
+
+        # 버튼 레이아웃
+        button_layout = QHBoxLayout()
+
+        # 초기화 버튼
+        self.reset_button = QPushButton("Reset Stats")
+        self.reset_button.clicked.connect(self.reset_stats)
+        button_layout.addWidget(self.reset_button)
+
+        self.layout.addLayout(button_layout)
+        self.setLayout(self.layout)
+
+        # 갱신 타이머 (보일 때만)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_ms)
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        snapshots = self.analytics.snapshots()
+        for row, info in enumerate(snapshots):
+            texts = [
+                str(info["count"]),
+                _seconds(info["mean"]), _seconds(info["stdev"]), _seconds(info["min"]),
+                _seconds(info["p50"]), _seconds(info["p90"]), _seconds(info["p99"]),
+                _seconds(info["max"]), _seconds(info["last"]), _seconds(info["running"]),
+            ]
+            for col, text in enumerate(texts, 1):
+                item = self.table.item(row, col)
+                if item.text() != text:
+                    item.setText(text)
+
+        rows = self.table.selectionModel().selectedRows()
+        selected = snapshots[rows[0].row()] if rows else (snapshots[0] if snapshots else None)
+        self.update_states(selected)
+
+    def update_states(self, info):
+        state_times = info["state_times"] if info else {}
+        total = sum(state_times.values()) or 1.0
+        self.state_label.setText(f"Time in state: {info['name']}" if info else "Time in state:")
+        items = sorted(state_times.items(), key=lambda item: -item[1])
+        self.state_table.setRowCount(len(items))
+        for row, (state, seconds) in enumerate(items):
+            current = " (current)" if info["state"] == state else ""
+            for col, text in enumerate((f"{state}{current}", _seconds(seconds), f"{seconds / total * 100:.1f}%")):
+                item = self.state_table.item(row, col)
+                if item is None:
+                    self.state_table.setItem(row, col, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+
+    def reset_stats(self):
+        self.analytics.reset()
+        self.refresh()
@@ -0,0 +1,150 @@
+import math
+from datetime import datetime
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                           QComboBox, QLabel, QToolTip)
+from PyQt5.QtCore import Qt, QTimer, QRectF
+from PyQt5.QtGui import QPainter, QColor
+
+
+class HeatmapCanvas(QWidget):
+    """주소 격자 (16열) - 셀 색은 선택한 통계 값"""
+    COLUMNS = 16
+
+    def __init__(self, stats, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.mode = "rate"
+        self.setMouseTracking(True)
+        self.setMinimumSize(480, 240)
+
+    @property
+    def rows(self):
+        return math.ceil(self.stats.count / self.COLUMNS)
+
+    def cell_rect(self, index):
+        width = self.width() / self.COLUMNS
+        height = self.height() / self.rows
+        row, col = divmod(index, self.COLUMNS)
+        return QRectF(col * width, row * height, width, height)
+
+    @staticmethod
+    def rate_level(rate):
+        """로그 눈금: 0.01Hz -> 0, 10Hz -> 1"""
+        if rate <= 0:
+            return 0.0
+        return min(1.0, max(0.0, (math.log10(rate) + 2) / 3))
+
+    def cell_levels(self):
+        """셀별 0~1 색상 강도 (None 은 미관측)"""
+        stats = self.stats
+        if self.mode == "rate":
+            return [None if v is None else self.rate_level(r) for v, r in zip(stats.values, stats.rates())]
+        if self.mode == "count":
+            peak = max(stats.changes) or 1
+            return [None if v is None else math.log1p(c) / math.log1p(peak)
+                    for v, c in zip(stats.values, stats.changes)]
+        # recency: 최근 변경일수록 밝게 (60초 감쇠)
+        now = datetime.now().timestamp()
+        return [None if v is None else (0.0 if t is None else math.exp(-(now - t) / 60))
+                for v, t in zip(stats.values, stats.last_change)]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        levels = self.cell_levels()
+        for i, level in enumerate(levels):
+            rect = self.cell_rect(i)
+            if level is None:
+                color = QColor(60, 60, 60)
+            elif level == 0:
+                color = QColor(30, 30, 80)
+            else:
+                # 파랑(조용함) -> 빨강(활발함)
+                color = QColor.fromHsvF(0.66 * (1 - level), 0.9, 0.4 + 0.6 * level)
+            painter.fillRect(rect.adjusted(1, 1, -1, -1), color)
+            painter.setPen(Qt.white)
+            painter.drawText(rect, Qt.AlignCenter, str(self.stats.start + i))
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        col = int(event.x() / (self.width() / self.COLUMNS))
+        row = int(event.y() / (self.height() / self.rows))
+        index = row * self.COLUMNS + col
+        if not 0 <= index < self.stats.count:
+            return
+        info = self.stats.summary(self.stats.start + index)
+        last = datetime.fromtimestamp(info["last_change"]).strftime('%H:%M:%S') if info["last_change"] else "-"
+        QToolTip.showText(
+            event.globalPos(),
+            f"주소 {info['address']}: {info['value']}\n"
+            f"변경 {info['changes']}회, 마지막 {last}\n"
+            f"최소 {info['min']} / 최대 {info['max']}\n"
+            f"빈도 {info['rate']:.3f} Hz",
+            self
+        )
+
+
+class HeatmapWidget(QWidget):
+    """128-255 주소별 변경 통계 히트맵"""
+    def __init__(self, stats, refresh_ms=33):
+        super().__init__()
+        self.stats = stats
+        self.layout = QVBoxLayout()
+
+        # 표시 기준 선택
+        option_layout = QHBoxLayout()
+        option_layout.addWidget(QLabel("Color by:"))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Change rate (Hz)", "rate")
+        self.mode_combo.addItem("Change count", "count")
+        self.mode_combo.addItem("Recency", "recency")
+        self.mode_combo.currentIndexChanged.connect(self.change_mode)
+        option_layout.addWidget(self.mode_combo)
+        option_layout.addStretch(1)
+        self.layout.addLayout(option_layout)
+
+        # 히트맵
+        self.canvas = HeatmapCanvas(stats)
+        self.layout.addWidget(self.canvas, 1)
+
+        # 요약 (가장 활발한 주소 / 한 번도 안 바뀐 주소 수)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        self.layout.addWidget(self.summary_label)
+
+        # 버튼 레이아웃
+        button_layout = QHBoxLayout()
+
+        # 초기화 버튼
+        self.reset_button = QPushButton("Reset Stats")
+        self.reset_button.clicked.connect(self.reset_stats)
+        button_layout.addWidget(self.reset_button)
+
+        self.layout.addLayout(button_layout)
+        self.setLayout(self.layout)
+
+        # 화면 갱신 타이머 (보일 때만 다시 그림)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_ms)
+        self._frames = 0
+
+    def change_mode(self):
+        self.canvas.mode = self.mode_combo.currentData()
+        self.canvas.update()
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        self.canvas.update()
+
+        # 요약은 1초에 한 번
+        self._frames += 1
+        if self._frames % 30 == 1:
+            top = ", ".join(f"{addr} ({rate:.2f}Hz)" for addr, rate in self.stats.ranking(5))
+            self.summary_label.setText(
+                f"Most active: {top or '-'}    Never changed: {len(self.stats.quiet())} addresses"
+            )
+
+    def reset_stats(self):
+        self.stats.reset()
+        self.refresh()
@@ -0,0 +1,175 @@
+import time
+from datetime import datetime
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox,
+                           QPushButton, QLabel, QTextEdit)
+from ..core.log_index import parse_addresses
+
+# 필터 선택지 (표시 이름, 값)
+SOURCE_CHOICES = [("Modbus", "modbus"), ("Socket", "socket"), ("All sources", None)]
+SEVERITY_CHOICES = [("All levels", None), ("Warning+", "warning"), ("Error", "error")]
+TIME_CHOICES = [("Any time", None), ("Last 1 min", 60), ("Last 10 min", 600), ("Last 1 h", 3600)]
+
+# 색인을 쓸 때 실시간 로그 창에 남기는 최대 블록 수 (전체 기록은 색인/디스크에 있음)
+LIVE_BLOCKS = 5000
+# 결과 창 최대 블록 수 (실시간으로 덧붙는 결과가 끝없이 쌓이지 않도록)
+RESULT_BLOCKS = 20000
+
+
+class LogFilterBar(QWidget):
+    """로그 검색/필터 막대 + 결과 창
+
+    색인(LogIndex)에 질의해 결과를 자체 결과 창에 보여주고, 필터가 켜진 동안에는
+    live_display(실시간 로그 창)를 숨기고 새로 들어온 줄 중 맞는 줄만 결과 창에 덧붙임
+    """
+    def __init__(self, index, source="modbus", live_display=None, limit=1000):
+        super().__init__()
+        self.index = index
+        self.source = source
+        self.live_display = live_display
+        self.limit = limit
+        self.matches = None  # 필터가 켜져 있으면 새 줄 확인 함수
+        self.show_source = False  # 결과에 출처 표시 (모든 출처 검색 시)
+        self.peer_count = 0
+        self.layout = QVBoxLayout()
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+        # 필터 입력
+        filter_layout = QHBoxLayout()
+        self.text_input = QLineEdit()
+        self.text_input.setPlaceholderText("Text")
+        self.text_input.returnPressed.connect(self.apply_filter)
+        filter_layout.addWidget(self.text_input, 2)
+        self.address_input = QLineEdit()
+        self.address_input.setPlaceholderText("Address: 202, 171-172, coil:5")
+        self.address_input.returnPressed.connect(self.apply_filter)
+        filter_layout.addWidget(self.address_input, 1)
+
+        self.source_combo = self._combo(SOURCE_CHOICES)
+        self.source_combo.setCurrentIndex([value for _, value in SOURCE_CHOICES].index(source))
+        filter_layout.addWidget(self.source_combo)
+        self.peer_combo = QComboBox()
+        self.peer_combo.addItem("All peers", None)
+        filter_layout.addWidget(self.peer_combo)
+        self.severity_combo = self._combo(SEVERITY_CHOICES)
+        filter_layout.addWidget(self.severity_combo)
+        self.time_combo = self._combo(TIME_CHOICES)
+        filter_layout.addWidget(self.time_combo)
+
+        self.filter_button = QPushButton("Filter")
+        self.filter_button.clicked.connect(self.apply_filter)
+        filter_layout.addWidget(self.filter_button)
+        self.clear_button = QPushButton("Show Live")
+        self.clear_button.clicked.connect(self.clear_filter)
+        self.clear_button.setEnabled(False)
+        filter_layout.addWidget(self.clear_button)
+        self.layout.addLayout(filter_layout)
+
+        self.status_label = QLabel("")
+        self.status_label.setVisible(False)
+        self.layout.addWidget(self.status_label)
+
+        # 결과 창 (필터 중에만 보임)
+        self.results = QTextEdit()
+        self.results.setReadOnly(True)
+        self.results.document().setMaximumBlockCount(RESULT_BLOCKS)
+        self.results.setVisible(False)
+        self.layout.addWidget(self.results)
+
+        self.setLayout(self.layout)
+        self.refresh_peers()
+        self.index.listeners.append(self.line_added)
+
+    def _combo(self, choices):
+        combo = QComboBox()
+        for label, value in choices:
+            combo.addItem(label, value)
+        return combo
+
+    def refresh_peers(self):
+        """소켓 상대 주소 목록 갱신 (선택은 유지)"""
+        peers = self.index.known_peers()
+        self.peer_count = len(peers)
+        current = self.peer_combo.currentData()
+        self.peer_combo.blockSignals(True)
+        self.peer_combo.clear()
+        self.peer_combo.addItem("All peers", None)
+        for peer in peers:
+            self.peer_combo.addItem(peer, peer)
+        if current in peers:
+            self.peer_combo.setCurrentIndex(peers.index(current) + 1)
+        self.peer_combo.blockSignals(False)
+
+    def record(self, text):
+        """이 막대 출처의 로그 한 줄 기록 (결과 창 갱신은 line_added 에서)"""
+        self.index.add(text, self.source)
+
+    def criteria(self):
+        """입력값을 LogIndex.search 인자로 변환 (주소 형식 오류는 ValueError)"""
+        spec = self.address_input.text().strip()
+        seconds = self.time_combo.currentData()
+        return {
+            "text": self.text_input.text() or None,
+            "addresses": parse_addresses(spec) if spec else None,
+            "source": self.source_combo.currentData(),
+            "peer": self.peer_combo.currentData(),
+            "severity": self.severity_combo.currentData(),
+            "since": time.time() - seconds if seconds else None,
+        }
+
+    def apply_filter(self):
+        try:
+            criteria = self.criteria()
+        except ValueError as e:
+            self.show_status(f"주소 형식 오류: {str(e)}")
+            return
+        if criteria["source"] == self.source and all(
+                value is None for key, value in criteria.items() if key != "source"):
+            # 조건이 없으면 실시간 보기와 같음
+            self.clear_filter()
+            return
+
+        self.show_source = criteria["source"] is None
+        started = time.perf_counter()
+        lines, more = self.index.search(limit=self.limit, **criteria)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.results.setPlainText("\n".join(self.format_line(line) for line in lines))
+        self.results.moveCursor(self.results.textCursor().End)
+        self.matches = self.index.matcher(**criteria)
+        count = f"latest {len(lines)}" if more else f"{len(lines)}"
+        self.show_status(f"{count} matches in {len(self.index)} lines ({elapsed_ms:.1f} ms)")
+        self.results.setVisible(True)
+        if self.live_display is not None:
+            self.live_display.setVisible(False)
+        self.clear_button.setEnabled(True)
+
+    def clear_filter(self):
+        self.matches = None
+        self.results.clear()
+        self.results.setVisible(False)
+        self.status_label.setVisible(False)
+        if self.live_display is not None:
+            self.live_display.setVisible(True)
+        self.clear_button.setEnabled(False)
+
+    def show_status(self, text):
+        self.status_label.setText(text)
+        self.status_label.setVisible(True)
+
+    def line_added(self, line_id):
+        """색인에 줄이 추가될 때마다 (두 출처 모두) - 필터 중이면 맞는 줄을 결과 창에 덧붙임"""
+        if len(self.index.peers) != self.peer_count:
+            self.refresh_peers()
+        if self.matches is not None and self.matches(line_id):
+            self.results.append(self.format_line(self.index.line(line_id)))
+
+    def format_line(self, line):
+        stamp = datetime.fromtimestamp(line.time).strftime('%H:%M:%S')
+        if self.show_source:
+            return f"[{stamp}] [{line.source}] {line.text}"
+        return f"[{stamp}] {line.text}"
+
+    def detach(self):
+        """색인 콜백 해제 (위젯을 버릴 때)"""
+        if self.line_added in self.index.listeners:
+            self.index.listeners.remove(self.line_added)
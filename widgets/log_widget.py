@@ -1,8 +1,10 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, 
                            QPushButton, QFileDialog)
+from ..core.profiling import timed_slot
+from .log_filter import LogFilterBar, LIVE_BLOCKS
 
 class LogWidget(QWidget):
-    def __init__(self, monitor_thread):
+    def __init__(self, monitor_thread, log_index=None):
         super().__init__()
         self.monitor_thread = monitor_thread
         self.layout = QVBoxLayout()
@@ -10,6 +12,13 @@ class LogWidget(QWidget):
         # 로그를 표시할 텍스트 에디터
         self.log_display = QTextEdit()
         self.log_display.setReadOnly(True)
+
+        # 로그 검색/필터 막대 (색인이 있을 때만)
+        self.filter_bar = None
+        if log_index is not None:
+            self.filter_bar = LogFilterBar(log_index, "modbus", live_display=self.log_display)
+            self.layout.addWidget(self.filter_bar)
+            self.log_display.document().setMaximumBlockCount(LIVE_BLOCKS)
         self.layout.addWidget(self.log_display)
         
         # 버튼 레이아웃
@@ -38,7 +47,10 @@ class LogWidget(QWidget):
         self.layout.addLayout(button_layout)
         self.setLayout(self.layout)
     
+    @timed_slot("LogWidget.append_log")
     def append_log(self, text):
+        if self.filter_bar is not None:
+            self.filter_bar.record(text)
         self.log_display.append(text)
         # 자동 스크롤
         cursor = self.log_display.textCursor()
@@ -54,7 +66,11 @@ class LogWidget(QWidget):
         )
         if filename:
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.log_display.toPlainText())
+                if self.filter_bar is not None:
+                    # 화면에서 잘린 줄까지 전체 기록 저장
+                    self.filter_bar.index.export(f, "modbus")
+                else:
+                    f.write(self.log_display.toPlainText())
     
     def reset_registers(self):
         # 모니터 스레드에 초기화 신호 보내기
@@ -1,18 +1,178 @@
-import sys
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QSpinBox, QPushButton, QGridLayout, QGroupBox,
-                           QLineEdit)
-from PyQt5.QtCore import Qt, pyqtSignal
+import bisect
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                           QSpinBox, QPushButton, QGroupBox, QTableView,
+                           QHeaderView, QAbstractItemView, QComboBox)
+from PyQt5.QtCore import Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor
+from ..core.profiling import timed_slot
+from ..core.poller import SOURCES, WRITABLE_SOURCES, address_key, split_key, format_address
+
+
+def _runs(sorted_items):
+    """정렬된 정수 목록을 연속 구간 [(처음, 끝), ...] 으로 묶음"""
+    runs = []
+    for item in sorted_items:
+        if runs and item == runs[-1][1] + 1:
+            runs[-1][1] = item
+        else:
+            runs.append([item, item])
+    return runs
+
+
+class RegisterTableModel(QAbstractTableModel):
+    """모니터링 레지스터 표 모델
+
+    - 주소 키 오름차순 행 (홀딩 레지스터 다음에 코일/디스크리트 입력/입력 레지스터), 주소 -> 행 인덱스로 갱신 위치를 바로 찾음
+    - 값 갱신은 모아 두었다가 flush() 에서 연속 행 구간마다 dataChanged 한 번
+    - Write 열 편집 -> write_requested 시그널
+    """
+    write_requested = pyqtSignal(int, int)  # 레지스터 주소, 값
+
+    COLUMNS = ["Register", "Name", "Value", "Write"]
+    COL_ADDRESS, COL_NAME, COL_VALUE, COL_WRITE = range(4)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.addresses = []  # 행 순서 (주소 오름차순)
+        self.rows = {}  # 주소 -> 행
+        self.values = {}  # 주소 -> 표시 문자열
+        self.errors = set()  # 쓰기 입력 오류 표시 중인 주소
+        self.decoder = None
+        self._dirty = set()
+
+    def _reindex(self):
+        self.rows = {addr: row for row, addr in enumerate(self.addresses)}
+
+    # QAbstractTableModel
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.addresses)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        addr = self.addresses[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == self.COL_ADDRESS:
+                return format_address(addr)
+            if col == self.COL_NAME:
+                field = self.field(addr)
+                return field.name if field else ""
+            if col == self.COL_VALUE:
+                return self.values.get(addr, "--")
+            return ""
+        if role == Qt.TextAlignmentRole and col != self.COL_NAME:
+            return Qt.AlignCenter
+        if role == Qt.ToolTipRole and col in (self.COL_ADDRESS, self.COL_NAME):
+            field = self.field(addr)
+            return f"{field.name} ({field.type})" if field else None
+        if role == Qt.BackgroundRole and col == self.COL_WRITE and addr in self.errors:
+            return QColor("#ffcccc")  # 에러 표시
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if (index.isValid() and index.column() == self.COL_WRITE
+                and split_key(self.addresses[index.row()])[0] in WRITABLE_SOURCES):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or index.column() != self.COL_WRITE:
+            return False
+        addr = self.addresses[index.row()]
+        text = str(value).strip()
+        if not text:
+            return False
+        try:
+            number = int(text)
+        except ValueError:
+            # if not int
+            self.errors.add(addr)
+            self.dataChanged.emit(index, index, [Qt.BackgroundRole])
+            return False
+        self.errors.discard(addr)
+        self.dataChanged.emit(index, index, [Qt.BackgroundRole])
+        self.write_requested.emit(addr, number)
+        return True
+
+    # 레지스터 맵
+    def field(self, addr):
+        return self.decoder.get(addr) if self.decoder else None
+
+    def set_decoder(self, decoder):
+        self.decoder = decoder
+        if self.addresses:
+            self.dataChanged.emit(self.index(0, self.COL_NAME), self.index(len(self.addresses) - 1, self.COL_NAME))
+
+    # 행 추가/삭제 (구간 단위 begin/end 호출)
+    def add_registers(self, registers):
+        """주소 목록 추가 - 새로 추가된 주소 목록 반환"""
+        new = sorted(set(registers) - self.rows.keys())
+        if not new:
+            return []
+        # 기존 목록의 같은 삽입 위치끼리 묶어 뒤쪽부터 삽입 (앞쪽 위치가 밀리지 않도록)
+        groups = {}
+        for addr in new:
+            groups.setdefault(bisect.bisect_left(self.addresses, addr), []).append(addr)
+        for pos in sorted(groups, reverse=True):
+            group = groups[pos]
+            self.beginInsertRows(QModelIndex(), pos, pos + len(group) - 1)
+            self.addresses[pos:pos] = group
+            self.endInsertRows()
+        self._reindex()
+        return new
+
+    def remove_registers(self, registers):
+        """주소 목록 삭제 - 실제로 삭제된 주소 목록 반환"""
+        removed = sorted(addr for addr in set(registers) if addr in self.rows)
+        if not removed:
+            return []
+        for first, last in reversed(_runs(sorted(self.rows[addr] for addr in removed))):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.addresses[first:last + 1]
+            self.endRemoveRows()
+        for addr in removed:
+            self.values.pop(addr, None)
+            self.errors.discard(addr)
+            self._dirty.discard(addr)
+        self._reindex()
+        return removed
+
+    # 값 갱신
+    def set_value(self, addr, text):
+        if addr in self.rows and self.values.get(addr) != text:
+            self.values[addr] = text
+            self._dirty.add(addr)
+
+    def flush(self):
+        """모아 둔 값 갱신을 연속 행 구간별 dataChanged 로 알림"""
+        if not self._dirty:
+            return
+        rows = sorted(self.rows[addr] for addr in self._dirty)
+        self._dirty.clear()
+        for first, last in _runs(rows):
+            self.dataChanged.emit(self.index(first, self.COL_VALUE), self.index(last, self.COL_VALUE),
+                                  [Qt.DisplayRole])
+
 
 class RegisterDisplayWidget(QWidget):
     # 새로운 시그널 추가 - 레지스터 주소, 값
     register_write_signal = pyqtSignal(int, int)
     heartbeat_signal = pyqtSignal(bool)
 
-    def __init__(self):
+    def __init__(self, refresh_ms=50):
         super().__init__()
         self.layout = QVBoxLayout()
-        
+
         # 레지스터 모니터링 그룹
         self.group_box = QGroupBox("Register Monitoring")
         self.group_layout = QVBoxLayout()
@@ -31,43 +191,81 @@ class RegisterDisplayWidget(QWidget):
 
         # 레이아웃에 하트비트 그룹 추가
         self.layout.addWidget(self.heartbeat_group)
-        
-        # 모니터링할 레지스터 선택 영역
+
+        # 모니터링할 레지스터 선택 영역 (시작 ~ 끝 주소 구간 한 번에 추가)
         self.select_layout = QHBoxLayout()
         self.select_layout.addWidget(QLabel("Register Address:"))
-        
+
+        # 폴링 소스 (FC3 홀딩 레지스터 / FC1 코일 / FC2 디스크리트 입력 / FC4 입력 레지스터)
+        self.source_combo = QComboBox()
+        for source in SOURCES:
+            self.source_combo.addItem(source)
+        self.select_layout.addWidget(self.source_combo)
+
         self.register_spinbox = QSpinBox()
         self.register_spinbox.setRange(0, 65535)
         self.register_spinbox.setValue(128)  # 기본값 128
         self.select_layout.addWidget(self.register_spinbox)
-        
+
+        self.select_layout.addWidget(QLabel("~"))
+        self.register_end_spinbox = QSpinBox()
+        self.register_end_spinbox.setRange(0, 65535)
+        self.register_end_spinbox.setSpecialValueText("-")  # 0 이면 단일 주소
+        self.select_layout.addWidget(self.register_end_spinbox)
+
         self.add_button = QPushButton("Add")
         self.add_button.clicked.connect(self.add_register_monitor)
         self.select_layout.addWidget(self.add_button)
-        
+
         self.group_layout.addLayout(self.select_layout)
-        
-        # 레지스터 값 표시 영역
-        self.registers_grid = QGridLayout()
-        self.registers_grid.setColumnStretch(1, 1)  # 값 열을 늘려서 표시
-        
-        # 레이블 생성
-        self.registers_grid.addWidget(QLabel("Register : "), 0, 0)
-        self.registers_grid.addWidget(QLabel("Value"), 0, 1)
-        
-        self.group_layout.addLayout(self.registers_grid)
+
+        # 레지스터 값 표 (Write 열을 더블클릭해 값 입력 후 Enter 로 전송)
+        self.model = RegisterTableModel(self)
+        self.model.write_requested.connect(self.register_write_signal.emit)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
+                                        | QAbstractItemView.AnyKeyPressed)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.verticalHeader().setDefaultSectionSize(22)
+        self.table_view.horizontalHeader().setSectionResizeMode(RegisterTableModel.COL_VALUE, QHeaderView.Stretch)
+        self.group_layout.addWidget(self.table_view)
+
+        # 선택 행 삭제
+        self.remove_button = QPushButton("Remove Selected")
+        self.remove_button.clicked.connect(self.remove_selected)
+        self.group_layout.addWidget(self.remove_button)
+
         self.group_box.setLayout(self.group_layout)
-        
+
         self.layout.addWidget(self.group_box)
         self.setLayout(self.layout)
-        
-        # 모니터링 중인 레지스터 목록
-        self.monitored_registers = {}
-        self.next_row = 1
 
         # 하트비트 상태
         self.heartbeat_active = False
 
+        # 레지스터 맵 디코더 (설정되면 맵 항목은 디코딩 값으로 표시)
+        self.decoder = None
+
+        # 레지스터 추가/삭제 후 스레드에 알리는 콜백 (새로 추가/삭제된 주소 목록을 한 번에 전달)
+        self.on_registers_added = None
+        self.on_registers_removed = None
+
+        # 값 갱신은 모아서 refresh_ms 마다 한 번에 반영
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.model.flush)
+        self.flush_timer.start(refresh_ms)
+
+    @property
+    def monitored_registers(self):
+        return self.model.rows
+
+    def set_decoder(self, decoder):
+        """레지스터 맵 디코더 설정 - 이름 열과 툴팁에 표시"""
+        self.decoder = decoder
+        self.model.set_decoder(decoder)
+
     def toggle_heartbeat(self):
         '''heartbeat active/unactive toggle'''
         self.heartbeat_active = self.heartbeat_button.isChecked()
@@ -79,96 +277,46 @@ class RegisterDisplayWidget(QWidget):
         else:
             self.heartbeat_button.setText("Welder Beat ON")
             self.heartbeat_signal.emit(False)
-    
+
     def add_register_monitor(self):
-        register = self.register_spinbox.value()
-        
-        # 이미 추가된 레지스터인지 확인
-        if register in self.monitored_registers:
-            return
-        
-        # 레지스터 주소 라벨
-        reg_label = QLabel(f"{register}")
-        reg_label.setAlignment(Qt.AlignCenter)
-        
-        # 레지스터 값 라벨
-        value_label = QLabel("--")
-        value_label.setAlignment(Qt.AlignCenter)
-
-        # 값 입력 필드 추가
-        value_input = QLineEdit()
-        value_input.setPlaceholderText("value")
-        value_input.setFixedWidth(80)
-        
-        # 전송 버튼 추가
-        send_button = QPushButton("Send")
-        send_button.clicked.connect(lambda: self.send_register_value(register, value_input.text()))
-        
-        # 삭제 버튼
-        delete_button = QPushButton("Delete")
-        delete_button.clicked.connect(lambda: self.remove_register_monitor(register))
-        
-        # 그리드에 추가
-        self.registers_grid.addWidget(reg_label, self.next_row, 0)
-        self.registers_grid.addWidget(value_label, self.next_row, 1)
-        self.registers_grid.addWidget(value_input, self.next_row, 2)
-        self.registers_grid.addWidget(send_button, self.next_row, 3)
-        self.registers_grid.addWidget(delete_button, self.next_row, 4)
-        
-        # 목록에 추가, tuple, (value_label, value_input)
-        self.monitored_registers[register] = (value_label, value_input)
-        self.next_row += 1
-
-    def send_register_value(self, register, value_text):
-        """register sending func"""
-        try:
-            value = int(value_text)
-            self.register_write_signal.emit(register, value)
-            
-            # 값 전송 후 입력 필드 비우기
-            if hasattr(self.monitored_registers[register], "__getitem__"):
-                input_field = self.monitored_registers[register][1]
-                input_field.clear()  # 입력 필드 내용 지우기
-                input_field.setStyleSheet("")  # 스타일 초기화 (에러 표시가 있었을 경우)
+        source = self.source_combo.currentText()
+        start = self.register_spinbox.value()
+        end = self.register_end_spinbox.value()
+        self.add_registers(address_key(source, addr) for addr in range(start, max(start, end) + 1))
 
-        except ValueError:
-            # if not int
-            if hasattr(self.monitored_registers[register], "__getitem__"):
-                self.monitored_registers[register][1].setStyleSheet("background-color: #ffcccc;")  # 에러 표시
-            else:
-                pass # 호환성
+    def add_registers(self, registers):
+        """주소 목록 한 번에 추가 (이미 있는 주소는 무시)"""
+        added = self.model.add_registers(registers)
+        if added and self.on_registers_added:
+            self.on_registers_added(added)
+
+    def remove_registers(self, registers):
+        """주소 목록 한 번에 삭제"""
+        removed = self.model.remove_registers(registers)
+        if removed and self.on_registers_removed:
+            self.on_registers_removed(removed)
 
     def remove_register_monitor(self, register):
-        if register in self.monitored_registers:
-            # 그리드에서 위젯 제거
-            row = 0
-            for i in range(1, self.registers_grid.rowCount()):
-                item = self.registers_grid.itemAtPosition(i, 0)
-                if item and item.widget() and item.widget().text() == str(register):
-                    row = i
-                    break
-            
-            if row > 0:
-                for col in range(5):
-                    item = self.registers_grid.itemAtPosition(row, col)
-                    if item and item.widget():
-                        widget = item.widget()
-                        self.registers_grid.removeItem(item)
-                        widget.setParent(None)
-                        widget.deleteLater()
-            
-            # 목록에서 제거
-            del self.monitored_registers[register]
-
-            # 스레드에 알림(콜백)
-            if hasattr(self, "on_register_removed") and self.on_register_removed:
-                self.on_register_removed(register)
-    
+        self.remove_registers([register])
+
+    def remove_selected(self):
+        rows = self.table_view.selectionModel().selectedRows()
+        self.remove_registers([self.model.addresses[index.row()] for index in rows])
+
+    @timed_slot("RegisterDisplayWidget.update_register_value")
     def update_register_value(self, register, value):
-        if register in self.monitored_registers:
+        # 레지스터 맵 항목은 update_decoded_values 에서 표시
+        if self.decoder and self.decoder.get(register):
+            return
+        self.model.set_value(register, str(value))
+
+    def update_register_values(self, values):
+        """값 묶음 {주소: 값} 반영"""
+        for register, value in values.items():
+            self.update_register_value(register, value)
 
-            # tuple
-            if hasattr(self.monitored_registers[register], "__getitem__"):
-                self.monitored_registers[register][0].setText(str(value))
-            else:
-                self.monitored_registers[register].setText(str(value))
+    @timed_slot("RegisterDisplayWidget.update_decoded_values")
+    def update_decoded_values(self, decoded):
+        """레지스터 맵 디코딩 결과 표시 {주소: 표시 문자열}"""
+        for register, text in decoded.items():
+            self.model.set_value(register, text)
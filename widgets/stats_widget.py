@@ -0,0 +1,106 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
+                           QTableWidgetItem, QHeaderView, QPushButton, QLabel)
+from PyQt5.QtCore import Qt, QObject, QTimer
+from ..core.metrics import metrics
+
+
+class SignalBacklogProbe(QObject):
+    """워커 스레드가 보낸 시그널 중 GUI 스레드가 아직 처리하지 않은 개수 계측
+
+    기존 슬롯을 연결한 뒤 attach 해야 처리 완료 시점이 정확함
+    """
+    def __init__(self, name, parent=None):
+        super().__init__(parent)
+        self.name = name
+
+    def attach(self, signal):
+        # 보내는 쪽 스레드에서 즉시 +1, GUI 스레드에서 처리된 뒤 -1
+        signal.connect(self._emitted, Qt.DirectConnection)
+        signal.connect(self._handled)
+
+    def _emitted(self, *args):
+        if metrics.enabled:
+            metrics.add("qt_signal_backlog", 1, signal=self.name)
+
+    def _handled(self, *args):
+        if metrics.enabled:
+            metrics.add("qt_signal_backlog", -1, signal=self.name)
+
+
+class StatsWidget(QWidget):
+    """계측 값을 주기적으로 보여주는 통계 패널"""
+    def __init__(self, refresh_ms=1000, http_address=None):
+        super().__init__()
+        self.layout = QVBoxLayout()
+
+        # 엔드포인트 안내
+        if http_address:
+            self.layout.addWidget(QLabel(f"Prometheus: http://{http_address}/metrics"))
+
+        # 통계 표
+        self.table = QTableWidget(0, 2)
+        self.table.setHorizontalHeaderLabels(["Metric", "Value"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.layout.addWidget(self.table)
+
+        # 버튼 레이아웃
+        button_layout = QHBoxLayout()
+
+        # 초기화 버튼
+        self.reset_button = QPushButton("Reset Stats")
+        self.reset_button.clicked.connect(self.reset_stats)
+        button_layout.addWidget(self.reset_button)
+
+        self.layout.addLayout(button_layout)
+        self.setLayout(self.layout)
+
+        # 갱신 타이머
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_ms)
+
+    @staticmethod
+    def _latency_text(histogram):
+        if histogram is None or not histogram.count:
+            return "-"
+        return (f"n={histogram.count}  mean={histogram.mean * 1000:.1f}ms  "
+                f"p50={histogram.quantile(0.5) * 1000:.1f}ms  p95={histogram.quantile(0.95) * 1000:.1f}ms")
+
+    def collect_rows(self):
+        rows = []
+        for op in ("read", "write", "write_multiple"):
+            histogram = metrics.histogram("modbus_request_seconds", op=op)
+            if histogram:
+                rows.append((f"Modbus {op} RTT", self._latency_text(histogram)))
+                rows.append((f"Modbus {op} errors", str(metrics.counter("modbus_request_errors_total", op=op))))
+
+        rows.append(("Poll cycle", self._latency_text(metrics.histogram("poll_cycle_seconds"))))
+        rows.append(("Poll cycle overruns", str(metrics.counter("poll_cycle_overruns_total"))))
+        rows.append(("Heartbeat interval", self._latency_text(metrics.histogram("heartbeat_interval_seconds"))))
+
+        for labels, value in sorted(metrics.series("poll_block_interval_seconds"), key=lambda item: item[0]["block"]):
+            rows.append((f"Poll interval {labels['block']}", f"{value * 1000:.0f}ms"))
+
+        for labels, value in sorted(metrics.series("socket_bytes_total"), key=lambda item: item[0]["peer"]):
+            frames = metrics.counter("socket_frames_total", **labels)
+            rows.append((f"Socket {labels['peer']}", f"{value} bytes  {frames} frames"))
+
+        for labels, value in sorted(metrics.series("qt_signal_backlog"), key=lambda item: item[0]["signal"]):
+            rows.append((f"Signal backlog ({labels['signal']})", str(value)))
+        return rows
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        rows = self.collect_rows()
+        self.table.setRowCount(len(rows))
+        for row, (name, value) in enumerate(rows):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            self.table.setItem(row, 1, QTableWidgetItem(value))
+
+    def reset_stats(self):
+        metrics.reset(keep_gauges=True)
+        self.refresh()
@@ -0,0 +1,127 @@
+from datetime import datetime
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                           QHeaderView, QPushButton, QLabel, QSpinBox, QCheckBox)
+from PyQt5.QtCore import Qt, QTimer
+from ..core.timeline import describe_event
+
+# 스트림 표시 색상
+STREAM_COLORS = {"modbus": Qt.darkBlue, "socket": Qt.darkGreen}
+
+
+def _table(headers):
+    table = QTableWidget(0, len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+    table.horizontalHeader().setStretchLastSection(True)
+    table.verticalHeader().setVisible(False)
+    table.setEditTriggers(QTableWidget.NoEditTriggers)
+    table.setSelectionBehavior(QTableWidget.SelectRows)
+    return table
+
+
+class TimelineWidget(QWidget):
+    """소켓 메시지와 모드버스 변경을 한 시간축으로 보는 패널
+
+    위: 최근 이벤트 (시간순 병합), 아래: 선택한 이벤트 ±구간에 일어난 이벤트
+    """
+    def __init__(self, timeline, refresh_ms=500, rows=500):
+        super().__init__()
+        self.timeline = timeline
+        self.rows = rows
+        self.events = []  # 위 표에 보이는 이벤트
+        self.anchor = None  # 아래 표의 기준 이벤트
+        self.layout = QVBoxLayout()
+
+        # 제어 영역
+        control_layout = QHBoxLayout()
+        self.follow_checkbox = QCheckBox("Follow")
+        self.follow_checkbox.setChecked(True)
+        control_layout.addWidget(self.follow_checkbox)
+        control_layout.addWidget(QLabel("Window ±"))
+        self.window_spinbox = QSpinBox()
+        self.window_spinbox.setRange(1, 10000)
+        self.window_spinbox.setValue(50)
+        self.window_spinbox.setSuffix(" ms")
+        self.window_spinbox.valueChanged.connect(self.update_window)
+        control_layout.addWidget(self.window_spinbox)
+        control_layout.addStretch(1)
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(self.clear_timeline)
+        control_layout.addWidget(self.clear_button)
+        self.layout.addLayout(control_layout)
+
+        # 최근 이벤트
+        self.event_table = _table(["Time", "Stream", "Event"])
+        self.event_table.itemSelectionChanged.connect(self.select_anchor)
+        self.layout.addWidget(self.event_table, 2)
+
+        # 선택한 이벤트 주변 구간
+        self.window_label = QLabel("Select an event to see what happened around it")
+        self.layout.addWidget(self.window_label)
+        self.window_table = _table(["Δ ms", "Stream", "Event"])
+        self.layout.addWidget(self.window_table, 1)
+
+        self.setLayout(self.layout)
+
+        # 갱신 타이머 (보일 때만)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_ms)
+
+    def format_time(self, t_ns):
+        return datetime.fromtimestamp(self.timeline.wall_time(t_ns)).strftime('%H:%M:%S.%f')[:-3]
+
+    def set_row(self, table, row, texts, stream):
+        color = STREAM_COLORS.get(stream)
+        for col, text in enumerate(texts):
+            item = QTableWidgetItem(text)
+            if color is not None:
+                item.setForeground(color)
+            table.setItem(row, col, item)
+
+    def refresh(self):
+        if not self.isVisible() or not self.follow_checkbox.isChecked():
+            return
+        events = self.timeline.latest(self.rows)
+        if len(events) == len(self.events) and (not events or events[-1] is self.events[-1]):
+            return
+        self.events = events
+        self.event_table.blockSignals(True)
+        self.event_table.setRowCount(len(events))
+        for row, event in enumerate(events):
+            self.set_row(self.event_table, row,
+                         (self.format_time(event.t_ns), event.stream, describe_event(event)), event.stream)
+        self.event_table.blockSignals(False)
+        self.event_table.scrollToBottom()
+
+    def select_anchor(self):
+        rows = self.event_table.selectionModel().selectedRows()
+        if not rows:
+            return
+        # 구간을 살펴보는 동안 표가 바뀌지 않도록 따라가기 중지
+        self.follow_checkbox.setChecked(False)
+        self.anchor = self.events[rows[0].row()]
+        self.update_window()
+
+    def update_window(self):
+        if self.anchor is None:
+            return
+        window_ns = self.window_spinbox.value() * 1_000_000
+        around = self.timeline.around(self.anchor, window_ns, window_ns)
+        self.window_label.setText(
+            f"±{self.window_spinbox.value()} ms around {self.format_time(self.anchor.t_ns)} "
+            f"{self.anchor.stream}: {len(around)} events")
+        self.window_table.setRowCount(len(around))
+        for row, (offset_ms, event) in enumerate(around):
+            self.set_row(self.window_table, row,
+                         (f"{offset_ms:+.3f}", event.stream, describe_event(event)), event.stream)
+            if event is self.anchor:
+                self.window_table.selectRow(row)
+
+    def clear_timeline(self):
+        self.timeline.clear()
+        self.events = []
+        self.anchor = None
+        self.event_table.setRowCount(0)
+        self.window_table.setRowCount(0)
+        self.window_label.setText("Select an event to see what happened around it")
@@ -0,0 +1,305 @@
+import time
+from datetime import datetime
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                           QSpinBox, QComboBox, QListWidget, QListWidgetItem)
+from PyQt5.QtCore import Qt, QTimer, QRect
+from PyQt5.QtGui import QPainter, QPixmap, QColor, QPen
+
+# 계열 색상 (추가 순서대로 순환)
+SERIES_COLORS = ["#e6194b", "#3cb44b", "#4363d8", "#f58231", "#911eb4",
+                 "#46f0f0", "#f032e6", "#bcf60c", "#008080", "#9a6324"]
+
+# 실시간 보기 구간 (초)
+SPANS = [("10 s", 10), ("1 min", 60), ("10 min", 600), ("1 h", 3600), ("8 h", 28800)]
+
+
+class TrendCanvas(QWidget):
+    """트렌드 그래프 영역
+
+    - 실시간 보기: 캐시 픽스맵을 왼쪽으로 밀고 새로 들어온 열만 그림
+    - 확대/이동(휠, 드래그): 보이는 구간만 다시 계산 (확대하면 원본 해상도)
+    - 더블클릭: 실시간 보기로 복귀
+    """
+    MARGIN_LEFT = 60
+    MARGIN_BOTTOM = 20
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.addresses = []  # 표시할 주소 (추가 순서)
+        self.colors = {}
+        self.hidden = set()
+
+        self.span = 60.0
+        self.live = True
+        self.t1 = time.time()
+        self.y_range = None  # (최소, 최대)
+
+        self._cache = None
+        self._cache_t1 = None
+        self._drag_x = None
+        self.setMinimumSize(480, 240)
+        self.setMouseTracking(True)
+
+    # 구간/좌표 변환
+    def plot_rect(self):
+        return QRect(self.MARGIN_LEFT, 0,
+                     max(1, self.width() - self.MARGIN_LEFT), max(1, self.height() - self.MARGIN_BOTTOM))
+
+    @property
+    def t0(self):
+        return self.t1 - self.span
+
+    def y_pixel(self, value, height):
+        lo, hi = self.y_range
+        return int((hi - value) / (hi - lo) * (height - 1))
+
+    def visible_series(self):
+        for addr in self.addresses:
+            series = self.history.get(addr)
+            if series is not None and addr not in self.hidden:
+                yield addr, series
+
+    def invalidate(self):
+        self._cache = None
+        self.update()
+
+    # 데이터 -> 픽스맵
+    def _columns(self, t0, t1, width):
+        until = time.time() if self.live else None
+        return {addr: series.columns(t0, t1, width, until) for addr, series in self.visible_series()}
+
+    def _fits(self, columns):
+        """y 범위 안에 들어오는지 확인 - 벗어나면 여유를 두고 범위 재설정"""
+        values = [v for cols in columns.values() for cell in cols if cell for v in cell[:2]]
+        if not values:
+            return True
+        lo, hi = min(values), max(values)
+        if self.y_range and self.y_range[0] <= lo and hi <= self.y_range[1]:
+            return True
+        if self.y_range:
+            lo, hi = min(lo, self.y_range[0]), max(hi, self.y_range[1])
+        pad = max((hi - lo) * 0.1, 1.0)
+        self.y_range = (lo - pad, hi + pad)
+        return False
+
+    def _paint_columns(self, pixmap, columns, x_offset):
+        painter = QPainter(pixmap)
+        height = pixmap.height()
+        for addr, cols in columns.items():
+            painter.setPen(QPen(QColor(self.colors[addr]), 1))
+            for c, cell in enumerate(cols):
+                if cell is None:
+                    continue
+                x = x_offset + c
+                painter.drawLine(x, self.y_pixel(cell[1], height), x, self.y_pixel(cell[0], height))
+        painter.end()
+
+    def _render_full(self, rect):
+        columns = self._columns(self.t0, self.t1, rect.width())
+        self._fits(columns)
+        self._cache = QPixmap(rect.size())
+        self._cache.fill(Qt.black)
+        if self.y_range:
+            self._paint_columns(self._cache, columns, 0)
+        self._cache_t1 = self.t1
+
+    def _render_incremental(self, rect):
+        """실시간 보기 - 경과한 픽셀만큼 밀고 오른쪽 끝 열만 새로 그림"""
+        width = rect.width()
+        px_per_sec = width / self.span
+        # 0 이면 같은 열 안 - 마지막 열만 다시 그림
+        shift = max(int((self.t1 - self._cache_t1) * px_per_sec), 0)
+        if shift >= width:
+            self._render_full(rect)
+            return
+
+        # 캐시 기준 시각을 정수 픽셀만큼만 전진 (누적 오차 방지)
+        new_t1 = self._cache_t1 + shift / px_per_sec
+        redraw = shift + 1
+        columns = self._columns(new_t1 - redraw / px_per_sec, new_t1, redraw)
+        if not self._fits(columns):
+            self.t1 = new_t1
+            self._render_full(rect)
+            return
+
+        if shift:
+            self._cache.scroll(-shift, 0, self._cache.rect())
+        painter = QPainter(self._cache)
+        painter.fillRect(width - redraw, 0, redraw, self._cache.height(), Qt.black)
+        painter.end()
+        self._paint_columns(self._cache, columns, width - redraw)
+        self._cache_t1 = new_t1
+
+    def advance(self):
+        """프레임 타이머 - 실시간 보기면 현재 시각으로 이동"""
+        if self.live:
+            self.t1 = time.time()
+            self.update()
+
+    def paintEvent(self, event):
+        rect = self.plot_rect()
+        if self._cache is None or self._cache.size() != rect.size() or not self.live:
+            if self._cache is None or self._cache.size() != rect.size() or self._cache_t1 != self.t1:
+                self._render_full(rect)
+        else:
+            self._render_incremental(rect)
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(30, 30, 30))
+        painter.drawPixmap(rect.topLeft(), self._cache)
+
+        # 축 라벨 (매 프레임 덮어 그림)
+        painter.setPen(Qt.lightGray)
+        if self.y_range:
+            lo, hi = self.y_range
+            for fraction in (0.0, 0.5, 1.0):
+                value = hi - (hi - lo) * fraction
+                y = int(fraction * (rect.height() - 1))
+                painter.drawText(QRect(0, max(0, y - 8), self.MARGIN_LEFT - 4, 16),
+                                 Qt.AlignRight | Qt.AlignVCenter, f"{value:.0f}")
+        bottom = rect.bottom() + 2
+        t1 = self._cache_t1 if self._cache_t1 is not None else self.t1
+        painter.drawText(QRect(rect.left(), bottom, 120, 16), Qt.AlignLeft,
+                         datetime.fromtimestamp(t1 - self.span).strftime('%H:%M:%S'))
+        painter.drawText(QRect(rect.right() - 120, bottom, 120, 16), Qt.AlignRight,
+                         datetime.fromtimestamp(t1).strftime('%H:%M:%S') + (" (live)" if self.live else ""))
+        painter.end()
+
+    # 확대/이동
+    def time_at(self, x):
+        rect = self.plot_rect()
+        return self.t0 + (x - rect.left()) / rect.width() * self.span
+
+    def wheelEvent(self, event):
+        anchor = self.time_at(event.x())
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        span = min(max(self.span * factor, 0.5), 7 * 24 * 3600)
+        self.t1 = anchor + (self.t1 - anchor) * span / self.span
+        self.span = span
+        self.live = False
+        self.invalidate()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_x = event.x()
+
+    def mouseMoveEvent(self, event):
+        if self._drag_x is None:
+            return
+        dx = event.x() - self._drag_x
+        self._drag_x = event.x()
+        self.t1 -= dx / self.plot_rect().width() * self.span
+        self.live = False
+        self.invalidate()
+
+    def mouseReleaseEvent(self, event):
+        self._drag_x = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.set_live(self.span)
+
+    def set_live(self, span):
+        self.span = span
+        self.live = True
+        self.t1 = time.time()
+        self.y_range = None
+        self.invalidate()
+
+
+class TrendWidget(QWidget):
+    """모니터링 레지스터 실시간 트렌드 패널"""
+    def __init__(self, history, refresh_ms=33):
+        super().__init__()
+        self.history = history
+        self.layout = QHBoxLayout()
+
+        # 그래프
+        self.canvas = TrendCanvas(history)
+        self.layout.addWidget(self.canvas, 4)
+
+        # 오른쪽 제어 영역
+        side_layout = QVBoxLayout()
+
+        # 레지스터 추가
+        select_layout = QHBoxLayout()
+        self.register_spinbox = QSpinBox()
+        self.register_spinbox.setRange(0, 65535)
+        self.register_spinbox.setValue(202)
+        select_layout.addWidget(self.register_spinbox)
+        self.add_button = QPushButton("Add")
+        self.add_button.clicked.connect(lambda: self.add_register(self.register_spinbox.value()))
+        select_layout.addWidget(self.add_button)
+        side_layout.addLayout(select_layout)
+
+        # 계열 목록 (체크 해제 시 숨김)
+        self.series_list = QListWidget()
+        self.series_list.itemChanged.connect(self.toggle_series)
+        side_layout.addWidget(self.series_list, 1)
+
+        self.remove_button = QPushButton("Remove")
+        self.remove_button.clicked.connect(self.remove_selected)
+        side_layout.addWidget(self.remove_button)
+
+        # 실시간 보기 구간
+        side_layout.addWidget(QLabel("Live span:"))
+        self.span_combo = QComboBox()
+        for label, seconds in SPANS:
+            self.span_combo.addItem(label, seconds)
+        self.span_combo.setCurrentIndex(1)
+        self.span_combo.currentIndexChanged.connect(
+            lambda: self.canvas.set_live(self.span_combo.currentData())
+        )
+        side_layout.addWidget(self.span_combo)
+        side_layout.addWidget(QLabel("Wheel: zoom, drag: pan\nDouble-click: back to live"))
+
+        self.layout.addLayout(side_layout, 1)
+        self.setLayout(self.layout)
+
+        # 프레임 타이머 (보일 때만 갱신)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_ms)
+
+    def add_register(self, register):
+        if register in self.canvas.addresses:
+            return
+        color = SERIES_COLORS[len(self.canvas.colors) % len(SERIES_COLORS)]
+        self.canvas.addresses.append(register)
+        self.canvas.colors[register] = color
+
+        item = QListWidgetItem(str(register))
+        item.setData(Qt.UserRole, register)
+        item.setForeground(QColor(color))
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+        item.setCheckState(Qt.Checked)
+        self.series_list.addItem(item)
+        self.canvas.invalidate()
+
+    def remove_register(self, register):
+        if register not in self.canvas.addresses:
+            return
+        self.canvas.addresses.remove(register)
+        self.canvas.hidden.discard(register)
+        for row in range(self.series_list.count()):
+            if self.series_list.item(row).data(Qt.UserRole) == register:
+                self.series_list.takeItem(row)
+                break
+        self.canvas.invalidate()
+
+    def remove_selected(self):
+        for item in self.series_list.selectedItems():
+            self.remove_register(item.data(Qt.UserRole))
+
+    def toggle_series(self, item):
+        register = item.data(Qt.UserRole)
+        if item.checkState() == Qt.Checked:
+            self.canvas.hidden.discard(register)
+        else:
+            self.canvas.hidden.add(register)
+        self.canvas.y_range = None
+        self.canvas.invalidate()
+
+    def refresh(self):
+        if self.isVisible():
+            self.canvas.advance()